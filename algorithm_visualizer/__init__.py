@@ -7,44 +7,39 @@ when optional visualization libraries are available.
 """
 
 import sys
+from importlib.util import find_spec
 from typing import List
 
-# Dependency checking
-def _check_dependencies():
-    """Check for optional dependencies and return availability status."""
-    deps = {}
-    
-    try:
-        import matplotlib
-        deps['matplotlib'] = True
-    except ImportError:
-        deps['matplotlib'] = False
-    
-    try:
-        import plotly
-        deps['plotly'] = True
-    except ImportError:
-        deps['plotly'] = False
-    
-    try:
-        import streamlit
-        deps['streamlit'] = True
-    except ImportError:
-        deps['streamlit'] = False
-    
-    return deps
+# Optional dependencies, keyed by the availability flag exported for each one
+_OPTIONAL_DEPENDENCIES = {
+    'MATPLOTLIB_AVAILABLE': 'matplotlib',
+    'PLOTLY_AVAILABLE': 'plotly',
+    'STREAMLIT_AVAILABLE': 'streamlit',
+}
 
-# Check dependencies once at import time
-_DEPENDENCIES = _check_dependencies()
+def _is_installed(name: str) -> bool:
+    """Check whether a module can be imported, without actually importing it."""
+    try:
+        return find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
-# Export dependency status
-MATPLOTLIB_AVAILABLE = _DEPENDENCIES['matplotlib']
-PLOTLY_AVAILABLE = _DEPENDENCIES['plotly']
-STREAMLIT_AVAILABLE = _DEPENDENCIES['streamlit']
+def __getattr__(name: str):
+    """Resolve dependency flags and TextVisualizer on first access so importing
+    the package stays cheap."""
+    if name in _OPTIONAL_DEPENDENCIES:
+        available = _is_installed(_OPTIONAL_DEPENDENCIES[name])
+        globals()[name] = available
+        return available
+    if name == 'TextVisualizer':
+        from .core.text_visualizer import TextVisualizer
+        globals()[name] = TextVisualizer
+        return TextVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def require_dependency(name: str):
     """Require a specific dependency and provide helpful error message."""
-    if not _DEPENDENCIES.get(name, False):
+    if not _is_installed(name):
         install_commands = {
             'matplotlib': 'pip install matplotlib',
             'plotly': 'pip install plotly',
@@ -62,24 +57,32 @@ try:
     )
     from .core.comparator import AlgorithmComparator
     from .core.base import AlgorithmVisualizer, AlgorithmStep, PerformanceMetrics
-    from .core.text_visualizer import TextVisualizer
     
 except ImportError as e:
     print(f"Error importing core components: {e}")
     print("Make sure all core modules are properly installed")
     raise
 
-# Conditional imports with fallback
-try:
-    from .visualizers import get_available_backends, create_visualizer
-except ImportError:
-    def get_available_backends():
+# Visualization backends are imported on first use, since the optional
+# ones pull in matplotlib or plotly
+def get_available_backends() -> List[str]:
+    """Get list of available visualization backends."""
+    try:
+        from .visualizers import get_available_backends as _get_available_backends
+    except ImportError:
         return ['text']
-    
-    def create_visualizer(backend='text', **kwargs):
+    return _get_available_backends()
+
+def create_visualizer(backend: str = 'text', **kwargs):
+    """Create a visualizer with the specified backend."""
+    try:
+        from .visualizers import create_visualizer as _create_visualizer
+    except ImportError:
         if backend != 'text':
             raise ValueError(f"Backend '{backend}' not available. Only 'text' backend is available.")
+        from .core.text_visualizer import TextVisualizer
         return TextVisualizer(**kwargs)
+    return _create_visualizer(backend, **kwargs)
 
 # Package metadata
 __version__ = "1.0.0"
@@ -119,7 +122,8 @@ def print_system_info():
     print(f"Algorithm Visualizer v{__version__}")
     print(f"Python {sys.version}")
     print("\nOptional Dependencies:")
-    for name, available in _DEPENDENCIES.items():
+    for name in _OPTIONAL_DEPENDENCIES.values():
+        available = _is_installed(name)
         status = "✅ Available" if available else "❌ Not installed"
         print(f"  {name}: {status}")
     
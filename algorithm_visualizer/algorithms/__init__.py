@@ -2,38 +2,97 @@
 Sorting algorithm implementations with visualization support.
 """
 
+import heapq
+import random
+from collections import deque
+from itertools import chain
+from time import perf_counter
 from typing import List, Dict, Type, Optional, Union, Sequence
 from ..core.base import AlgorithmVisualizer, Number
-import copy
+from ._kernels import _load_kernels, median_of_three, merge_pass, run_kernel
+
+
+def _sort_untraced(visualizer: AlgorithmVisualizer, algorithm: str) -> List[Number]:
+    """Sort the visualizer's data with the numeric kernel for ``algorithm``, recording
+    metrics but no steps.
+
+    Like the traced sorts, this leaves ``current_data`` sorted.
+    """
+    kernel = _load_kernels()[algorithm]
+    visualizer._start_time = perf_counter()
+    result, comparisons, swaps = run_kernel(kernel, visualizer.current_data)
+    visualizer._end_time = perf_counter()
+    visualizer.current_data[:] = result
+    
+    visualizer.metrics.comparisons += comparisons
+    visualizer.metrics.swaps += swaps
+    visualizer.metrics.execution_time = visualizer._end_time - visualizer._start_time
+    return result
 
 class MergeSortVisualizer(AlgorithmVisualizer):
     """Visualizer for Merge Sort algorithm."""
     
-    def __init__(self, name: str = "Merge Sort", data: Optional[Sequence[Union[int, float]]] = None):
-        super().__init__(name, data or [])
+    _INFO = {
+        'time_complexity': 'O(n log n)',
+        'space_complexity': 'O(n)',
+        'stability': 'Stable',
+        'description': 'Divide-and-conquer algorithm that recursively divides the array and merges sorted subarrays'
+    }
+    
+    MODES = ('recursive', 'bottom_up')
+    
+    def __init__(self, name: str = "Merge Sort", data: Optional[Sequence[Union[int, float]]] = None,
+                 mode: str = 'recursive', **options):
+        super().__init__(name, data, **options)
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown merge sort mode: {mode}. Available: {list(self.MODES)}")
+        # 'recursive' traces every divide and placement for teaching,
+        # 'bottom_up' merges width-doubling runs and records one step per pass
+        self.mode = mode
         self.recursion_depth = 0
         
     def sort(self) -> List[Number]:
         """Execute merge sort with step tracking."""
-        import time
         
         if not self.current_data:
             return []
         
-        self._start_time = time.time()
+        if not self.record_steps:
+            return _sort_untraced(self, 'merge_sort')
         
-        self.add_step("Starting Merge Sort", self.current_data.copy(), 
-                      highlighted_indices=list(range(len(self.current_data))))
+        self._start_time = perf_counter()
         
-        result = self._merge_sort_recursive(self.current_data.copy(), 0, len(self.current_data) - 1)
+        self.add_step("Starting Merge Sort", self.current_data, 
+                      highlighted_indices=range(len(self.current_data)))
         
-        self._end_time = time.time()
+        if self.mode == 'bottom_up':
+            result = self._merge_sort_bottom_up(self.current_data.copy())
+        else:
+            result = self._merge_sort_recursive(self.current_data.copy(), 0, len(self.current_data) - 1)
+        
+        self._end_time = perf_counter()
         self.metrics.execution_time = self._end_time - self._start_time
         
         self.add_step("Merge Sort Complete", result, 
-                      highlighted_indices=list(range(len(result))))
+                      highlighted_indices=range(len(result)), always_record=True)
+        self.current_data[:] = result
         return result
     
+    def _merge_sort_bottom_up(self, arr: List[Number]) -> List[Number]:
+        """Iterative merge sort over two ping-pong buffers, one step per pass."""
+        n = len(arr)
+        src, dst = arr, arr.copy()
+        width = 1
+        
+        while width < n:
+            self.metrics.comparisons += merge_pass(src, dst, width)
+            src, dst = dst, src
+            self.add_step(f"Merged sorted runs of width {width} into runs of width {2 * width}", 
+                          src, swapped_indices=range(n))
+            width *= 2
+        
+        return src
+    
     def _merge_sort_recursive(self, arr: List[Number], left: int, right: int) -> List[Number]:
         """Recursive merge sort implementation with visualization."""
         if left >= right:
@@ -43,9 +102,8 @@ class MergeSortVisualizer(AlgorithmVisualizer):
         mid = (left + right) // 2
         
         # Divide phase - show the current subarray being divided
-        current_state = arr.copy()
         self.add_step(f"Dividing subarray at indices {left}-{right} (mid={mid})", 
-                      current_state, highlighted_indices=[i for i in range(left, right + 1)])
+                      arr, highlighted_indices=range(left, right + 1))
         
         # Recursive calls
         left_half = self._merge_sort_recursive(arr, left, mid)
@@ -61,8 +119,8 @@ class MergeSortVisualizer(AlgorithmVisualizer):
         
         # Show the updated state after merging
         self.add_step(f"Merged subarray [{left}-{right}]: {merged}", 
-                      arr.copy(), 
-                      swapped_indices=[i for i in range(left, left + len(merged))])
+                      arr, 
+                      swapped_indices=range(left, left + len(merged)))
         
         self.recursion_depth -= 1
         return merged
@@ -80,86 +138,97 @@ class MergeSortVisualizer(AlgorithmVisualizer):
         
         self.add_step(f"Merging sorted subarrays: {left} and {right}", 
                       working_arr, 
-                      highlighted_indices=[i for i in range(left_start, right_end + 1)])
-        
-        while left_idx < len(left) and right_idx < len(right):
-            self.record_comparison(left_idx, right_idx)
+                      highlighted_indices=range(left_start, right_end + 1))
+        
+        # Sizes and bound methods are hoisted out of the per-element loops
+        n_left = len(left)
+        n_right = len(right)
+        add_step = self.add_step
+        add_step_fmt = self.add_step_fmt
+        append = merged.append
+        comparisons = 0
+        
+        while left_idx < n_left and right_idx < n_right:
+            comparisons += 1
             
             if left[left_idx] <= right[right_idx]:
-                merged.append(left[left_idx])
+                append(left[left_idx])
                 # Update working array to show current merge state
                 working_arr[merge_position] = left[left_idx]
-                self.add_step(f"Placing {left[left_idx]} from left subarray at position {merge_position}", 
-                              working_arr.copy(),
-                              comparison_indices=[left_start + left_idx, mid + 1 + right_idx],
-                              swapped_indices=[merge_position])
+                add_step(f"Placing {left[left_idx]} from left subarray at position {merge_position}", 
+                         working_arr,
+                         comparison_indices=[left_start + left_idx, mid + 1 + right_idx],
+                         swapped_indices=[merge_position])
                 left_idx += 1
             else:
-                merged.append(right[right_idx])
+                append(right[right_idx])
                 # Update working array to show current merge state
                 working_arr[merge_position] = right[right_idx]
-                self.add_step(f"Placing {right[right_idx]} from right subarray at position {merge_position}", 
-                              working_arr.copy(),
-                              comparison_indices=[left_start + left_idx, mid + 1 + right_idx],
-                              swapped_indices=[merge_position])
+                add_step(f"Placing {right[right_idx]} from right subarray at position {merge_position}", 
+                         working_arr,
+                         comparison_indices=[left_start + left_idx, mid + 1 + right_idx],
+                         swapped_indices=[merge_position])
                 right_idx += 1
             
             merge_position += 1
         
+        self.metrics.comparisons += comparisons
+        
         # Add remaining elements from left subarray
-        while left_idx < len(left):
-            merged.append(left[left_idx])
+        while left_idx < n_left:
+            append(left[left_idx])
             working_arr[merge_position] = left[left_idx]
-            self.add_step(f"Adding remaining element {left[left_idx]} from left at position {merge_position}", 
-                          working_arr.copy(), 
-                          highlighted_indices=[merge_position])
+            add_step_fmt("Adding remaining element {} from left at position {}", (left[left_idx], merge_position),
+                         working_arr, 
+                         highlighted_indices=[merge_position])
             left_idx += 1
             merge_position += 1
         
         # Add remaining elements from right subarray
-        while right_idx < len(right):
-            merged.append(right[right_idx])
+        while right_idx < n_right:
+            append(right[right_idx])
             working_arr[merge_position] = right[right_idx]
-            self.add_step(f"Adding remaining element {right[right_idx]} from right at position {merge_position}", 
-                          working_arr.copy(), 
-                          highlighted_indices=[merge_position])
+            add_step_fmt("Adding remaining element {} from right at position {}", (right[right_idx], merge_position),
+                         working_arr, 
+                         highlighted_indices=[merge_position])
             right_idx += 1
             merge_position += 1
         
         return merged
-    
-    def get_algorithm_info(self) -> Dict[str, str]:
-        """Return merge sort complexity information."""
-        return {
-            'time_complexity': 'O(n log n)',
-            'space_complexity': 'O(n)',
-            'stability': 'Stable',
-            'description': 'Divide-and-conquer algorithm that recursively divides the array and merges sorted subarrays'
-        }
 
 class QuickSortVisualizer(AlgorithmVisualizer):
     """Visualizer for Quick Sort algorithm."""
     
-    def __init__(self, name: str = "Quick Sort", data: Optional[Sequence[Union[int, float]]] = None):
-        super().__init__(name, data or [])
+    _INFO = {
+        'time_complexity': 'O(n²) worst, O(n log n) average',
+        'space_complexity': 'O(log n)',
+        'stability': 'Unstable',
+        'description': 'Divide-and-conquer algorithm that partitions around a pivot element'
+    }
+    
+    def __init__(self, name: str = "Quick Sort", data: Optional[Sequence[Union[int, float]]] = None,
+                 **options):
+        super().__init__(name, data, **options)
         
     def sort(self) -> List[Number]:
         """Execute quick sort with step tracking."""
         if not self.current_data:
             return []
         
-        import time
-        self._start_time = time.time()
+        if not self.record_steps:
+            return _sort_untraced(self, 'quick_sort')
+        
+        self._start_time = perf_counter()
         
-        self.add_step("Starting Quick Sort", self.current_data.copy(), 
-                      highlighted_indices=list(range(len(self.current_data))))
+        self.add_step("Starting Quick Sort", self.current_data, 
+                      highlighted_indices=range(len(self.current_data)))
         
         self._quick_sort_recursive(self.current_data, 0, len(self.current_data) - 1)
         
-        self.add_step("Quick Sort Complete", self.current_data.copy(), 
-                      highlighted_indices=list(range(len(self.current_data))))
+        self.add_step("Quick Sort Complete", self.current_data, 
+                      highlighted_indices=range(len(self.current_data)), always_record=True)
         
-        self._end_time = time.time()
+        self._end_time = perf_counter()
         self.metrics.execution_time = self._end_time - self._start_time
         
         return self.current_data.copy()
@@ -173,45 +242,65 @@ class QuickSortVisualizer(AlgorithmVisualizer):
             # Recursively sort subarrays
             if pivot_index > low:
                 self.add_step(f"Recursively sorting left subarray (indices {low}-{pivot_index-1})", 
-                              arr, highlighted_indices=[i for i in range(low, pivot_index)])
+                              arr, highlighted_indices=range(low, pivot_index))
                 self._quick_sort_recursive(arr, low, pivot_index - 1)
             
             if pivot_index < high:
                 self.add_step(f"Recursively sorting right subarray (indices {pivot_index+1}-{high})", 
-                              arr, highlighted_indices=[i for i in range(pivot_index + 1, high + 1)])
+                              arr, highlighted_indices=range(pivot_index + 1, high + 1))
                 self._quick_sort_recursive(arr, pivot_index + 1, high)
     
     def _partition_with_visualization(self, arr: List[Number], low: int, high: int) -> int:
         """Partition array with step-by-step visualization using in-place approach."""
-        pivot = arr[high]  # Choose last element as pivot for clearer visualization
+        if high - low >= 2:
+            # Median-of-three keeps sorted and reversed inputs from degrading to O(n²)
+            median = median_of_three(arr, low, high)
+            self.metrics.comparisons += 3
+            if median != high:
+                self.record_swap(median, high)
+                arr[median], arr[high] = arr[high], arr[median]
+                self.add_step(f"Median of three: moving {arr[high]} from index {median} to pivot position {high}", 
+                              arr, swapped_indices=[median, high])
+        
+        pivot = arr[high]  # Pivot sits at the end for clearer visualization
         
         self.add_step(f"Choosing pivot: {pivot} at index {high}", 
-                      arr.copy(), pivot_index=high, 
-                      highlighted_indices=[i for i in range(low, high + 1)])
+                      arr, pivot_index=high, 
+                      highlighted_indices=range(low, high + 1))
         
         # Index of smaller element (indicates right position of pivot)
         i = low - 1
+        # Counted locally and written back to the metrics once after the loop
+        comparisons = swaps = 0
+        add_step = self.add_step
+        add_step_fmt = self.add_step_fmt
         
         for j in range(low, high):
-            self.record_comparison(j, high)
-            self.add_step(f"Comparing arr[{j}]={arr[j]} with pivot {pivot}", 
-                          arr.copy(), pivot_index=high, 
-                          comparison_indices=[j, high],
-                          highlighted_indices=[i+1 if i >= 0 else low])
+            comparisons += 1
+            add_step_fmt("Comparing arr[{}]={} with pivot {}", (j, arr[j], pivot),
+                         arr, pivot_index=high, 
+                         comparison_indices=[j, high],
+                         highlighted_indices=[i+1 if i >= 0 else low])
             
-            # If current element is smaller than or equal to pivot
-            if arr[j] <= pivot:
+            # If current element is smaller than or equal to pivot. Every
+            # other element equal to the pivot stays right, so runs of
+            # duplicates split evenly instead of degrading to O(n²)
+            value = arr[j]
+            if value < pivot or (value == pivot and (j - low) % 2 == 0):
                 i += 1  # Increment index of smaller element
                 if i != j:
-                    self.record_swap(i, j)
+                    swaps += 1
                     arr[i], arr[j] = arr[j], arr[i]
-                    self.add_step(f"Swapping arr[{i}]={arr[i]} with arr[{j}]={arr[j]} (moving smaller element left)", 
-                                  arr.copy(), pivot_index=high,
-                                  swapped_indices=[i, j])
+                    add_step(f"Swapping arr[{i}]={arr[i]} with arr[{j}]={arr[j]} (moving smaller element left)", 
+                             arr, pivot_index=high,
+                             swapped_indices=[i, j])
                 else:
-                    self.add_step(f"arr[{j}]={arr[j]} <= pivot, already in correct relative position", 
-                                  arr.copy(), pivot_index=high,
-                                  highlighted_indices=[j])
+                    add_step_fmt("arr[{}]={} <= pivot, already in correct relative position", (j, arr[j]),
+                                 arr, pivot_index=high,
+                                 highlighted_indices=[j])
+        
+        self.metrics.comparisons += comparisons
+        self.metrics.swaps += swaps
         
         # Place pivot in correct position
         pivot_final_pos = i + 1
@@ -219,203 +308,229 @@ class QuickSortVisualizer(AlgorithmVisualizer):
             self.record_swap(pivot_final_pos, high)
             arr[pivot_final_pos], arr[high] = arr[high], arr[pivot_final_pos]
             self.add_step(f"Placing pivot {pivot} in final position {pivot_final_pos}", 
-                          arr.copy(), pivot_index=pivot_final_pos,
+                          arr, pivot_index=pivot_final_pos,
                           swapped_indices=[pivot_final_pos, high])
         else:
             self.add_step(f"Pivot {pivot} already in correct position {pivot_final_pos}", 
-                          arr.copy(), pivot_index=pivot_final_pos)
+                          arr, pivot_index=pivot_final_pos)
         
         # Show final partitioned state
-        self.add_step(f"Partition complete: elements ≤ {pivot} are left of index {pivot_final_pos}, elements > {pivot} are right", 
-                      arr.copy(), pivot_index=pivot_final_pos,
-                      highlighted_indices=[k for k in range(low, pivot_final_pos)] + 
-                                         [k for k in range(pivot_final_pos + 1, high + 1)])
+        self.add_step(f"Partition complete: elements < {pivot} are left of index {pivot_final_pos}, elements > {pivot} are right, elements equal to it are split", 
+                      arr, pivot_index=pivot_final_pos,
+                      highlighted_indices=[*range(low, pivot_final_pos),
+                                           *range(pivot_final_pos + 1, high + 1)])
         
         return pivot_final_pos
-    
-    def get_algorithm_info(self) -> Dict[str, str]:
-        """Return quick sort complexity information."""
-        return {
-            'time_complexity': 'O(n²) worst, O(n log n) average',
-            'space_complexity': 'O(log n)',
-            'stability': 'Unstable',
-            'description': 'Divide-and-conquer algorithm that partitions around a pivot element'
-        }
 
 class SelectionSortVisualizer(AlgorithmVisualizer):
     """Visualizer for Selection Sort algorithm."""
     
-    def __init__(self, name: str = "Selection Sort", data: Optional[Sequence[Union[int, float]]] = None):
-        super().__init__(name, data or [])
+    _INFO = {
+        'time_complexity': 'O(n²)',
+        'space_complexity': 'O(1)',
+        'stability': 'Unstable',
+        'description': 'Repeatedly finds the minimum element and moves it to the sorted portion'
+    }
+    
+    STEP_GRANULARITIES = ('fine', 'outer')
+    
+    def __init__(self, name: str = "Selection Sort", data: Optional[Sequence[Union[int, float]]] = None,
+                 step_granularity: str = 'fine', **options):
+        super().__init__(name, data, **options)
+        if step_granularity not in self.STEP_GRANULARITIES:
+            raise ValueError(f"Unknown step granularity: {step_granularity}. "
+                             f"Available: {list(self.STEP_GRANULARITIES)}")
+        # 'fine' records every comparison (teaching mode), 'outer' one scan per pass
+        self.step_granularity = step_granularity
         
     def sort(self) -> List[Number]:
         """Execute selection sort with step tracking."""
         if not self.current_data:
             return []
         
-        import time
-        self._start_time = time.time()
+        if not self.record_steps:
+            return _sort_untraced(self, 'selection_sort')
+        
+        self._start_time = perf_counter()
             
         # Work with a copy of the data for in-place sorting visualization
         arr = self.current_data.copy()
         n = len(arr)
         
-        self.add_step("Starting Selection Sort", arr.copy(), 
-                      highlighted_indices=list(range(len(arr))))
+        self.add_step("Starting Selection Sort", arr, 
+                      highlighted_indices=range(len(arr)))
         
         for i in range(n):
             # Find the minimum element in the remaining unsorted array
             min_idx = i
             
             self.add_step(f"Finding minimum in unsorted portion (indices {i}-{n-1})", 
-                          arr.copy(), 
-                          highlighted_indices=[j for j in range(i, n)],
+                          arr, 
+                          highlighted_indices=range(i, n),
                           pivot_index=min_idx)
             
-            # Search for minimum in remaining array
-            for j in range(i + 1, n):
-                self.record_comparison(min_idx, j)
-                self.add_step(f"Comparing arr[{j}]={arr[j]} with current minimum arr[{min_idx}]={arr[min_idx]}", 
-                              arr.copy(),
-                              comparison_indices=[min_idx, j],
-                              highlighted_indices=[k for k in range(i, n)])
-                
-                if arr[j] < arr[min_idx]:
-                    min_idx = j
-                    self.add_step(f"New minimum found: arr[{min_idx}]={arr[min_idx]}", 
-                                  arr.copy(),
-                                  highlighted_indices=[min_idx])
+            if self.step_granularity == 'outer':
+                # Single C-level scan per pass instead of a traced Python loop
+                min_idx = min(range(i, n), key=arr.__getitem__)
+                self.metrics.comparisons += n - i - 1
+            else:
+                # Search for minimum in remaining array
+                add_step_fmt = self.add_step_fmt
+                unsorted = range(i, n)
+                for j in range(i + 1, n):
+                    add_step_fmt("Comparing arr[{}]={} with current minimum arr[{}]={}", (j, arr[j], min_idx, arr[min_idx]),
+                                 arr,
+                                 comparison_indices=[min_idx, j],
+                                 highlighted_indices=unsorted)
+
+                    if arr[j] < arr[min_idx]:
+                        min_idx = j
+                        add_step_fmt("New minimum found: arr[{}]={}", (min_idx, arr[min_idx]),
+                                     arr,
+                                     highlighted_indices=[min_idx])
+                self.metrics.comparisons += n - i - 1
             
             # Swap the found minimum element with the first element of unsorted part
             if min_idx != i:
                 self.record_swap(i, min_idx)
                 arr[i], arr[min_idx] = arr[min_idx], arr[i]
                 self.add_step(f"Swapping arr[{i}]={arr[min_idx]} with arr[{min_idx}]={arr[i]}", 
-                              arr.copy(),
+                              arr,
                               swapped_indices=[i, min_idx])
             else:
                 self.add_step(f"Element arr[{i}]={arr[i]} is already in correct position", 
-                              arr.copy(),
+                              arr,
                               highlighted_indices=[i])
             
             # Show the sorted portion growing
             self.add_step(f"Sorted portion now includes indices 0-{i}: {arr[:i+1]}", 
-                          arr.copy(),
-                          highlighted_indices=[k for k in range(i + 1)])
+                          arr,
+                          highlighted_indices=range(i + 1))
         
-        self.add_step("Selection Sort Complete", arr.copy(), 
-                      highlighted_indices=list(range(len(arr))))
+        self.add_step("Selection Sort Complete", arr, 
+                      highlighted_indices=range(len(arr)), always_record=True)
         
-        self._end_time = time.time()
+        self._end_time = perf_counter()
         self.metrics.execution_time = self._end_time - self._start_time
         
+        self.current_data[:] = arr
         return arr
-    
-    def get_algorithm_info(self) -> Dict[str, str]:
-        """Return selection sort complexity information."""
-        return {
-            'time_complexity': 'O(n²)',
-            'space_complexity': 'O(1)',
-            'stability': 'Unstable',
-            'description': 'Repeatedly finds the minimum element and moves it to the sorted portion'
-        }
 
 class PriorityQueueSortVisualizer(AlgorithmVisualizer):
     """Visualizer for Priority Queue Sort (Heap Sort variant)."""
     
-    def __init__(self, name: str = "Priority Queue Sort", data: Optional[Sequence[Union[int, float]]] = None):
-        super().__init__(name, data or [])
+    _INFO = {
+        'time_complexity': 'O(n log n)',
+        'space_complexity': 'O(n)',
+        'stability': 'Depends on implementation',
+        'description': 'Uses a priority queue (heap) to extract elements in sorted order'
+    }
+    
+    def __init__(self, name: str = "Priority Queue Sort", data: Optional[Sequence[Union[int, float]]] = None,
+                 **options):
+        super().__init__(name, data, **options)
         
     def sort(self) -> List[Number]:
-        """Execute priority queue sort with step tracking."""
+        """Execute priority queue sort with step tracking.
+
+        Like the other sorts, this leaves ``current_data`` sorted. The
+        comparisons happen inside heapq, or TimSort when steps are off, and
+        are not counted, so the comparison and swap metrics stay zero.
+        """
         if not self.current_data:
             return []
         
-        import time
-        import heapq
+        self._start_time = perf_counter()
         
-        self._start_time = time.time()
+        if not self.record_steps:
+            # Nothing to show, so let TimSort do the work in C
+            result = sorted(self.current_data)
+            self.current_data[:] = result
+            self._end_time = perf_counter()
+            self.metrics.execution_time = self._end_time - self._start_time
+            return result
             
         # Work with a copy of the original data
         arr = self.current_data.copy()
         
-        self.add_step("Starting Priority Queue Sort (using min-heap)", arr.copy(), 
-                      highlighted_indices=list(range(len(arr))))
+        self.add_step("Starting Priority Queue Sort (using min-heap)", arr, 
+                      highlighted_indices=range(len(arr)))
         
         # Build heap in-place
-        self.add_step("Building min-heap from array", arr.copy())
+        self.add_step("Building min-heap from array", arr)
         heapq.heapify(arr)
-        self.add_step("Min-heap built", arr.copy(), 
-                      highlighted_indices=list(range(len(arr))))
+        self.add_step("Min-heap built", arr, 
+                      highlighted_indices=range(len(arr)))
         
         # Extract elements from heap to build sorted array
         result = []
         heap_size = len(arr)
+        # Record every k-th extraction so large inputs produce O(n) snapshot data
+        stride = max(1, heap_size // 32)
         
-        for i in range(heap_size):
-            if arr:  # Check if heap is not empty
-                min_val = heapq.heappop(arr)
-                result.append(min_val)
-                
+        for extracted in range(1, heap_size + 1):
+            min_val = heapq.heappop(arr)
+            result.append(min_val)
+            
+            if extracted % stride == 0 or not arr:
                 self.add_step(f"Extracted minimum: {min_val} (heap size now {len(arr)})", 
-                              result + arr,  # Show sorted portion + remaining heap
+                              chain(result, arr),  # Show sorted portion + remaining heap
                               swapped_indices=[len(result) - 1],  # Highlight newly added element
-                              highlighted_indices=list(range(len(result), len(result) + len(arr))))  # Highlight remaining heap
+                              highlighted_indices=range(len(result), len(result) + len(arr)))  # Highlight remaining heap
         
         self.add_step("Priority Queue Sort Complete", result, 
-                      highlighted_indices=list(range(len(result))))
+                      highlighted_indices=range(len(result)), always_record=True)
+        self.current_data[:] = result
         
-        self._end_time = time.time()
+        self._end_time = perf_counter()
         self.metrics.execution_time = self._end_time - self._start_time
         
         return result
-    
-    def get_algorithm_info(self) -> Dict[str, str]:
-        """Return priority queue sort complexity information."""
-        return {
-            'time_complexity': 'O(n log n)',
-            'space_complexity': 'O(n)',
-            'stability': 'Depends on implementation',
-            'description': 'Uses a priority queue (heap) to extract elements in sorted order'
-        }
 
 class BinarySearchVisualizer(AlgorithmVisualizer):
     """Visualizer for Binary Search algorithm."""
     
-    def __init__(self, name: str = "Binary Search", data: Optional[Sequence[Union[int, float]]] = None):
-        super().__init__(name, data or [])
+    _INFO = {
+        'time_complexity': 'O(log n)',
+        'space_complexity': 'O(log n) recursive, O(1) iterative',
+        'stability': 'N/A (search algorithm)',
+        'description': 'Efficient search algorithm that works on sorted arrays by repeatedly dividing the search interval in half'
+    }
+    
+    def __init__(self, name: str = "Binary Search", data: Optional[Sequence[Union[int, float]]] = None,
+                 **options):
+        super().__init__(name, data, **options)
         self.target = None
         
     def search(self, target: Union[int, float]) -> int:
         """Execute binary search with step tracking."""
-        import time
         
         if not self.current_data:
             return -1
         
         self.target = target
-        self._start_time = time.time()
+        self._start_time = perf_counter()
         
         # Ensure data is sorted first
         sorted_data = sorted(self.current_data)
         self.current_data = sorted_data
         
         self.add_step(f"Starting Binary Search for target: {target}", 
-                      self.current_data.copy(), 
-                      highlighted_indices=list(range(len(self.current_data))))
+                      self.current_data, 
+                      highlighted_indices=range(len(self.current_data)))
         
         result = self._binary_search_recursive(sorted_data, target, 0, len(sorted_data) - 1)
         
-        self._end_time = time.time()
+        self._end_time = perf_counter()
         self.metrics.execution_time = self._end_time - self._start_time
         
         if result != -1:
             self.add_step(f"Target {target} found at index {result}!", 
-                          self.current_data.copy(), 
-                          highlighted_indices=[result])
+                          self.current_data, 
+                          highlighted_indices=[result], always_record=True)
         else:
             self.add_step(f"Target {target} not found in array", 
-                          self.current_data.copy())
+                          self.current_data, always_record=True)
         
         return result
     
@@ -430,26 +545,26 @@ class BinarySearchVisualizer(AlgorithmVisualizer):
         
         # Show current search range
         self.add_step(f"Searching in range [{left}, {right}], checking middle element at index {mid}", 
-                      arr.copy(), 
+                      arr, 
                       highlighted_indices=[mid],
-                      comparison_indices=list(range(left, right + 1)))
+                      comparison_indices=range(left, right + 1))
         
         if arr[mid] == target:
             self.add_step(f"Found target {target} at index {mid}!", 
-                          arr.copy(), 
+                          arr, 
                           highlighted_indices=[mid])
             return mid
         elif arr[mid] > target:
             self.add_step(f"Target {target} < {arr[mid]}, searching left half", 
-                          arr.copy(), 
+                          arr, 
                           highlighted_indices=[mid],
-                          comparison_indices=list(range(left, mid)))
+                          comparison_indices=range(left, mid))
             return self._binary_search_recursive(arr, target, left, mid - 1)
         else:
             self.add_step(f"Target {target} > {arr[mid]}, searching right half", 
-                          arr.copy(), 
+                          arr, 
                           highlighted_indices=[mid],
-                          comparison_indices=list(range(mid + 1, right + 1)))
+                          comparison_indices=range(mid + 1, right + 1))
             return self._binary_search_recursive(arr, target, mid + 1, right)
     
     def sort(self) -> List[Number]:
@@ -459,53 +574,50 @@ class BinarySearchVisualizer(AlgorithmVisualizer):
         else:
             # If no target is set, search for a random element from the data
             if self.current_data:
-                import random
                 self.target = random.choice(self.current_data)
                 self.search(self.target)
         return self.current_data
-    
-    def get_algorithm_info(self) -> Dict[str, str]:
-        """Return binary search complexity information."""
-        return {
-            'time_complexity': 'O(log n)',
-            'space_complexity': 'O(log n) recursive, O(1) iterative',
-            'stability': 'N/A (search algorithm)',
-            'description': 'Efficient search algorithm that works on sorted arrays by repeatedly dividing the search interval in half'
-        }
 
 class BubbleSortVisualizer(AlgorithmVisualizer):
     """Visualizer for Bubble Sort algorithm."""
     
-    def __init__(self, name: str = "Bubble Sort", data: Optional[Sequence[Union[int, float]]] = None):
-        super().__init__(name, data or [])
+    _INFO = {
+        'time_complexity': 'O(n²) worst/average, O(n) best',
+        'space_complexity': 'O(1)',
+        'stability': 'Stable',
+        'description': 'Simple sorting algorithm that repeatedly steps through the list, compares adjacent elements and swaps them if they are in the wrong order'
+    }
+    
+    def __init__(self, name: str = "Bubble Sort", data: Optional[Sequence[Union[int, float]]] = None,
+                 **options):
+        super().__init__(name, data, **options)
         
     def sort(self) -> List[Number]:
         """Execute bubble sort with step tracking."""
-        import time
         
         if not self.current_data:
             return []
         
-        self._start_time = time.time()
+        self._start_time = perf_counter()
         
         arr = self.current_data.copy()
         n = len(arr)
         
-        self.add_step("Starting Bubble Sort", arr.copy(), 
-                      highlighted_indices=list(range(len(arr))))
+        self.add_step("Starting Bubble Sort", arr, 
+                      highlighted_indices=range(len(arr)))
         
         for i in range(n):
             swapped = False
             self.add_step(f"Pass {i + 1}: Bubbling largest elements to the end", 
-                          arr.copy(), 
-                          highlighted_indices=list(range(n - i)))
+                          arr, 
+                          highlighted_indices=range(n - i))
             
             for j in range(0, n - i - 1):
                 self.metrics.comparisons += 1
                 
-                self.add_step(f"Comparing elements at indices {j} and {j + 1}: {arr[j]} vs {arr[j + 1]}", 
-                              arr.copy(), 
-                              comparison_indices=[j, j + 1])
+                self.add_step_fmt("Comparing elements at indices {} and {}: {} vs {}", (j, j + 1, arr[j], arr[j + 1]),
+                                  arr, 
+                                  comparison_indices=[j, j + 1])
                 
                 if arr[j] > arr[j + 1]:
                     # Swap elements
@@ -514,46 +626,45 @@ class BubbleSortVisualizer(AlgorithmVisualizer):
                     self.metrics.swaps += 1
                     
                     self.add_step(f"Swapped {arr[j + 1]} and {arr[j]} - bubble larger element up", 
-                                  arr.copy(), 
+                                  arr, 
                                   swapped_indices=[j, j + 1])
                 else:
-                    self.add_step(f"No swap needed: {arr[j]} <= {arr[j + 1]}", 
-                                  arr.copy(), 
-                                  highlighted_indices=[j, j + 1])
+                    self.add_step_fmt("No swap needed: {} <= {}", (arr[j], arr[j + 1]),
+                                      arr, 
+                                      highlighted_indices=[j, j + 1])
             
             # Show completion of this pass
             if not swapped:
                 self.add_step(f"No swaps in pass {i + 1} - array is sorted!", 
-                              arr.copy(), 
-                              highlighted_indices=list(range(len(arr))))
+                              arr, 
+                              highlighted_indices=range(len(arr)))
                 break
             else:
                 self.add_step(f"Pass {i + 1} complete - element {arr[n - i - 1]} is in final position", 
-                              arr.copy(), 
+                              arr, 
                               highlighted_indices=[n - i - 1])
         
-        self._end_time = time.time()
+        self._end_time = perf_counter()
         self.metrics.execution_time = self._end_time - self._start_time
         
         self.add_step("Bubble Sort Complete", arr, 
-                      highlighted_indices=list(range(len(arr))))
+                      highlighted_indices=range(len(arr)), always_record=True)
         
         return arr
-    
-    def get_algorithm_info(self) -> Dict[str, str]:
-        """Return bubble sort complexity information."""
-        return {
-            'time_complexity': 'O(n²) worst/average, O(n) best',
-            'space_complexity': 'O(1)',
-            'stability': 'Stable',
-            'description': 'Simple sorting algorithm that repeatedly steps through the list, compares adjacent elements and swaps them if they are in the wrong order'
-        }
 
 class BreadthFirstSearchVisualizer(AlgorithmVisualizer):
     """Visualizer for Breadth-First Search (BFS) on a graph represented as an adjacency list."""
     
-    def __init__(self, name: str = "Breadth-First Search", data: Optional[Sequence[Union[int, float]]] = None):
-        super().__init__(name, data or [])
+    _INFO = {
+        'time_complexity': 'O(V + E) where V is vertices and E is edges',
+        'space_complexity': 'O(V) for the queue',
+        'stability': 'N/A (search algorithm)',
+        'description': 'Graph traversal algorithm that explores neighbors level by level, guaranteeing shortest path in unweighted graphs'
+    }
+    
+    def __init__(self, name: str = "Breadth-First Search", data: Optional[Sequence[Union[int, float]]] = None,
+                 **options):
+        super().__init__(name, data, **options)
         self.graph = {}
         self.start_node = None
         self.target_node = None
@@ -570,31 +681,28 @@ class BreadthFirstSearchVisualizer(AlgorithmVisualizer):
             5: [2, 4]
         }
         # For visualization, we'll use the node numbers as "data"
-        self.current_data: List[Number] = [i for i in range(6)]  # Nodes 0 through 5
+        self.current_data: List[Number] = list(range(6))  # Nodes 0 through 5
         
     def search(self, start: int, target: Optional[int] = None) -> List[int]:
         """Execute BFS with step tracking."""
-        import time
-        from collections import deque
-        
         if not self.graph:
             self.create_sample_graph()
         
         self.start_node = start
         self.target_node = target
         
-        self._start_time = time.time()
+        self._start_time = perf_counter()
         
         visited = set()
         queue = deque([start])
         path = []
         
         self.add_step(f"Starting BFS from node {start}", 
-                      self.current_data.copy(), 
+                      self.current_data, 
                       highlighted_indices=[start])
         
         self.add_step(f"Initialize queue with start node {start}", 
-                      self.current_data.copy(), 
+                      self.current_data, 
                       highlighted_indices=[start])
         
         while queue:
@@ -608,13 +716,13 @@ class BreadthFirstSearchVisualizer(AlgorithmVisualizer):
             self.metrics.comparisons += 1
             
             self.add_step(f"Visiting node {current}, adding to path", 
-                          self.current_data.copy(), 
+                          self.current_data, 
                           highlighted_indices=[current],
                           comparison_indices=list(visited))
             
             if target is not None and current == target:
                 self.add_step(f"Target node {target} found!", 
-                              self.current_data.copy(), 
+                              self.current_data, 
                               highlighted_indices=[current])
                 break
             
@@ -625,21 +733,21 @@ class BreadthFirstSearchVisualizer(AlgorithmVisualizer):
             if new_neighbors:
                 queue.extend(new_neighbors)
                 self.add_step(f"Adding neighbors {new_neighbors} of node {current} to queue", 
-                              self.current_data.copy(), 
+                              self.current_data, 
                               highlighted_indices=[current],
                               comparison_indices=new_neighbors)
             
             self.add_step(f"Queue now contains: {list(queue)}", 
-                          self.current_data.copy(), 
+                          self.current_data, 
                           highlighted_indices=list(queue),
                           comparison_indices=list(visited))
         
-        self._end_time = time.time()
+        self._end_time = perf_counter()
         self.metrics.execution_time = self._end_time - self._start_time
         
         self.add_step(f"BFS complete. Visited path: {path}", 
-                      self.current_data.copy(), 
-                      highlighted_indices=path)
+                      self.current_data, 
+                      highlighted_indices=path, always_record=True)
         
         return path
     
@@ -653,15 +761,6 @@ class BreadthFirstSearchVisualizer(AlgorithmVisualizer):
         else:
             result = self.search(0)  # Default start from node 0
         return self.current_data
-    
-    def get_algorithm_info(self) -> Dict[str, str]:
-        """Return BFS complexity information."""
-        return {
-            'time_complexity': 'O(V + E) where V is vertices and E is edges',
-            'space_complexity': 'O(V) for the queue',
-            'stability': 'N/A (search algorithm)',
-            'description': 'Graph traversal algorithm that explores neighbors level by level, guaranteeing shortest path in unweighted graphs'
-        }
 
 # Registry of available algorithms
 AVAILABLE_ALGORITHMS: Dict[str, Type[AlgorithmVisualizer]] = {
@@ -679,7 +778,7 @@ def create_algorithm_visualizer(algorithm_name: str, data: Sequence[Union[int, f
     if algorithm_name not in AVAILABLE_ALGORITHMS:
         raise ValueError(f"Unknown algorithm: {algorithm_name}. Available: {list(AVAILABLE_ALGORITHMS.keys())}")
     
-    return AVAILABLE_ALGORITHMS[algorithm_name](name=algorithm_name, data=list(data))
+    return AVAILABLE_ALGORITHMS[algorithm_name](name=algorithm_name, data=data)
 
 def get_available_algorithms() -> List[str]:
     """Get list of available algorithm names."""
@@ -690,6 +789,4 @@ def get_algorithm_info(algorithm_name: str) -> Dict[str, str]:
     if algorithm_name not in AVAILABLE_ALGORITHMS:
         raise ValueError(f"Unknown algorithm: {algorithm_name}")
     
-    # Create temporary instance to get info
-    temp_instance = AVAILABLE_ALGORITHMS[algorithm_name](name=algorithm_name, data=[])
-    return temp_instance.get_algorithm_info()
\ No newline at end of file
+    return AVAILABLE_ALGORITHMS[algorithm_name].get_algorithm_info()
\ No newline at end of file
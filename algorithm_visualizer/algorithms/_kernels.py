@@ -0,0 +1,327 @@
+"""
+Numeric sort kernels used when step recording is disabled.
+
+The kernels sort a buffer in place and return ``(comparisons, swaps)`` so the
+visualizers can still report metrics without building any AlgorithmSteps.
+They are written as plain Python; ``_load_kernels`` imports Numba on the
+first untraced sort and compiles them with ``njit``, so importing the package
+does not load Numba or NumPy. Without Numba the very same functions run as
+plain Python on a list, except quick sort, which uses vectorized partitions
+when NumPy is available.
+"""
+
+from types import FunctionType
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from .. import _is_installed
+from ..core.base import Number
+
+# Probed without importing Numba; cleared by _load_kernels if the import fails
+NUMBA_AVAILABLE = _is_installed('numba')
+
+
+def merge_pass(src, dst, width):
+    """Merge adjacent sorted runs of ``width`` from ``src`` into ``dst``.
+
+    Returns the number of comparisons made. Kept as plain Python so the
+    traced bottom-up merge sort can share it with the compiled kernel.
+    """
+    n = len(src)
+    comparisons = 0
+    for lo in range(0, n, 2 * width):
+        mid = min(lo + width, n)
+        hi = min(lo + 2 * width, n)
+        i = lo
+        j = mid
+        k = lo
+        while i < mid and j < hi:
+            comparisons += 1
+            if src[i] <= src[j]:
+                dst[k] = src[i]
+                i += 1
+            else:
+                dst[k] = src[j]
+                j += 1
+            k += 1
+        if i < mid:
+            dst[k:hi] = src[i:mid]
+        else:
+            dst[k:hi] = src[j:hi]
+    return comparisons
+
+
+def merge_sort_kernel(arr):
+    """Bottom-up merge sort ping-ponging between ``arr`` and one scratch buffer."""
+    n = len(arr)
+    comparisons = 0
+    src = arr
+    dst = arr.copy()
+    in_scratch = False
+    width = 1
+    while width < n:
+        comparisons += merge_pass(src, dst, width)
+        src, dst = dst, src
+        in_scratch = not in_scratch
+        width *= 2
+    if in_scratch:
+        arr[:] = src
+    return comparisons, 0
+
+
+# Runs shorter than this are finished with comb sort instead of partitioning
+_SMALL_RUN = 32
+
+
+def median_of_three(arr, low, high):
+    """Return the index of the median of ``arr[low]``, ``arr[mid]`` and ``arr[high]``."""
+    mid = (low + high) // 2
+    a = arr[low]
+    b = arr[mid]
+    c = arr[high]
+    if a <= b:
+        if b <= c:
+            return mid
+        return high if a <= c else low
+    if a <= c:
+        return low
+    return high if b <= c else mid
+
+
+def _comb_sort_range(arr, low, high):
+    """Comb sort ``arr[low:high + 1]`` in place with the usual 1.3 shrink factor."""
+    comparisons = 0
+    swaps = 0
+    gap = high - low + 1
+    done = False
+    while not done:
+        gap = int(gap / 1.3)
+        if gap <= 1:
+            gap = 1
+            done = True
+        for i in range(low, high - gap + 1):
+            comparisons += 1
+            if arr[i] > arr[i + gap]:
+                swaps += 1
+                arr[i], arr[i + gap] = arr[i + gap], arr[i]
+                done = False
+    return comparisons, swaps
+
+
+def quick_sort_kernel(arr):
+    """Iterative quick sort with a median-of-three Lomuto partition.
+
+    Elements equal to the pivot are split between both sides. Runs shorter than ``_SMALL_RUN`` are finished with comb sort.
+    """
+    comparisons = 0
+    swaps = 0
+    stack = [0, len(arr) - 1]
+    while stack:
+        high = stack.pop()
+        low = stack.pop()
+        if high - low < _SMALL_RUN:
+            if low < high:
+                run_comparisons, run_swaps = _comb_sort_range(arr, low, high)
+                comparisons += run_comparisons
+                swaps += run_swaps
+            continue
+        median = median_of_three(arr, low, high)
+        comparisons += 3
+        if median != high:
+            swaps += 1
+            arr[median], arr[high] = arr[high], arr[median]
+        pivot = arr[high]
+        i = low - 1
+        for j in range(low, high):
+            comparisons += 1
+            # Elements equal to the pivot alternate sides, as in the traced
+            # partition, so runs of duplicates do not degrade to O(n²)
+            value = arr[j]
+            if value < pivot or (value == pivot and (j - low) % 2 == 0):
+                i += 1
+                if i != j:
+                    swaps += 1
+                    arr[i], arr[j] = arr[j], arr[i]
+        pivot_pos = i + 1
+        if pivot_pos != high:
+            swaps += 1
+            arr[pivot_pos], arr[high] = arr[high], arr[pivot_pos]
+        stack.append(pivot_pos + 1)
+        stack.append(high)
+        stack.append(low)
+        stack.append(pivot_pos - 1)
+    return comparisons, swaps
+
+
+# Segments shorter than this are partitioned element-wise; the fixed cost of
+# the mask operations only pays off on longer ones
+_MASK_PARTITION_MIN = 128
+
+
+def _quick_sort_masked(arr):
+    """Quick sort fallback for when NumPy is installed but Numba is not.
+
+    Long segments are partitioned three ways around a median-of-three pivot
+    with vectorized ``<`` and ``==`` masks instead of element-wise swaps, so
+    runs equal to the pivot are placed once and never partitioned again;
+    short ones run the plain kernel on a list. Each element that ends up in
+    a different region (less, equal or greater) counts as one swap, as in a
+    Dutch national flag partition.
+    """
+    import numpy as np
+
+    buffer = np.array(arr)
+    counts = [0, 0]
+    stack = [0, len(buffer) - 1]
+    while stack:
+        high = stack.pop()
+        low = stack.pop()
+        if low >= high:
+            continue
+        if high - low < _MASK_PARTITION_MIN:
+            segment = buffer[low:high + 1].tolist()
+            comparisons, swaps = quick_sort_kernel(segment)
+            buffer[low:high + 1] = segment
+            counts[0] += comparisons
+            counts[1] += swaps
+            continue
+        median = median_of_three(buffer, low, high)
+        counts[0] += 3
+        if median != high:
+            counts[1] += 1
+            buffer[median], buffer[high] = buffer[high], buffer[median]
+        segment = buffer[low:high + 1]
+        pivot = buffer[high]
+        less = segment < pivot
+        equal = segment == pivot
+        # Everything else, NaN included, goes right
+        regions = np.where(less, 0, np.where(equal, 1, 2))
+        sizes = np.bincount(regions, minlength=3)
+        counts[0] += len(segment) - 1
+        counts[1] += int(np.count_nonzero(regions != np.repeat(np.arange(3), sizes)))
+        equal_start = low + int(sizes[0])
+        equal_end = equal_start + int(sizes[1])
+        buffer[low:high + 1] = np.concatenate((segment[less], segment[equal], segment[regions == 2]))
+        stack.append(equal_end)
+        stack.append(high)
+        stack.append(low)
+        stack.append(equal_start - 1)
+    arr[:] = buffer.tolist()
+    return counts[0], counts[1]
+
+
+def selection_sort_kernel(arr):
+    """Selection sort with the visualizer's comparison and swap accounting."""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+    for i in range(n):
+        min_idx = i
+        for j in range(i + 1, n):
+            comparisons += 1
+            if arr[j] < arr[min_idx]:
+                min_idx = j
+        if min_idx != i:
+            swaps += 1
+            arr[i], arr[min_idx] = arr[min_idx], arr[i]
+    return comparisons, swaps
+
+
+# Kernels by algorithm, filled in by _load_kernels on the first untraced sort
+_KERNELS: Dict[str, Callable] = {}
+
+
+def _compile(njit: Callable, func: Callable, helpers: Dict[str, Callable]) -> Callable:
+    """Compile ``func`` with ``njit``, resolving its calls to ``helpers`` to compiled versions.
+
+    The plain function is left as it is, so the traced sorts and the masked
+    quick sort can keep calling it on lists.
+    """
+    namespace = dict(func.__globals__, **helpers)
+    return njit(cache=True)(FunctionType(func.__code__, namespace, func.__name__))
+
+
+def _load_kernels() -> Dict[str, Callable]:
+    """Return the sort kernels keyed by algorithm, building them on first use."""
+    global NUMBA_AVAILABLE
+    if _KERNELS:
+        return _KERNELS
+    if NUMBA_AVAILABLE:
+        try:
+            from numba import njit
+        except ImportError:
+            NUMBA_AVAILABLE = False
+    if NUMBA_AVAILABLE:
+        helpers = {func.__name__: _compile(njit, func, {})
+                   for func in (merge_pass, median_of_three, _comb_sort_range)}
+        _KERNELS.update(merge_sort=_compile(njit, merge_sort_kernel, helpers),
+                        quick_sort=_compile(njit, quick_sort_kernel, helpers),
+                        selection_sort=_compile(njit, selection_sort_kernel, helpers))
+    else:
+        _KERNELS.update(merge_sort=merge_sort_kernel,
+                        quick_sort=_quick_sort_masked if _is_installed('numpy') else quick_sort_kernel,
+                        selection_sort=selection_sort_kernel)
+    return _KERNELS
+
+
+# Range of values an int64 buffer can hold without overflowing
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _kernel_dtype(data: Sequence[Number]) -> str:
+    """Pick the buffer dtype for the compiled kernels.
+
+    All-int input that fits in 64 bits is sorted as ``int64``, so Numba
+    compiles integer specializations and the result keeps its ints;
+    anything else falls back to ``float64``.
+    """
+    if all(type(value) is int for value in data):
+        if not data or (_INT64_MIN <= min(data) and max(data) <= _INT64_MAX):
+            return 'int64'
+    return 'float64'
+
+
+def warm_up_sample(data: Sequence[Number]) -> List[Number]:
+    """Return a two-element input that makes the kernels compile for ``data``.
+
+    Sorting the sample with ``record_steps=False`` compiles the same
+    specialization that sorting ``data`` will use, so a timed sort of
+    ``data`` does not include compilation. The sample is empty when
+    nothing needs compiling.
+    """
+    if not NUMBA_AVAILABLE:
+        return []
+    if _kernel_dtype(data) == 'int64':
+        return [1, 0]
+    return [1.0, 0.0]
+
+
+def _holds_ints(data: Sequence[Number]) -> bool:
+    """Return True if ``data`` holds any value that is not a float."""
+    return any(type(value) is not float for value in data)
+
+
+def run_kernel(kernel: Callable, data: Sequence[Number]) -> Tuple[List[Number], int, int]:
+    """Sort a copy of ``data`` with ``kernel``.
+
+    Returns the sorted list together with the comparison and swap counts.
+    The list holds the values of ``data`` themselves, as the traced sorts
+    return them, even when the kernel sorted a float buffer.
+    """
+    if NUMBA_AVAILABLE:
+        import numpy as np
+
+        dtype = _kernel_dtype(data)
+        buffer = np.array(data, dtype=dtype)
+        comparisons, swaps = kernel(buffer)
+        result = buffer.tolist()
+        comparisons, swaps = int(comparisons), int(swaps)
+        if dtype == 'float64' and _holds_ints(data):
+            # The float buffer rounded the ints, which for ones beyond int64
+            # can even merge distinct values; the counts still hold, but the
+            # values are taken from data in sorted order
+            result = sorted(data)
+    else:
+        result = list(data)
+        comparisons, swaps = kernel(result)
+    return result, comparisons, swaps
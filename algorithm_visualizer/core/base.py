@@ -5,26 +5,33 @@ This module contains the fundamental abstract base classes and data structures
 that all algorithm visualizers inherit from.
 """
 
+import random
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Union, Dict, Any, Optional, Sequence
-import time
+from typing import List, Union, Dict, Any, Optional, Sequence, Iterable, Iterator, Collection, Tuple
 
 Number = Union[int, float]
 
-@dataclass
+# ``slots=True`` drops the per-instance __dict__ (Python 3.10+); thousands of
+# steps are kept per run, so the saving adds up
+DATACLASS_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_SLOTS)
 class AlgorithmStep:
     """Represents a single step in algorithm execution."""
     step_number: int
     description: str
     array_state: List[Number]
-    highlighted_indices: List[int] = field(default_factory=list)
-    comparison_indices: List[int] = field(default_factory=list)
-    swapped_indices: List[int] = field(default_factory=list)
+    # Index fields accept any sequence; visualizers pass ``range`` objects
+    # for contiguous spans instead of materializing lists
+    highlighted_indices: Sequence[int] = field(default_factory=list)
+    comparison_indices: Sequence[int] = field(default_factory=list)
+    swapped_indices: Sequence[int] = field(default_factory=list)
     pivot_index: Optional[int] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PerformanceMetrics:
     """Tracks algorithm performance metrics."""
     execution_time: float = 0.0
@@ -36,41 +43,123 @@ class PerformanceMetrics:
     steps: int = 0  # Added missing steps attribute
     additional_metrics: Dict[str, Any] = field(default_factory=dict)
 
+def _as_number_list(data: Optional[Sequence[Number]]) -> List[Number]:
+    """Convert input data to a list of Python numbers.
+
+    Typed buffers such as ``array.array`` or NumPy arrays are unboxed in one
+    ``tolist()`` call instead of element by element.
+    """
+    if data is None:
+        return []
+    if hasattr(data, 'tolist'):
+        return data.tolist()
+    return list(data)
+
+def index_set(indices: Sequence[int]) -> Collection[int]:
+    """Return ``indices`` as a container with O(1) membership tests.
+
+    Renderers call this once per step before testing every element; ranges
+    and sets are returned as-is, other sequences become a frozenset.
+    """
+    if isinstance(indices, (range, set, frozenset)):
+        return indices
+    return frozenset(indices)
+
 class AlgorithmVisualizer(ABC):
     """Abstract base class for algorithm visualizers."""
     
-    def __init__(self, name: str, data: Optional[Sequence[Number]] = None):
+    def __init__(self, name: str, data: Optional[Sequence[Number]] = None,
+                 record_steps: bool = True, step_sample_rate: float = 1.0,
+                 max_steps: Optional[int] = None):
         self.name = name
-        self.original_data = list(data or [])  # Convert to list for internal use
-        self.current_data = list(data or [])   # Convert to list for internal use
+        # Always a fresh list, so callers can pass their data without copying it
+        self.current_data = _as_number_list(data)
+        self.original_data = self.current_data.copy()
         self.steps: List[AlgorithmStep] = []
         self.metrics = PerformanceMetrics()
         self.step_counter = 0
         self._start_time: float = 0.0
         self._end_time: float = 0.0
+        # When False, sorts only collect metrics and skip the step trace
+        self.record_steps = record_steps
+        # Fraction of ordinary steps kept, and an optional cap on stored steps
+        self.step_sample_rate = step_sample_rate
+        self.max_steps = max_steps
+        self._last_snapshot: Optional[List[Number]] = None
+        # (state key, summary) from the last get_performance_summary() call
+        self._summary_cache: Optional[Tuple[tuple, Dict[str, Any]]] = None
         
     @abstractmethod
     def sort(self) -> List[Number]:
         """Execute the sorting algorithm with step tracking."""
         pass
     
-    @abstractmethod
-    def get_algorithm_info(self) -> Dict[str, str]:
+    # Static complexity and description information, set by each algorithm
+    _INFO: Dict[str, str] = {}
+    
+    @classmethod
+    def get_algorithm_info(cls) -> Dict[str, str]:
         """Return algorithm complexity and description information."""
-        pass
+        return dict(cls._INFO)
     
-    def add_step(self, description: str, array_state: List[Number], 
-                 highlighted_indices: Optional[List[int]] = None,
-                 comparison_indices: Optional[List[int]] = None,
-                 swapped_indices: Optional[List[int]] = None,
+    def add_step(self, description: str, array_state: Iterable[Number], 
+                 highlighted_indices: Optional[Sequence[int]] = None,
+                 comparison_indices: Optional[Sequence[int]] = None,
+                 swapped_indices: Optional[Sequence[int]] = None,
                  pivot_index: Optional[int] = None,
+                 always_record: bool = False,
                  **metadata):
-        """Add a step to the algorithm execution trace."""
+        """Add a step to the algorithm execution trace.
+
+        The step takes its own snapshot of ``array_state``, so callers should
+        pass the live working array rather than a copy of it. Consecutive
+        steps whose array did not change share the same snapshot list, so
+        recorded array states must be treated as read-only.
+
+        Steps may be dropped according to ``record_steps``,
+        ``step_sample_rate`` and ``max_steps``; the first step, swap steps and
+        steps marked ``always_record`` survive sampling, and the first step and
+        steps marked ``always_record`` also survive ``max_steps``.
+        """
+        self.step_counter += 1
+        if not self._should_record(swapped_indices, always_record):
+            return
+        self._append_step(description, array_state, highlighted_indices,
+                          comparison_indices, swapped_indices, pivot_index, metadata)
+    
+    def add_step_fmt(self, template: str, args: tuple, array_state: Iterable[Number],
+                     highlighted_indices: Optional[Sequence[int]] = None,
+                     comparison_indices: Optional[Sequence[int]] = None,
+                     swapped_indices: Optional[Sequence[int]] = None,
+                     pivot_index: Optional[int] = None,
+                     always_record: bool = False,
+                     **metadata):
+        """Add a step whose description is ``template.format(*args)``.
+
+        Behaves like :meth:`add_step`, but the description is only formatted
+        when the step is actually kept, so hot loops pay nothing for steps
+        dropped by sampling, ``max_steps`` or ``record_steps=False``.
+        """
         self.step_counter += 1
+        if not self._should_record(swapped_indices, always_record):
+            return
+        self._append_step(template.format(*args), array_state, highlighted_indices,
+                          comparison_indices, swapped_indices, pivot_index, metadata)
+    
+    def _append_step(self, description: str, array_state: Iterable[Number],
+                     highlighted_indices: Optional[Sequence[int]],
+                     comparison_indices: Optional[Sequence[int]],
+                     swapped_indices: Optional[Sequence[int]],
+                     pivot_index: Optional[int],
+                     metadata: Dict[str, Any]):
+        """Snapshot ``array_state`` and append the step to the trace."""
+        snapshot = self._last_snapshot
+        if snapshot is None or snapshot != array_state:
+            snapshot = self._last_snapshot = list(array_state)
         step = AlgorithmStep(
             step_number=self.step_counter,
             description=description,
-            array_state=array_state.copy(),
+            array_state=snapshot,
             highlighted_indices=highlighted_indices or [],
             comparison_indices=comparison_indices or [],
             swapped_indices=swapped_indices or [],
@@ -79,33 +168,78 @@ class AlgorithmVisualizer(ABC):
         )
         self.steps.append(step)
     
-    def record_comparison(self, i: int, j: int):
-        """Record a comparison operation."""
+    def _should_record(self, swapped_indices: Optional[Sequence[int]],
+                       always_record: bool) -> bool:
+        """Decide whether the step being added is kept in the trace.
+
+        A step marked ``always_record`` that arrives once ``max_steps`` is
+        reached replaces the latest stored step (never the first one), so
+        the cap holds and the trace still ends on the final state.
+        """
+        if not self.record_steps:
+            return False
+        if always_record:
+            if self.max_steps is not None and len(self.steps) >= max(self.max_steps, 2):
+                self.steps.pop()
+            return True
+        if not self.steps:
+            return True
+        if self.max_steps is not None and len(self.steps) >= self.max_steps:
+            return False
+        if swapped_indices or self.step_sample_rate >= 1.0:
+            return True
+        return random.random() < self.step_sample_rate
+    
+    def record_comparison(self, i: Optional[int] = None, j: Optional[int] = None):
+        """Record a comparison operation.
+
+        The indices are informational only; hot loops may instead count
+        locally and add the total to ``self.metrics`` once.
+        """
         self.metrics.comparisons += 1
     
-    def record_swap(self, i: int, j: int):
+    def record_swap(self, i: Optional[int] = None, j: Optional[int] = None):
         """Record a swap operation."""
         self.metrics.swaps += 1
     
     def get_performance_summary(self) -> Dict[str, Any]:
-        """Get comprehensive performance summary."""
-        return {
+        """Get comprehensive performance summary.
+
+        The summary is cached until the metrics or the recorded steps change;
+        each call returns a copy, so callers may modify it freely.
+        """
+        metrics = self.metrics
+        key = (self.name, len(self.original_data), metrics.execution_time, metrics.comparisons,
+               metrics.swaps, len(self.steps), metrics.memory_usage)
+        if self._summary_cache is not None and self._summary_cache[0] == key:
+            return self._copy_summary(self._summary_cache[1])
+        summary = {
             'algorithm': self.name,
             'array_size': len(self.original_data),
-            'execution_time': self.metrics.execution_time,
-            'comparisons': self.metrics.comparisons,
-            'swaps': self.metrics.swaps,
+            'execution_time': metrics.execution_time,
+            'comparisons': metrics.comparisons,
+            'swaps': metrics.swaps,
             'total_steps': len(self.steps),
-            'memory_usage': self.metrics.memory_usage,
+            'memory_usage': metrics.memory_usage,
             'complexity_info': self.get_algorithm_info()
         }
+        self._summary_cache = (key, summary)
+        return self._copy_summary(summary)
+    
+    @staticmethod
+    def _copy_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a cached summary, including its nested complexity info."""
+        return {**summary, 'complexity_info': dict(summary['complexity_info'])}
     
     def reset(self):
         """Reset the visualizer to initial state."""
         self.current_data = self.original_data.copy()
-        self.steps.clear()
+        # Rebind rather than clear so lists handed out by get_steps() stay intact
+        self.steps = []
         self.metrics = PerformanceMetrics()
         self.step_counter = 0
+        self._last_snapshot = None
+        self._summary_cache = None
     
     def get_sorted_data(self) -> List[Number]:
         """Get the sorted data from the last step or by running sort if not yet sorted."""
@@ -117,8 +251,19 @@ class AlgorithmVisualizer(ABC):
             return self.sort()
     
     def get_steps(self) -> List[AlgorithmStep]:
-        """Get the list of recorded algorithm steps."""
-        return self.steps.copy()
+        """Get the list of recorded algorithm steps.
+
+        The list is returned without copying and must be treated as read-only.
+        """
+        return self.steps
+    
+    def iter_steps(self) -> Iterator[AlgorithmStep]:
+        """Iterate over the recorded steps without building a new list.
+
+        Steps recorded while iterating are picked up; a reset() does not
+        affect an iteration already in progress.
+        """
+        return iter(self.steps)
     
     def get_performance_metrics(self) -> PerformanceMetrics:
         """Get the performance metrics object."""
@@ -131,5 +276,5 @@ class AlgorithmVisualizer(ABC):
         """Print all algorithm steps in a formatted way."""
         from .text_visualizer import TextVisualizer
         visualizer = TextVisualizer()
-        for step in self.steps:
+        for step in self.iter_steps():
             visualizer.print_step(step)
\ No newline at end of file
@@ -5,6 +5,7 @@ This module provides tools for comparing multiple algorithms on the same dataset
 and generating performance reports.
 """
 
+import sys
 import time
 from typing import List, Dict, Any, Optional, Type, Union, Sequence
 from .base import AlgorithmVisualizer, Number
@@ -17,14 +18,27 @@ class AlgorithmComparator:
         self.results: Dict[str, AlgorithmVisualizer] = {}
     
     def add_algorithm(self, visualizer_class: Type[AlgorithmVisualizer], 
-                      name: Optional[str] = None) -> AlgorithmVisualizer:
-        """Add an algorithm to the comparison."""
-        visualizer = visualizer_class(name or visualizer_class.__name__, 
-                                      list(self.data))  # Convert to list
+                      name: Optional[str] = None,
+                      record_steps: bool = True) -> AlgorithmVisualizer:
+        """Add an algorithm to the comparison.
+
+        With ``record_steps=False`` the algorithm runs without a step trace,
+        which lets the sorts use their compiled kernels; those are warmed up
+        on a small input of the same kind first, so compilation is not
+        included in the timing.
+        """
+        name = name or visualizer_class.__name__
+        if record_steps:
+            # AlgorithmVisualizer copies its input, so the shared data can be passed as-is
+            visualizer = visualizer_class(name, self.data)
+        else:
+            from ..algorithms._kernels import warm_up_sample
+            visualizer_class(name, warm_up_sample(self.data), record_steps=False).sort()
+            visualizer = visualizer_class(name, self.data, record_steps=False)
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         sorted_data = visualizer.sort()
-        end_time = time.time()
+        end_time = time.perf_counter()
         
         visualizer.metrics.execution_time = end_time - start_time
         self.results[visualizer.name] = visualizer
@@ -35,27 +49,34 @@ class AlgorithmComparator:
         """Add a pre-computed algorithm result to the comparison."""
         self.results[name] = visualizer
     
+    def _get_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Collect each algorithm's performance summary once, keyed by name."""
+        return {name: visualizer.get_performance_summary()
+                for name, visualizer in self.results.items()}
+    
     def get_comparison_report(self) -> Dict[str, Any]:
         """Generate a comprehensive comparison report."""
         if not self.results:
             return {}
         
+        summaries = self._get_summaries()
         report = {
             'dataset_size': len(self.data),
-            'algorithms': {},
+            'algorithms': summaries,
             'rankings': {}
         }
         
-        # Collect metrics for each algorithm
-        for name, visualizer in self.results.items():
-            report['algorithms'][name] = visualizer.get_performance_summary()
-        
         # Create rankings
         metrics = ['execution_time', 'comparisons', 'swaps', 'total_steps']
+        if len(summaries) == 1:
+            # A single algorithm ranks first on every metric; nothing to sort
+            report['rankings'] = {metric: list(summaries) for metric in metrics}
+            return report
+        names = list(summaries)
         for metric in metrics:
-            ranking = sorted(self.results.items(), 
-                           key=lambda x: x[1].get_performance_summary()[metric])
-            report['rankings'][metric] = [name for name, _ in ranking]
+            # Sorting by a plain name -> value dict keeps the key a C-level lookup
+            values = {name: summary[metric] for name, summary in summaries.items()}
+            report['rankings'][metric] = sorted(names, key=values.__getitem__)
         
         return report
     
@@ -66,10 +87,8 @@ class AlgorithmComparator:
             return
         
         # Prepare data
-        names = list(self.results.keys())
         data = []
-        for name in names:
-            summary = self.results[name].get_performance_summary()
+        for name, summary in self._get_summaries().items():
             data.append([
                 name,
                 f"{summary['execution_time']:.6f}",
@@ -80,18 +99,20 @@ class AlgorithmComparator:
         
         # Print table
         headers = ["Algorithm", "Time (s)", "Comparisons", "Swaps", "Steps"]
-        col_widths = [max(len(str(row[i])) for row in [headers] + data) + 2 for i in range(len(headers))]
-        
-        # Print header
-        print("\n" + "="*sum(col_widths))
-        print("".join(f"{headers[i]:<{col_widths[i]}}" for i in range(len(headers))))
-        print("="*sum(col_widths))
-        
-        # Print data rows
+        # Cells are already strings, so widths come from one pass over the rows
+        col_widths = [len(header) for header in headers]
         for row in data:
-            print("".join(f"{row[i]:<{col_widths[i]}}" for i in range(len(row))))
+            for i, cell in enumerate(row):
+                if len(cell) > col_widths[i]:
+                    col_widths[i] = len(cell)
+        widths = tuple(width + 2 for width in col_widths)
+        sep = "=" * sum(widths)
         
-        print("="*sum(col_widths))
+        # Assemble the whole table and emit it with a single write
+        lines = ["", sep, "".join(header.ljust(width) for header, width in zip(headers, widths)), sep]
+        lines.extend("".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in data)
+        lines.append(sep)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def clear_results(self):
         """Clear all comparison results."""
@@ -106,6 +127,5 @@ class AlgorithmComparator:
         if metric not in valid_metrics:
             raise ValueError(f"Invalid metric. Must be one of: {valid_metrics}")
         
-        best_name = min(self.results.items(), 
-                        key=lambda x: x[1].get_performance_summary()[metric])[0]
-        return best_name
\ No newline at end of file
+        summaries = self._get_summaries()
+        return min(summaries, key=lambda name: summaries[name][metric])
\ No newline at end of file
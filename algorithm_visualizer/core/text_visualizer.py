@@ -5,109 +5,158 @@ This module provides ASCII-based visualization that works in any terminal
 without requiring graphics libraries.
 """
 
-from typing import Dict
+import io
+import sys
+from typing import Dict, List, Optional, TextIO
 from .base import AlgorithmStep, AlgorithmVisualizer
 
+# Fixed-width summary box; no surrounding whitespace, so reports need no strip()
+_REPORT_TEMPLATE = (
+    "╔══════════════════════════════════════════╗\n"
+    "║           ALGORITHM ANALYSIS REPORT       ║\n"
+    "╠══════════════════════════════════════════╣\n"
+    "║ Algorithm: {algorithm:<25} ║\n"
+    "║ Array Size: {array_size:<24} ║\n"
+    "║ Execution Time: {execution_time:<19} ║\n"
+    "║ Total Steps: {total_steps:<23} ║\n"
+    "║ Comparisons: {comparisons:<23} ║\n"
+    "║ Swaps: {swaps:<29} ║\n"
+    "╠══════════════════════════════════════════╣\n"
+    "║ Time Complexity: {time_complexity:<19} ║\n"
+    "║ Space Complexity: {space_complexity:<18} ║\n"
+    "╚══════════════════════════════════════════╝"
+)
+
+# Element roles, used as indices into TextVisualizer._symbols
+ROLE_DEFAULT = 0
+ROLE_COMPARING = 1
+ROLE_HIGHLIGHTED = 2
+ROLE_SWAPPED = 3
+ROLE_PIVOT = 4
+
+_ROLE_NAMES = ('default', 'comparing', 'highlighted', 'swapped', 'pivot')
+
 class TextVisualizer:
     """Text-based visualization for environments without graphics libraries."""
     
     def __init__(self):
-        self.color_symbols = {
-            'default': '█',
-            'comparing': '▓',
-            'highlighted': '▒',
-            'swapped': '░',
-            'pivot': '▀'
-        }
+        # Symbols indexed by role; color_symbols is the same table keyed by role name
+        self._symbols = ('█', '▓', '▒', '░', '▀')
+        self.color_symbols = dict(zip(_ROLE_NAMES, self._symbols))
+    
+    def print_step(self, step: AlgorithmStep, width: int = 80, file: Optional[TextIO] = None):
+        """Print a text representation of the algorithm step to ``file`` (stdout by default)."""
+        (file or sys.stdout).write(self._format_step(step, width))
     
-    def print_step(self, step: AlgorithmStep, width: int = 80):
-        """Print a text representation of the algorithm step."""
-        print(f"\nStep {step.step_number}: {step.description}")
-        print("-" * width)
+    def _format_step(self, step: AlgorithmStep, width: int = 80) -> str:
+        """Render a step as the newline-terminated text printed by :meth:`print_step`."""
+        lines = [f"\nStep {step.step_number}: {step.description}", "-" * width]
         
         # Create visual representation
-        array_str = "["
-        for i, value in enumerate(step.array_state):
-            symbol = self._get_symbol(i, step)
-            array_str += f"{symbol} {value:3} "
-        array_str = array_str.rstrip() + "]"
+        symbols = self._symbols_for_step(step, len(step.array_state))
+        cells = [f"{symbol} {value:3}" for symbol, value in zip(symbols, step.array_state)]
+        array_str = "[" + " ".join(cells) + "]"
         
-        print(f"Array: {array_str}")
+        lines.append(f"Array: {array_str}")
         
         # Add legend
+        symbol_table = self._symbols
         legend = []
         if step.comparison_indices:
-            legend.append(f"{self.color_symbols['comparing']} = Comparing")
+            legend.append(f"{symbol_table[ROLE_COMPARING]} = Comparing")
         if step.highlighted_indices:
-            legend.append(f"{self.color_symbols['highlighted']} = Highlighted")
+            legend.append(f"{symbol_table[ROLE_HIGHLIGHTED]} = Highlighted")
         if step.swapped_indices:
-            legend.append(f"{self.color_symbols['swapped']} = Swapped")
+            legend.append(f"{symbol_table[ROLE_SWAPPED]} = Swapped")
         if step.pivot_index is not None:
-            legend.append(f"{self.color_symbols['pivot']} = Pivot")
+            legend.append(f"{symbol_table[ROLE_PIVOT]} = Pivot")
         
         if legend:
-            print("Legend: " + " | ".join(legend))
+            lines.append("Legend: " + " | ".join(legend))
+        
+        return "\n".join(lines) + "\n"
+    
+    def _symbols_for_step(self, step: AlgorithmStep, n: int) -> List[str]:
+        """Get the symbols for all ``n`` elements of a step at once.
+
+        Roles are written from lowest to highest priority, so the result
+        matches calling :meth:`_get_symbol` for every index.
+        """
+        symbol_table = self._symbols
+        symbols = [symbol_table[ROLE_DEFAULT]] * n
+        for indices, role in ((step.highlighted_indices, ROLE_HIGHLIGHTED),
+                              (step.comparison_indices, ROLE_COMPARING),
+                              (step.swapped_indices, ROLE_SWAPPED)):
+            symbol = symbol_table[role]
+            for i in indices:
+                if 0 <= i < n:
+                    symbols[i] = symbol
+        if step.pivot_index is not None and 0 <= step.pivot_index < n:
+            symbols[step.pivot_index] = symbol_table[ROLE_PIVOT]
+        return symbols
     
     def _get_symbol(self, index: int, step: AlgorithmStep) -> str:
         """Get the symbol for an array element based on its role."""
+        return self._symbols[self._get_role(index, step)]
+    
+    def _get_role(self, index: int, step: AlgorithmStep) -> int:
+        """Get the ROLE_* constant for an array element."""
         if step.pivot_index == index:
-            return self.color_symbols['pivot']
+            return ROLE_PIVOT
         elif index in step.swapped_indices:
-            return self.color_symbols['swapped']
+            return ROLE_SWAPPED
         elif index in step.comparison_indices:
-            return self.color_symbols['comparing']
+            return ROLE_COMPARING
         elif index in step.highlighted_indices:
-            return self.color_symbols['highlighted']
+            return ROLE_HIGHLIGHTED
         else:
-            return self.color_symbols['default']
+            return ROLE_DEFAULT
     
     def create_summary_report(self, visualizer: AlgorithmVisualizer) -> str:
         """Create a text summary report."""
         summary = visualizer.get_performance_summary()
-        info = visualizer.get_algorithm_info()
-        
-        # Format execution time properly
-        exec_time = summary['execution_time']
-        if exec_time == 0:
-            time_str = "0.000000s"
-        else:
-            time_str = f"{exec_time:.6f}s"
-        
-        report = f"""
-╔══════════════════════════════════════════╗
-║           ALGORITHM ANALYSIS REPORT       ║
-╠══════════════════════════════════════════╣
-║ Algorithm: {summary['algorithm']:<25} ║
-║ Array Size: {summary['array_size']:<24} ║
-║ Execution Time: {time_str:<19} ║
-║ Total Steps: {summary['total_steps']:<23} ║
-║ Comparisons: {summary['comparisons']:<23} ║
-║ Swaps: {summary['swaps']:<29} ║
-╠══════════════════════════════════════════╣
-║ Time Complexity: {info.get('time_complexity', 'N/A'):<19} ║
-║ Space Complexity: {info.get('space_complexity', 'N/A'):<18} ║
-╚══════════════════════════════════════════╝
-        """.strip()
-        
-        return report
+        info = summary['complexity_info']
+        return _REPORT_TEMPLATE.format(
+            algorithm=summary['algorithm'],
+            array_size=summary['array_size'],
+            execution_time=f"{summary['execution_time']:.6f}s",
+            total_steps=summary['total_steps'],
+            comparisons=summary['comparisons'],
+            swaps=summary['swaps'],
+            time_complexity=info.get('time_complexity', 'N/A'),
+            space_complexity=info.get('space_complexity', 'N/A'),
+        )
     
-    def print_all_steps(self, visualizer: AlgorithmVisualizer, max_steps: int = 20):
-        """Print all steps of an algorithm execution."""
-        if not visualizer.steps:
-            print("No steps recorded for this algorithm.")
+    def print_all_steps(self, visualizer: AlgorithmVisualizer, max_steps: int = 20,
+                        paginate: bool = False, file: Optional[TextIO] = None):
+        """Print the steps of an algorithm execution followed by its summary.
+
+        Only the first ``max_steps`` steps are shown unless ``paginate`` is
+        set, in which case every step is shown. The text is rendered into a
+        buffer and written to ``file`` (stdout by default) in one call;
+        paginated output to stdout goes through ``pydoc.pager`` instead.
+        """
+        steps = visualizer.steps
+        if not steps:
+            print("No steps recorded for this algorithm.", file=file)
             return
         
-        print(f"\n🎬 All Steps for {visualizer.name}")
-        print("=" * 60)
+        out = io.StringIO()
+        out.write(f"\n🎬 All Steps for {visualizer.name}\n")
+        out.write("=" * 60 + "\n")
+        
+        end = len(steps) if paginate else min(max_steps, len(steps))
+        for step in steps[:end]:
+            self.print_step(step, file=out)
         
-        steps_to_show = visualizer.steps[:max_steps]
-        for step in steps_to_show:
-            self.print_step(step)
-            if len(visualizer.steps) > max_steps:
-                input("Press Enter to continue...")
+        if end < len(steps):
+            out.write(f"\n... and {len(steps) - end} more steps\n")
         
-        if len(visualizer.steps) > max_steps:
-            print(f"\n... and {len(visualizer.steps) - max_steps} more steps")
+        out.write("\n📊 Final Summary:\n")
+        out.write(self.create_summary_report(visualizer) + "\n")
         
-        print(f"\n📊 Final Summary:")
-        print(self.create_summary_report(visualizer))
\ No newline at end of file
+        if paginate and (file is None or file is sys.stdout):
+            import pydoc  # Only needed for paging, and slow to import
+            pydoc.pager(out.getvalue())
+        else:
+            (file or sys.stdout).write(out.getvalue())
@@ -10,6 +10,7 @@ This example demonstrates:
 
 import sys
 import os
+from types import MappingProxyType
 
 # Add parent directory to path to import algorithm_visualizer
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,22 +22,25 @@ from algorithm_visualizer.core.comparator import AlgorithmComparator
 from algorithm_visualizer.utils.data_io import generate_random_data
 
 
+# Built once at import; exposed read-only through get_available_algorithms()
+_AVAILABLE_ALGORITHMS = {
+    'merge_sort': MergeSortVisualizer,
+    'quick_sort': QuickSortVisualizer,
+    'selection_sort': SelectionSortVisualizer,
+    'priority_queue_sort': PriorityQueueSortVisualizer
+}
+
+
 def get_available_algorithms():
     """Get available algorithm visualizers."""
-    return {
-        'merge_sort': MergeSortVisualizer,
-        'quick_sort': QuickSortVisualizer,
-        'selection_sort': SelectionSortVisualizer,
-        'priority_queue_sort': PriorityQueueSortVisualizer
-    }
+    return MappingProxyType(_AVAILABLE_ALGORITHMS)
 
 
 def create_algorithm_visualizer(algorithm_name: str, data):
     """Create an algorithm visualizer instance."""
-    algorithms = get_available_algorithms()
-    if algorithm_name not in algorithms:
+    if algorithm_name not in _AVAILABLE_ALGORITHMS:
         raise ValueError(f"Unknown algorithm: {algorithm_name}")
-    return algorithms[algorithm_name](algorithm_name, data)
+    return _AVAILABLE_ALGORITHMS[algorithm_name](algorithm_name, data)
 
 
 def basic_example():
@@ -49,7 +53,7 @@ def basic_example():
     
     # Create and run a merge sort visualizer
     print("\n--- Running Merge Sort ---")
-    visualizer = create_algorithm_visualizer('merge_sort', data.copy())
+    visualizer = create_algorithm_visualizer('merge_sort', data)
     visualizer.sort()
     
     # Show results
@@ -84,7 +88,7 @@ def comparison_example():
     print("\nRunning algorithms...")
     for algorithm in algorithms:
         print(f"  Running {algorithm}...")
-        visualizer = create_algorithm_visualizer(algorithm, data.copy())
+        visualizer = create_algorithm_visualizer(algorithm, data)
         visualizer.sort()
         comparator.add_result(algorithm, visualizer)
     
@@ -108,7 +112,7 @@ def step_visualization_example():
     
     # Run selection sort (good for step visualization)
     print("\n--- Selection Sort Steps ---")
-    visualizer = create_algorithm_visualizer('selection_sort', data.copy())
+    visualizer = create_algorithm_visualizer('selection_sort', data)
     visualizer.sort()
     
     # Print steps
@@ -130,7 +134,7 @@ def performance_analysis_example():
         data = generate_random_data(size, 1, size, seed=42)
         
         for algorithm in algorithms:
-            visualizer = create_algorithm_visualizer(algorithm, data.copy())
+            visualizer = create_algorithm_visualizer(algorithm, data)
             visualizer.sort()
             metrics = visualizer.get_performance_metrics()
             
@@ -1,14 +1,19 @@
 """User interface components for algorithm visualization."""
 
+from importlib.util import find_spec
+
 from .cli import CLIInterface
-from .dashboard import StreamlitDashboard
 
-# Optional import
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except ImportError:
-    STREAMLIT_AVAILABLE = False
+# Checked without importing streamlit; the dashboard itself is imported on first use
+STREAMLIT_AVAILABLE = find_spec('streamlit') is not None
+
+def __getattr__(name: str):
+    """Import StreamlitDashboard on first access, since it pulls in streamlit."""
+    if name == 'StreamlitDashboard':
+        from .dashboard import StreamlitDashboard
+        globals()[name] = StreamlitDashboard
+        return StreamlitDashboard
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'CLIInterface',
@@ -16,4 +21,4 @@ __all__ = [
 ]
 
 if STREAMLIT_AVAILABLE:
-    __all__.append('StreamlitDashboard')
\ No newline at end of file
+    __all__.append('StreamlitDashboard')
@@ -8,86 +8,84 @@ using CSS animations and modern web technologies within Streamlit.
 import streamlit as st
 import streamlit.components.v1 as components
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import json
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 
-class AlgorithmAnimator:
-    """Modern animation system for algorithm visualization."""
-    
-    def __init__(self):
-        self.animation_config = {
-            'duration': 0.6,  # Reduced for smoother feel
-            'easing': 'cubic-bezier(0.25, 0.46, 0.45, 0.94)',  # Improved easing for smoother motion
-            'transition_delay': 0.05,  # Stagger animations for better visual flow
-            'colors': {
-                'default': '#64B5F6',      # Light blue
-                'comparing': '#FFB74D',     # Orange
-                'swapping': '#E57373',      # Red
-                'sorted': '#81C784',        # Green
-                'pivot': '#BA68C8',         # Purple
-                'highlight': '#FFD54F',     # Yellow
-                'background': '#1E1E1E',    # Dark background
-                'text': '#FFFFFF'           # White text
-            },
-            'shadows': {
-                'default': '0 2px 4px rgba(0,0,0,0.1)',
-                'active': '0 4px 12px rgba(100, 181, 246, 0.3)',
-                'glow': '0 0 20px rgba(255, 183, 77, 0.5)'
-            },
-            'performance': {
-                'gpu_acceleration': True,
-                'will_change': 'transform, height, background-color',
-                'backface_visibility': 'hidden'
-            }
-        }
-    
-    def create_animated_bars(self, data: List[int], step_info: Dict[str, Any]) -> str:
-        """Create animated bar chart HTML with CSS animations."""
-        max_value = max(data) if data else 1
-        
-        # Generate CSS for animations
-        css = self._generate_animation_css()
-        
-        # Generate HTML for bars
-        html = f"""
-        <div class="algorithm-container">
-            <style>{css}</style>
-            <div class="bars-container">
-        """
-        
-        for i, value in enumerate(data):
-            height_percent = (value / max_value) * 100
-            bar_class = self._get_bar_class(i, step_info)
-            
-            html += f"""
-                <div class="bar {bar_class}" 
-                     style="height: {height_percent}%; --value: {value}; --index: {i};"
-                     data-index="{i}"
-                     data-value="{value}">
-                    <div class="bar-value">{value}</div>
-                </div>
-            """
-        
-        html += """
-            </div>
-        </div>
-        """
-        
-        return html
-    
-    def _generate_animation_css(self) -> str:
-        """Generate CSS for smooth animations."""
-        colors = self.animation_config['colors']
-        shadows = self.animation_config['shadows']
-        duration = self.animation_config['duration']
-        easing = self.animation_config['easing']
-        
-        return f"""
+from ..core.base import DATACLASS_SLOTS, Number, index_set
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a step payload to compact JSON, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class AnimationColors:
+    """Colors used by the animated bars."""
+    default: str = '#64B5F6'      # Light blue
+    comparing: str = '#FFB74D'    # Orange
+    swapping: str = '#E57373'     # Red
+    sorted: str = '#81C784'       # Green
+    pivot: str = '#BA68C8'        # Purple
+    highlight: str = '#FFD54F'    # Yellow
+    background: str = '#1E1E1E'   # Dark background
+    text: str = '#FFFFFF'         # White text
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class AnimationShadows:
+    """Box shadows for idle, hovered and glowing bars."""
+    default: str = '0 2px 4px rgba(0,0,0,0.1)'
+    active: str = '0 4px 12px rgba(100, 181, 246, 0.3)'
+    glow: str = '0 0 20px rgba(255, 183, 77, 0.5)'
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class AnimationPerformance:
+    """Rendering hints written into the bar CSS."""
+    gpu_acceleration: bool = True
+    will_change: str = 'transform'
+    backface_visibility: str = 'hidden'
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class AnimationConfig:
+    """Timing and styling of the bar animations; immutable once created."""
+    duration: float = 0.6  # Reduced for smoother feel
+    easing: str = 'cubic-bezier(0.25, 0.46, 0.45, 0.94)'  # Improved easing for smoother motion
+    transition_delay: float = 0.05  # Stagger animations for better visual flow
+    max_fps: int = 30  # Upper bound on steps drawn per second, whatever the speed
+    canvas_threshold: int = 128  # Compact charts with this many bars are drawn on a canvas
+    colors: AnimationColors = field(default_factory=AnimationColors)
+    shadows: AnimationShadows = field(default_factory=AnimationShadows)
+    performance: AnimationPerformance = field(default_factory=AnimationPerformance)
+
+
+def _with_index_sets(step_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of ``step_info`` whose ``*_indices`` entries test membership in O(1)."""
+    return {key: index_set(value) if key.endswith('_indices') and value is not None else value
+            for key, value in step_info.items()}
+
+
+# Stylesheet for the animated bars, filled in from an AnimationConfig by _animation_css
+_CSS_TEMPLATE = """
         .algorithm-container {{
             padding: 20px;
-            background: linear-gradient(135deg, {colors['background']} 0%, #2D2D2D 100%);
+            background: linear-gradient(135deg, {color_background} 0%, #2D2D2D 100%);
             border-radius: 12px;
-            box-shadow: {shadows['default']};
+            box-shadow: {shadow_default};
             font-family: 'SF Pro Display', -apple-system, BlinkMacSystemFont, sans-serif;
         }}
         
@@ -99,37 +97,80 @@ class AlgorithmAnimator:
             gap: 4px;
             padding: 20px 0;
             position: relative;
+            /* Per-bar delay step; bars offset their animations by --index */
+            --stagger: {transition_delay}s;
+            /* Skip rendering the bars while the chart is scrolled out of view;
+               the explicit height keeps its size stable meanwhile */
+            content-visibility: auto;
         }}
         
         .bar {{
-            background: linear-gradient(to top, {colors['default']}, #42A5F5);
+            background: linear-gradient(to top, {color_default}, #42A5F5);
             border-radius: 4px 4px 0 0;
             min-width: 30px;
             position: relative;
-            transition: all {duration}s {easing};
+            /* Only transform and box-shadow change between bar states; the
+               backgrounds are gradients, which do not transition */
+            transition: transform {duration}s {easing}, box-shadow {duration}s {easing};
             cursor: pointer;
-            box-shadow: {shadows['default']};
-            will-change: {self.animation_config['performance']['will_change']};
-            backface-visibility: {self.animation_config['performance']['backface_visibility']};
-            transform: translateZ(0); /* Force GPU acceleration */
+            box-shadow: {shadow_default};
+            will-change: {will_change};
+            backface-visibility: {backface_visibility};
+            /* Bars span the full height and are scaled by --h, so value changes
+               animate on the compositor instead of re-running layout */
+            height: 100%;
+            transform-origin: bottom center;
+            transform: translateZ(0) scaleY(var(--h, 1)); /* Force GPU acceleration */
+            animation-delay: calc(var(--index, 0) * var(--stagger, 0s));
+            /* Keep a bar's layout changes from invalidating its siblings; no
+               paint containment, which would clip the value label above it */
+            contain: layout style;
         }}
         
-        .bar:nth-child(n) {{
-            animation-delay: calc(var(--index, 0) * {self.animation_config['transition_delay']}s);
+        .bar:hover {{
+            transform: translateY(-2px) translateZ(0) scaleY(var(--h, 1));
+            box-shadow: {shadow_active};
+            transition: transform 0.2s {easing}, box-shadow 0.2s {easing};
         }}
         
-        .bar:hover {{
-            transform: translateY(-2px) translateZ(0);
-            box-shadow: {shadows['active']};
-            transition: all 0.2s {easing};
+        .info-panel {{
+            background: linear-gradient(135deg, {color_background} 0%, #2D2D2D 100%);
+            border-radius: 12px;
+            padding: 20px;
+            margin: 10px 0;
+            border-left: 4px solid {color_default};
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+        }}
+        
+        .step-title {{
+            color: {color_default};
+            font-size: 18px;
+            font-weight: 600;
+            margin-bottom: 10px;
+        }}
+        
+        .step-description {{
+            color: {color_text};
+            font-size: 14px;
+            line-height: 1.5;
+        }}
+        
+        .step-counter {{
+            color: {color_highlight};
+            font-size: 12px;
+            font-weight: 500;
+            text-transform: uppercase;
+            letter-spacing: 1px;
         }}
         
         .bar-value {{
             position: absolute;
-            top: -25px;
+            top: 0;
             left: 50%;
-            transform: translateX(-50%);
-            color: {colors['text']};
+            /* Undo the bar's scaleY so the label keeps its size above the bar */
+            transform-origin: top center;
+            transform: translateX(-50%) scaleY(calc(1 / var(--h, 1))) translateY(-125%);
+            color: {color_text};
             font-weight: 600;
             font-size: 12px;
             opacity: 0;
@@ -142,117 +183,96 @@ class AlgorithmAnimator:
         
         /* Animation states with improved performance */
         .bar.comparing {{
-            background: linear-gradient(to top, {colors['comparing']}, #FFB74D);
-            animation: smoothPulse 1.2s ease-in-out infinite alternate;
-            box-shadow: {shadows['glow']};
-            transform: translateZ(0) scale(1.02);
+            background: linear-gradient(to top, {color_comparing}, #FFB74D);
+            --pulse-scale-from: 1;
+            --pulse-scale-to: 1.02;
+            --pulse-brightness-to: 1.1;
+            animation: pulse 1.2s ease-in-out infinite alternate;
+            box-shadow: {shadow_glow};
+            transform: translateZ(0) scale(1.02) scaleY(var(--h, 1));
         }}
         
         .bar.swapping {{
-            background: linear-gradient(to top, {colors['swapping']}, #E57373);
+            background: linear-gradient(to top, {color_swapping}, #E57373);
             animation: smoothSwap 0.6s cubic-bezier(0.68, -0.55, 0.265, 1.55);
             box-shadow: 0 0 20px rgba(229, 115, 115, 0.5);
-            transform: translateZ(0);
+            transform: translateZ(0) scaleY(var(--h, 1));
         }}
         
         .bar.sorted {{
-            background: linear-gradient(to top, {colors['sorted']}, #81C784);
+            background: linear-gradient(to top, {color_sorted}, #81C784);
             animation: sortedSuccess 1s ease-out forwards;
-            transform: translateZ(0);
+            transform: translateZ(0) scaleY(var(--h, 1));
         }}
         
         .bar.pivot {{
-            background: linear-gradient(to top, {colors['pivot']}, #BA68C8);
-            animation: pivotHighlight 1s ease-in-out infinite alternate;
+            background: linear-gradient(to top, {color_pivot}, #BA68C8);
+            --pulse-scale-from: 1.05;
+            --pulse-scale-to: 1.08;
+            --pulse-brightness-to: 1.15;
+            animation: pulse 1s ease-in-out infinite alternate;
             box-shadow: 0 0 15px rgba(186, 104, 200, 0.4);
-            transform: translateZ(0) scale(1.05);
+            transform: translateZ(0) scale(1.05) scaleY(var(--h, 1));
         }}
         
         .bar.highlight {{
-            background: linear-gradient(to top, {colors['highlight']}, #FFD54F);
-            animation: smoothHighlight 0.8s ease-in-out infinite alternate;
-            transform: translateZ(0);
+            background: linear-gradient(to top, {color_highlight}, #FFD54F);
+            --pulse-scale-from: 1;
+            --pulse-scale-to: 1.02;
+            --pulse-opacity-from: 0.9;
+            animation: pulse 0.8s ease-in-out infinite alternate;
+            transform: translateZ(0) scaleY(var(--h, 1));
         }}
         
-        /* Enhanced keyframe animations for smooth motion */
-        @keyframes smoothPulse {{
+        /* Enhanced keyframe animations for smooth motion. The comparing,
+           pivot and highlight states share one pulse, parameterized by the
+           --pulse-* properties each state sets */
+        @keyframes pulse {{
             0% {{ 
-                transform: translateZ(0) scale(1);
+                opacity: var(--pulse-opacity-from, 1);
+                transform: translateZ(0) scale(var(--pulse-scale-from, 1)) scaleY(var(--h, 1));
                 filter: brightness(1);
             }}
             100% {{ 
-                transform: translateZ(0) scale(1.02);
-                filter: brightness(1.1);
+                opacity: 1;
+                transform: translateZ(0) scale(var(--pulse-scale-to, 1)) scaleY(var(--h, 1));
+                filter: brightness(var(--pulse-brightness-to, 1));
             }}
         }}
         
         @keyframes smoothSwap {{
             0% {{ 
-                transform: translateZ(0) translateX(0) rotate(0deg);
+                transform: translateZ(0) translateX(0) rotate(0deg) scaleY(var(--h, 1));
             }}
             25% {{ 
-                transform: translateZ(0) translateX(-5px) rotate(-2deg);
+                transform: translateZ(0) translateX(-5px) rotate(-2deg) scaleY(var(--h, 1));
             }}
             50% {{ 
-                transform: translateZ(0) translateX(0) rotate(0deg) scale(1.05);
+                transform: translateZ(0) translateX(0) rotate(0deg) scale(1.05) scaleY(var(--h, 1));
             }}
             75% {{ 
-                transform: translateZ(0) translateX(5px) rotate(2deg);
+                transform: translateZ(0) translateX(5px) rotate(2deg) scaleY(var(--h, 1));
             }}
             100% {{ 
-                transform: translateZ(0) translateX(0) rotate(0deg);
+                transform: translateZ(0) translateX(0) rotate(0deg) scaleY(var(--h, 1));
             }}
         }}
         
         @keyframes sortedSuccess {{
             0% {{ 
-                transform: translateZ(0) scale(1);
-                box-shadow: {shadows['default']};
+                transform: translateZ(0) scale(1) scaleY(var(--h, 1));
+                box-shadow: {shadow_default};
             }}
             50% {{ 
-                transform: translateZ(0) scale(1.08);
+                transform: translateZ(0) scale(1.08) scaleY(var(--h, 1));
                 box-shadow: 0 0 25px rgba(129, 199, 132, 0.8);
             }}
             100% {{ 
-                transform: translateZ(0) scale(1);
+                transform: translateZ(0) scale(1) scaleY(var(--h, 1));
                 box-shadow: 0 0 15px rgba(129, 199, 132, 0.4);
             }}
         }}
         
-        @keyframes pivotHighlight {{
-            0% {{ 
-                transform: translateZ(0) scale(1.05);
-                filter: brightness(1);
-            }}
-            100% {{ 
-                transform: translateZ(0) scale(1.08);
-                filter: brightness(1.15);
-            }}
-        }}
-        
-        @keyframes smoothHighlight {{
-            0% {{ 
-                opacity: 0.9;
-                transform: translateZ(0) scale(1);
-            }}
-            100% {{ 
-                opacity: 1;
-                transform: translateZ(0) scale(1.02);
-            }}
-        }}
-        
-        /* Height transition animations */
-        @keyframes heightChange {{
-            from {{ 
-                height: var(--old-height, 50%);
-                transform: translateZ(0) scaleY(0.95);
-            }}
-            to {{ 
-                height: var(--new-height, 50%);
-                transform: translateZ(0) scaleY(1);
-            }}
-        }}
-        
         /* Performance optimizations */
         .bar.animating {{
             animation-fill-mode: both;
@@ -271,37 +291,338 @@ class AlgorithmAnimator:
             }}
         }}
         """
+
+@lru_cache(maxsize=8)
+def _animation_css(config: AnimationConfig) -> str:
+    """Render _CSS_TEMPLATE for ``config``; configs are frozen, so the result is cached."""
+    colors = config.colors
+    shadows = config.shadows
+    performance = config.performance
+    return _CSS_TEMPLATE.format_map({
+        'color_default': colors.default,
+        'color_comparing': colors.comparing,
+        'color_swapping': colors.swapping,
+        'color_sorted': colors.sorted,
+        'color_pivot': colors.pivot,
+        'color_highlight': colors.highlight,
+        'color_background': colors.background,
+        'color_text': colors.text,
+        'shadow_default': shadows.default,
+        'shadow_active': shadows.active,
+        'shadow_glow': shadows.glow,
+        'duration': config.duration,
+        'easing': config.easing,
+        'transition_delay': config.transition_delay,
+        'will_change': performance.will_change,
+        'backface_visibility': performance.backface_visibility,
+    })
+
+# Styles for the side-by-side compact bars. Each chart renders in its own
+# components.html iframe, so the rules travel with every chart; only the
+# formatting is shared
+_COMPACT_CSS_TEMPLATE = """
+<style>
+.compact-algorithm-container {{
+    padding: 10px;
+    background: linear-gradient(135deg, {background} 0%, #2D2D2D 100%);
+    border-radius: 8px;
+    margin: 5px 0;
+    min-height: 150px;
+}}
+
+.compact-bars-container {{
+    display: flex;
+    align-items: flex-end;
+    justify-content: center;
+    height: 120px;
+    gap: 2px;
+    padding: 10px 0;
+}}
+
+.compact-bar {{
+    background: linear-gradient(to top, {default}, #42A5F5);
+    border-radius: 2px 2px 0 0;
+    min-width: 8px;
+    position: relative;
+    transition: all 0.6s cubic-bezier(0.4, 0.0, 0.2, 1);
+}}
+
+.compact-bar.comparing {{
+    background: linear-gradient(to top, {comparing}, #FFB74D);
+    animation: compactPulse 0.8s ease-in-out infinite alternate;
+}}
+
+.compact-bar.swapping {{
+    background: linear-gradient(to top, {swapping}, #E57373);
+    animation: compactShake 0.4s ease-in-out;
+}}
+
+.compact-bar.sorted {{
+    background: linear-gradient(to top, {sorted}, #81C784);
+}}
+
+.compact-bar.pivot {{
+    background: linear-gradient(to top, {pivot}, #BA68C8);
+    animation: compactGlow 1s ease-in-out infinite alternate;
+}}
+
+@keyframes compactPulse {{
+    0% {{ transform: scale(1); }}
+    100% {{ transform: scale(1.1); }}
+}}
+
+@keyframes compactShake {{
+    0%, 100% {{ transform: translateX(0); }}
+    25% {{ transform: translateX(-2px); }}
+    75% {{ transform: translateX(2px); }}
+}}
+
+@keyframes compactGlow {{
+    0% {{ transform: scale(1); }}
+    100% {{ transform: scale(1.05); }}
+}}
+</style>
+"""
+
+@lru_cache(maxsize=8)
+def _compact_css(colors: AnimationColors) -> str:
+    """Render _COMPACT_CSS_TEMPLATE for ``colors``; the result is cached."""
+    return _COMPACT_CSS_TEMPLATE.format_map(asdict(colors))
+
+# st.fragment (Streamlit >= 1.37) reruns only the wrapped function when one of
+# its widgets changes or its run_every timer fires; older versions fall back
+# to a plain call
+_FRAGMENTS_AVAILABLE = hasattr(st, 'fragment')
+
+def _call_as_fragment(func, run_every: Optional[float], *args):
+    """Call ``func(*args)`` as a fragment, rerun every ``run_every`` seconds if given."""
+    if _FRAGMENTS_AVAILABLE:
+        return st.fragment(func, run_every=run_every)(*args)
+    return func(*args)
+
+def _playback_interval(speed: float, max_fps: int) -> float:
+    """Seconds between steps at ``speed``, capped at ``max_fps`` steps per second."""
+    return max(1.0 / speed, 1.0 / max_fps)
+
+def _progress_html(fraction: float, label: str) -> str:
+    """A progress bar as plain markup.
+
+    Rendered through st.markdown it is a single static element, which is
+    cheaper for Streamlit to diff on every playback rerun than st.progress.
+    """
+    return (f'<div style="background: #333; height: 8px; border-radius: 4px;">'
+            f'<div style="width: {fraction * 100:.1f}%; background: #4CAF50; height: 100%; '
+            f'border-radius: 4px;"></div></div><small>{label}</small>')
+
+def _on_step_slider_change():
+    """Show the step picked on the slider and pause playback."""
+    state = st.session_state.animation_state
+    state['current_step'] = st.session_state.step_slider
+    state['is_playing'] = False
+
+# step_info keys in the order their classes appear on a bar
+_BAR_CLASS_KEYS = (
+    ('comparison_indices', 'comparing'),
+    ('swap_indices', 'swapping'),
+    ('pivot_index', 'pivot'),
+    ('highlight_indices', 'highlight'),
+    ('sorted_indices', 'sorted'),
+)
+
+# During playback every this many steps the animation container gets the full
+# array rather than a diff, so a missed update cannot leave it stale for long
+_FULL_UPDATE_INTERVAL = 32
+
+# Bar charts longer than this are rendered without memoization
+_RENDER_CACHE_MAX_BARS = 500
+
+def _freeze_indices(value: Any) -> Any:
+    """Hashable form of a step_info index entry for the render cache key."""
+    if value is None or isinstance(value, (int, range, frozenset)):
+        return value
+    return frozenset(value)
+
+def _bar_class_key(step_info: Dict[str, Any]) -> tuple:
+    """Frozen bar-class entries of ``step_info``, in _BAR_CLASS_KEYS order."""
+    if not step_info:
+        return ()
+    return tuple(_freeze_indices(step_info.get(key)) for key, _ in _BAR_CLASS_KEYS)
+
+def _render_animated_bars(data: Sequence[Number], step_info: Dict[str, Any]) -> str:
+    """Build the markup returned by AlgorithmAnimator.create_animated_bars."""
+    return "".join([
+        '<div class="algorithm-container"><div class="bars-container">',
+        *AlgorithmAnimator._render_bars(data, step_info),
+        '</div></div>'
+    ])
+
+@lru_cache(maxsize=64)
+def _cached_animated_bars(data: Tuple[Number, ...], class_key: tuple) -> str:
+    """Memoized _render_animated_bars keyed on the data and the frozen bar-class entries."""
+    step_info = {key: value for (key, _), value in zip(_BAR_CLASS_KEYS, class_key)}
+    return _render_animated_bars(data, step_info)
+
+def _render_compact_bars(data: Sequence[Number], step_info: Dict[str, Any], algorithm_name: str,
+                         colors: AnimationColors) -> str:
+    """Build the markup returned by StreamlitAnimationManager._create_compact_bars."""
+    # Heights are percentages of the largest value
+    if np is not None and isinstance(data, np.ndarray):
+        # As in AlgorithmAnimator._render_bars, only array input is scaled
+        # with NumPy; converting a list first costs more than it saves
+        heights = (data * (100.0 / (data.max() if len(data) else 1))).tolist()
+        data = data.tolist()
+    else:
+        scale = 100.0 / (max(data) if data else 1)
+        heights = [value * scale for value in data]
+    html = (f'<div class="compact-algorithm-container" data-algorithm="{algorithm_name}">'
+            f'{_compact_css(colors)}<div class="compact-bars-container">')
+    classes = AlgorithmAnimator._build_class_table(len(data), step_info)
+    # A tenth of a percent is well under a pixel on a 120px chart
+    bars = [f'<div class="compact-bar {css_class}" '
+            f'style="height: {height:.1f}%;" title="{value}"></div>'
+            for css_class, value, height in zip(classes, data, heights)]
+    return "".join([html, *bars, '</div></div>'])
+
+@lru_cache(maxsize=256)
+def _cached_compact_bars(data: Tuple[Number, ...], class_key: tuple, algorithm_name: str,
+                         colors: AnimationColors) -> str:
+    """Memoized _render_compact_bars; one entry per algorithm and distinct frame."""
+    step_info = {key: value for (key, _), value in zip(_BAR_CLASS_KEYS, class_key)}
+    return _render_compact_bars(data, step_info, algorithm_name, colors)
+
+def _step_lists(visualizers: Dict[str, Any]) -> Dict[str, List]:
+    """Fetch every visualizer's steps once, keyed like ``visualizers``."""
+    return {
+        name: visualizer.get_steps() if hasattr(visualizer, 'get_steps') else []
+        for name, visualizer in visualizers.items()
+    }
+
+def _comparison_frames(steps: Sequence) -> Dict[str, list]:
+    """JSON-ready form of ``steps`` for the client-side comparison player.
+
+    Steps that did not change the array share one snapshot list (see
+    AlgorithmVisualizer.add_step), so each snapshot is sent once and frames
+    refer to it by position as ``[array, comparing, swapping, pivot, highlight]``.
+    """
+    arrays = []
+    frames = []
+    last_state = None
+    for step in steps:
+        if step.array_state is not last_state:
+            last_state = step.array_state
+            arrays.append(last_state)
+        frames.append([len(arrays) - 1, list(step.comparison_indices), list(step.swapped_indices),
+                       step.pivot_index, list(step.highlighted_indices)])
+    return {'arrays': arrays, 'frames': frames}
+
+
+class AlgorithmAnimator:
+    """Modern animation system for algorithm visualization."""
+    
+    def __init__(self, config: Optional['AnimationConfig'] = None):
+        self.config = config if config is not None else AnimationConfig()
+        # Streamlit drops elements a rerun does not re-emit, so the page-level
+        # stylesheet is tracked per animator (one per script run), not per session
+        self._css_injected = False
+        # Number of animation containers created, used for their DOM ids
+        self._container_seq = 0
+    
+    @property
+    def animation_config(self) -> Dict[str, Any]:
+        """The config as the nested dict used by earlier versions; changes to it have no effect."""
+        return asdict(self.config)
+    
+    def inject_animation_css(self):
+        """Emit the animation stylesheet into the page with st.markdown.
+
+        Only the first call per animator writes anything, so several charts
+        rendered in one script run share a single <style> block. The markup
+        from create_animated_bars and create_algorithm_info_panel relies on it.
+        """
+        if self._css_injected:
+            return
+        st.markdown(f"<style>{self._generate_animation_css()}</style>", unsafe_allow_html=True)
+        self._css_injected = True
+    
+    def create_animated_bars(self, data: List[int], step_info: Dict[str, Any]) -> str:
+        """Create animated bar chart HTML; call inject_animation_css() before rendering it.
+
+        Charts of up to _RENDER_CACHE_MAX_BARS bars are memoized on the data
+        and the bar classes, so revisiting a step returns the earlier markup.
+        """
+        if len(data) > _RENDER_CACHE_MAX_BARS:
+            return _render_animated_bars(data, _with_index_sets(step_info))
+        return _cached_animated_bars(tuple(data), _bar_class_key(step_info))
+    
+    def _generate_animation_css(self) -> str:
+        """Generate CSS for smooth animations; built once per distinct config."""
+        return _animation_css(self.config)
+    
+    @staticmethod
+    def _render_bars(data: Sequence[Number], step_info: Dict[str, Any]) -> List[str]:
+        """Render one bar element per value, to be joined into the container."""
+        classes = AlgorithmAnimator._build_class_table(len(data), step_info)
+        # Bar heights are fractions of the largest value
+        if np is not None and isinstance(data, np.ndarray):
+            # Scale in one vectorized pass and unbox the values once rather
+            # than formatting a NumPy scalar per bar
+            heights = (data * (1.0 / (data.max() if len(data) else 1))).tolist()
+            data = data.tolist()
+        else:
+            scale = 1.0 / (max(data) if data else 1)
+            heights = [value * scale for value in data]
+        return [f'<div class="bar {classes[i]}" '
+                f'style="--h: {heights[i]:.4f}; --value: {value}; --index: {i};" '
+                f'data-index="{i}" data-value="{value}"><div class="bar-value">{value}</div></div>'
+                for i, value in enumerate(data)]
+    
+    @staticmethod
+    def _build_class_table(n: int, step_info: Dict[str, Any]) -> List[str]:
+        """Return the CSS classes of all ``n`` bars, indexed by position.
+
+        Equivalent to calling _get_bar_class for every index, but walks the
+        (short) index collections in step_info once instead of testing each
+        bar against every one. Expects step_info normalized by
+        _with_index_sets, so no index repeats within a collection.
+        """
+        table = [''] * n
+        if not step_info:
+            return table
+        for key, css_class in _BAR_CLASS_KEYS:
+            indices = step_info.get(key)
+            if indices is None:
+                continue
+            if key == 'pivot_index':
+                indices = (indices,)
+            for index in indices:
+                if 0 <= index < n:
+                    table[index] = f"{table[index]} {css_class}" if table[index] else css_class
+        return table
     
     def _get_bar_class(self, index: int, step_info: Dict[str, Any]) -> str:
-        """Determine the CSS class for a bar based on step information."""
+        """Determine the CSS class for a bar based on step information.
+
+        Callers classifying a whole chart should use _build_class_table, or
+        at least normalize step_info with _with_index_sets first, so each
+        membership test is O(1).
+        """
         if not step_info:
             return ""
-        
         classes = []
-        
-        # Check if this index is involved in current operation
-        if 'comparison_indices' in step_info and index in step_info['comparison_indices']:
-            classes.append('comparing')
-        
-        if 'swap_indices' in step_info and index in step_info['swap_indices']:
-            classes.append('swapping')
-        
-        if 'pivot_index' in step_info and index == step_info['pivot_index']:
-            classes.append('pivot')
-        
-        if 'highlight_indices' in step_info and index in step_info['highlight_indices']:
-            classes.append('highlight')
-        
-        if 'sorted_indices' in step_info and index in step_info['sorted_indices']:
-            classes.append('sorted')
-        
+        for key, css_class in _BAR_CLASS_KEYS:
+            indices = step_info.get(key)
+            if indices is None:
+                continue
+            if index == indices if key == 'pivot_index' else index in indices:
+                classes.append(css_class)
         return ' '.join(classes)
     
     def create_enhanced_step_controls(self, total_steps: int = 0) -> Dict[str, Any]:
         """Create enhanced interactive controls for smooth animation playback."""
         st.subheader("🎬 Enhanced Animation Controls")
         
-        # Initialize animation state
+        # Initialize animation state; the dict is bound once, since every
+        # st.session_state access goes through Streamlit's proxy
         if 'animation_state' not in st.session_state:
             st.session_state.animation_state = {
                 'is_playing': False,
@@ -312,48 +633,43 @@ class AlgorithmAnimator:
                 'smooth_transitions': True,
                 'last_update_time': time.time()
             }
+        state = st.session_state.animation_state
         
         # Update total_steps if provided
         if total_steps > 0:
-            st.session_state.animation_state['total_steps'] = total_steps
+            state['total_steps'] = total_steps
         
         # Ensure current_step is within bounds
-        max_step = max(0, st.session_state.animation_state.get('total_steps', 1) - 1)
-        current_step = st.session_state.animation_state.get('current_step', 0)
+        max_step = max(0, state.get('total_steps', 1) - 1)
+        current_step = state.get('current_step', 0)
         if current_step > max_step:
-            st.session_state.animation_state['current_step'] = max_step
+            state['current_step'] = max_step
             current_step = max_step
         
         # Create control layout
         control_col1, control_col2, control_col3 = st.columns([2, 2, 3])
         
-        # Track button clicks to prevent double updates
-        button_clicked = False
-        
         with control_col1:
             st.markdown("**Playback Controls**")
             col1a, col1b, col1c = st.columns(3)
             
             with col1a:
                 if st.button("⏮️", key="anim_first", help="First step"):
-                    st.session_state.animation_state['current_step'] = 0
-                    st.session_state.animation_state['is_playing'] = False
-                    button_clicked = True
+                    state['current_step'] = 0
+                    state['is_playing'] = False
             
             with col1b:
-                play_icon = "⏸️" if st.session_state.animation_state['is_playing'] else "▶️"
-                play_text = "Pause" if st.session_state.animation_state['is_playing'] else "Play"
+                play_icon = "⏸️" if state['is_playing'] else "▶️"
+                play_text = "Pause" if state['is_playing'] else "Play"
                 if st.button(f"{play_icon}", key="anim_play_pause", help=play_text):
-                    st.session_state.animation_state['is_playing'] = not st.session_state.animation_state['is_playing']
-                    st.session_state.animation_state['last_update_time'] = time.time()
-                    button_clicked = True
+                    state['is_playing'] = not state['is_playing']
+                    state['last_update_time'] = time.time()
             
             with col1c:
                 if st.button("⏭️", key="anim_step", help="Next step"):
                     if current_step < total_steps - 1:
-                        st.session_state.animation_state['current_step'] = current_step + 1
-                    st.session_state.animation_state['is_playing'] = False
-                    button_clicked = True
+                        state['current_step'] = current_step + 1
+                    state['is_playing'] = False
         
         with control_col2:
             st.markdown("**Settings**")
@@ -374,10 +690,10 @@ class AlgorithmAnimator:
                 index=2,  # Default to 1x
                 key="anim_speed_select"
             )
-            st.session_state.animation_state['speed'] = speed_options[selected_speed]
+            state['speed'] = speed_options[selected_speed]
             
             # Smooth transitions toggle
-            st.session_state.animation_state['smooth_transitions'] = st.checkbox(
+            state['smooth_transitions'] = st.checkbox(
                 "Smooth transitions", 
                 value=True, 
                 key="smooth_transitions"
@@ -386,79 +702,107 @@ class AlgorithmAnimator:
         with control_col3:
             st.markdown("**Progress**")
             
-            # Step progress slider - only update if not button clicked
-            if total_steps > 0 and not button_clicked:
-                new_step = st.slider(
+            # Step progress slider. It is synced to steps set by the buttons
+            # or playback; moves by the user arrive via _on_step_slider_change
+            if total_steps > 0:
+                st.session_state['step_slider'] = state['current_step']
+                st.slider(
                     "Step",
                     min_value=0,
                     max_value=total_steps - 1,
-                    value=current_step,
                     key="step_slider",
-                    help="Drag to navigate to specific step"
+                    help="Drag to navigate to specific step",
+                    on_change=_on_step_slider_change
                 )
                 
-                # Only update if slider actually changed (not during rerun)
-                if new_step != current_step:
-                    st.session_state.animation_state['current_step'] = new_step
-                    st.session_state.animation_state['is_playing'] = False
-                
                 # Progress indicator
-                progress = (st.session_state.animation_state['current_step'] + 1) / total_steps
-                st.progress(progress)
-                st.caption(f"Step {st.session_state.animation_state['current_step'] + 1} of {total_steps}")
+                progress = (state['current_step'] + 1) / total_steps
+                st.markdown(_progress_html(progress, f"Step {state['current_step'] + 1} of {total_steps}"),
+                            unsafe_allow_html=True)
             else:
                 st.info("No animation steps available")
-                st.session_state.animation_state['current_step'] = 0
+                state['current_step'] = 0
         
         return {
-            'current_step': st.session_state.animation_state.get('current_step', 0),
-            'is_playing': st.session_state.animation_state.get('is_playing', False),
-            'speed': st.session_state.animation_state.get('speed', 1.0),
-            'smooth_transitions': st.session_state.animation_state.get('smooth_transitions', True),
-            'total_steps': st.session_state.animation_state.get('total_steps', 0)
+            'current_step': state.get('current_step', 0),
+            'is_playing': state.get('is_playing', False),
+            'speed': state.get('speed', 1.0),
+            'smooth_transitions': state.get('smooth_transitions', True),
+            'total_steps': state.get('total_steps', 0)
+        }
+    
+    def new_container_id(self) -> str:
+        """Return a DOM id for a new animation container."""
+        self._container_seq += 1
+        return f"algo-{id(self):x}-{self._container_seq}"
+    
+    @staticmethod
+    def _update_function_name(container_id: str) -> str:
+        """Name of the global JS function that updates ``container_id``."""
+        return "updateBars_" + container_id.replace('-', '_')
+    
+    def create_update_script(self, container_id: str, data: List[int], step_info: Dict[str, Any],
+                             previous_data: Optional[Sequence[Number]] = None,
+                             previous_step_number: Optional[int] = None) -> str:
+        """Create a script that shows a step in an existing animation container.
+
+        The script is meant for its own (zero-height) components.html frame:
+        it looks up the frame holding ``container_id`` in the parent page and
+        passes it the step as JSON, so only the data and the indices travel
+        per step instead of the full container markup.
+
+        When the container was last sent the step numbered
+        ``previous_step_number``, whose array was ``previous_data``, only the
+        values that differ from it are sent. The container ignores such a
+        diff if it is not showing that step, and keeps its values until the
+        next full update.
+        """
+        payload = {
+            key: list(value) if key.endswith('_indices') and value is not None else value
+            for key, value in step_info.items()
         }
+        args = [list(data), payload, None, None]
+        if previous_data is not None and len(previous_data) == len(data):
+            # Steps that did not change the array share its snapshot
+            changes = [] if previous_data is data else [
+                [index, value] for index, (value, old) in enumerate(zip(data, previous_data))
+                if value != old
+            ]
+            if 2 * len(changes) < len(data):
+                args = [None, payload, previous_step_number, changes]
+        # "</" would end the script element early
+        payload_json = _dumps(args).replace('</', '<\\/')
+        update_function = self._update_function_name(container_id)
+        return f"""
+        <script>
+        (function () {{
+            const args = {payload_json};
+            let attempts = 0;
+            function deliver() {{
+                for (const frame of window.parent.document.querySelectorAll('iframe')) {{
+                    try {{
+                        const update = frame.contentWindow.{update_function};
+                        if (update) {{
+                            update(args[0], args[1], args[2], args[3]);
+                            return;
+                        }}
+                    }} catch (e) {{}}
+                }}
+                // The container frame may still be loading on the first render
+                if (++attempts < 40) setTimeout(deliver, 50);
+            }}
+            deliver();
+        }})();
+        </script>
+        """
     
     def create_algorithm_info_panel(self, algorithm_name: str, step_info: Dict[str, Any]) -> str:
-        """Create an information panel showing current algorithm step."""
-        colors = self.animation_config['colors']
-        
+        """Create an information panel; call inject_animation_css() before rendering it."""
         current_step = step_info.get('step_number', 0)
         description = step_info.get('description', 'Algorithm initialization')
         
         html = f"""
         <div class="info-panel">
-            <style>
-            .info-panel {{
-                background: linear-gradient(135deg, {colors['background']} 0%, #2D2D2D 100%);
-                border-radius: 12px;
-                padding: 20px;
-                margin: 10px 0;
-                border-left: 4px solid {colors['default']};
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            }}
-            
-            .step-title {{
-                color: {colors['default']};
-                font-size: 18px;
-                font-weight: 600;
-                margin-bottom: 10px;
-            }}
-            
-            .step-description {{
-                color: {colors['text']};
-                font-size: 14px;
-                line-height: 1.5;
-            }}
-            
-            .step-counter {{
-                color: {colors['highlight']};
-                font-size: 12px;
-                font-weight: 500;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }}
-            </style>
-            
             <div class="step-counter">Step {current_step}</div>
             <div class="step-title">{algorithm_name}</div>
             <div class="step-description">{description}</div>
@@ -467,70 +811,118 @@ class AlgorithmAnimator:
         
         return html
     
-    def create_smooth_animation_container(self, data: List[int], step_info: Dict[str, Any], algorithm_name: str) -> str:
-        """Create a smooth animation container that updates without page refresh."""
-        max_value = max(data) if data else 1
+    def create_smooth_animation_container(self, data: List[int], step_info: Dict[str, Any], algorithm_name: str,
+                                          container_id: Optional[str] = None) -> str:
+        """Create a smooth animation container that updates without page refresh.
+
+        The container defines ``window.updateBars_<id>``; later steps can be
+        shown by rendering create_update_script() for the same container_id
+        instead of rebuilding the whole container.
+        """
+        step_info = _with_index_sets(step_info)
         
-        # Generate unique container ID for this animation
-        container_id = f"algorithm-container-{hash(str(data))}"
+        if container_id is None:
+            container_id = self.new_container_id()
+        update_function = self._update_function_name(container_id)
         
-        # Enhanced CSS for smoother animations
+        # components.html renders into its own iframe, which cannot see the
+        # stylesheet injected into the page, so this container embeds it
         css = self._generate_animation_css()
         
-        # JavaScript for smooth updates without page refresh
+        # JavaScript for smooth updates without page refresh. Updates arriving
+        # within one frame, or faster than max_fps, are coalesced, so only the
+        # latest one is drawn, and only the properties that changed are written
         javascript = f"""
         <script>
-        function updateBars_{container_id.replace('-', '_')}(newData, stepInfo) {{
-            const container = document.getElementById('{container_id}');
-            if (!container) return;
-            
-            const bars = container.querySelectorAll('.bar');
-            const stepNumber = stepInfo.step_number || 0;
-            const description = stepInfo.description || '';
+        (function () {{
+            const minFrameGap = 1000 / {self.config.max_fps};
+            let pending = null;
+            let scheduled = false;
+            let lastFrame = -Infinity;
+            // Step and values of the latest update received, which diffs build on
+            let knownStep = {step_info.get('step_number', 1)};
+            let knownValues = null;
             
-            // Update step info
-            const stepCounter = container.querySelector('.step-counter');
-            const stepDesc = container.querySelector('.step-description');
-            if (stepCounter) stepCounter.textContent = `Step ${{stepNumber}}`;
-            if (stepDesc) stepDesc.textContent = description;
-            
-            // Update bars with smooth transitions
-            bars.forEach((bar, index) => {{
-                if (index < newData.length) {{
-                    const value = newData[index];
-                    const heightPercent = (value / Math.max(...newData)) * 100;
-                    
-                    // Remove all existing classes
-                    bar.className = 'bar';
-                    
-                    // Add appropriate classes based on step info
-                    if (stepInfo.comparison_indices && stepInfo.comparison_indices.includes(index)) {{
-                        bar.classList.add('comparing');
+            function applyUpdate(newData, stepInfo) {{
+                const container = document.getElementById('{container_id}');
+                if (!container) return;
+                
+                const bars = container.querySelectorAll('.bar');
+                const stepNumber = stepInfo.step_number || 0;
+                const description = stepInfo.description || '';
+                const maxValue = newData && newData.length ? Math.max(...newData) : 1;
+                const classSets = [
+                    ['comparing', new Set(stepInfo.comparison_indices || [])],
+                    ['swapping', new Set(stepInfo.swap_indices || [])],
+                    ['pivot', new Set(stepInfo.pivot_index == null ? [] : [stepInfo.pivot_index])],
+                    ['highlight', new Set(stepInfo.highlight_indices || [])],
+                    ['sorted', new Set(stepInfo.sorted_indices || [])]
+                ];
+                
+                // Update step info
+                const stepCounter = container.querySelector('.step-counter');
+                const stepDesc = container.querySelector('.step-description');
+                if (stepCounter) stepCounter.textContent = `Step ${{stepNumber}}`;
+                if (stepDesc) stepDesc.textContent = description;
+                
+                // Update bars with smooth transitions
+                bars.forEach((bar, index) => {{
+                    let className = 'bar';
+                    for (const [name, indices] of classSets) {{
+                        if (indices.has(index)) className += ' ' + name;
                     }}
-                    if (stepInfo.swap_indices && stepInfo.swap_indices.includes(index)) {{
-                        bar.classList.add('swapping');
+                    if (bar.className !== className) bar.className = className;
+                    
+                    if (!newData || index >= newData.length) return;
+                    const value = newData[index];
+                    if (bar.dataset.value !== String(value)) {{
+                        bar.dataset.value = value;
+                        bar.style.setProperty('--h', (value / maxValue).toFixed(4));
+                        bar.querySelector('.bar-value').textContent = value;
                     }}
-                    if (stepInfo.pivot_index === index) {{
-                        bar.classList.add('pivot');
+                }});
+            }}
+            
+            function flush(now) {{
+                if (now - lastFrame < minFrameGap) {{
+                    requestAnimationFrame(flush);
+                    return;
+                }}
+                lastFrame = now;
+                scheduled = false;
+                const next = pending;
+                pending = null;
+                applyUpdate(next[0], next[1]);
+            }}
+            
+            // Make the update function globally available. A diff (newData
+            // null) is resolved right away against the latest values
+            // received, so coalescing updates never drops one a diff needs
+            window.{update_function} = function (newData, stepInfo, baseStep, changes) {{
+                if (newData === null) {{
+                    if (knownValues === null && knownStep === baseStep) {{
+                        const container = document.getElementById('{container_id}');
+                        knownValues = Array.from(container.querySelectorAll('.bar'),
+                                                 bar => Number(bar.dataset.value));
                     }}
-                    if (stepInfo.highlight_indices && stepInfo.highlight_indices.includes(index)) {{
-                        bar.classList.add('highlight');
+                    if (knownStep === baseStep && knownValues !== null) {{
+                        newData = knownValues.slice();
+                        for (const [index, value] of changes) newData[index] = value;
                     }}
-                    
-                    // Smooth height transition
-                    bar.style.height = heightPercent + '%';
-                    bar.querySelector('.bar-value').textContent = value;
                 }}
-            }});
-        }}
-        
-        // Make function globally available
-        window.updateBars_{container_id.replace('-', '_')} = updateBars_{container_id.replace('-', '_')};
+                knownValues = newData;
+                knownStep = newData === null ? null : stepInfo.step_number;
+                pending = [newData, stepInfo];
+                if (scheduled) return;
+                scheduled = true;
+                requestAnimationFrame(flush);
+            }};
+        }})();
         </script>
         """
         
         # Generate HTML with smooth transition support
-        html = f"""
+        header = f"""
         <div class="algorithm-container" id="{container_id}">
             <style>{css}</style>
             {javascript}
@@ -543,237 +935,8 @@ class AlgorithmAnimator:
                 <div class="bars-container">
         """
         
-        for i, value in enumerate(data):
-            height_percent = (value / max_value) * 100
-            bar_class = self._get_bar_class(i, step_info)
-            
-            html += f"""
-                <div class="bar {bar_class}" 
-                     style="height: {height_percent}%; --value: {value}; --index: {i};"
-                     data-index="{i}"
-                     data-value="{value}">
-                    <div class="bar-value">{value}</div>
-                </div>
-            """
-        
-        html += """
-                </div>
-            </div>
-        </div>
-        """
-        
-        return html
-        """Create a combined block with step info and animated bars for smoother rendering."""
-        colors = self.animation_config['colors']
-        shadows = self.animation_config['shadows']
-        duration = self.animation_config['duration']
-        easing = self.animation_config['easing']
-        
-        current_step = step_info.get('step_number', 0)
-        description = step_info.get('description', 'Algorithm initialization')
-        max_value = max(data) if data else 1
-        
-        html = f"""
-        <div class="combined-animation-container">
-            <style>
-            .combined-animation-container {{
-                background: linear-gradient(135deg, {colors['background']} 0%, #2D2D2D 100%);
-                border-radius: 16px;
-                padding: 24px;
-                box-shadow: {shadows['default']};
-                font-family: 'SF Pro Display', -apple-system, BlinkMacSystemFont, sans-serif;
-                overflow: hidden;
-                position: relative;
-            }}
-            
-            .step-info-section {{
-                margin-bottom: 20px;
-                padding: 16px;
-                background: rgba(255, 255, 255, 0.05);
-                border-radius: 12px;
-                border-left: 4px solid {colors['default']};
-            }}
-            
-            .step-counter {{
-                color: {colors['highlight']};
-                font-size: 14px;
-                font-weight: 600;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-                margin-bottom: 8px;
-            }}
-            
-            .step-title {{
-                color: {colors['default']};
-                font-size: 20px;
-                font-weight: 700;
-                margin-bottom: 8px;
-            }}
-            
-            .step-description {{
-                color: {colors['text']};
-                font-size: 16px;
-                line-height: 1.5;
-                opacity: 0.9;
-            }}
-            
-            .animation-section {{
-                position: relative;
-                background: rgba(0, 0, 0, 0.2);
-                border-radius: 12px;
-                padding: 20px;
-            }}
-            
-            .bars-container {{
-                display: flex;
-                align-items: flex-end;
-                justify-content: center;
-                height: 300px;
-                gap: 4px;
-                padding: 20px 0;
-                position: relative;
-            }}
-            
-            .bar {{
-                background: linear-gradient(to top, {colors['default']}, #42A5F5);
-                border-radius: 4px 4px 0 0;
-                min-width: 30px;
-                position: relative;
-                transition: all {duration}s {easing};
-                cursor: pointer;
-                box-shadow: {shadows['default']};
-                will-change: transform, background, box-shadow;
-            }}
-            
-            .bar:hover {{
-                transform: translateY(-2px);
-                box-shadow: {shadows['active']};
-            }}
-            
-            .bar-value {{
-                position: absolute;
-                top: -25px;
-                left: 50%;
-                transform: translateX(-50%);
-                color: {colors['text']};
-                font-weight: 600;
-                font-size: 12px;
-                opacity: 0;
-                transition: opacity 0.3s ease;
-            }}
-            
-            .bar:hover .bar-value {{
-                opacity: 1;
-            }}
-            
-            /* Enhanced animation states for smoothness */
-            .bar.comparing {{
-                background: linear-gradient(to top, {colors['comparing']}, #FFB74D);
-                animation: smoothPulse 1.2s ease-in-out infinite alternate;
-                box-shadow: {shadows['glow']};
-                transform: scale(1.02);
-            }}
-            
-            .bar.swapping {{
-                background: linear-gradient(to top, {colors['swapping']}, #E57373);
-                animation: smoothShake 0.6s ease-in-out;
-                box-shadow: 0 0 20px rgba(229, 115, 115, 0.5);
-            }}
-            
-            .bar.sorted {{
-                background: linear-gradient(to top, {colors['sorted']}, #81C784);
-                animation: smoothSortedGlow 2s ease-in-out;
-                transform: scale(1.01);
-            }}
-            
-            .bar.pivot {{
-                background: linear-gradient(to top, {colors['pivot']}, #BA68C8);
-                animation: smoothPivotGlow 1.8s ease-in-out infinite alternate;
-                box-shadow: 0 0 15px rgba(186, 104, 200, 0.4);
-            }}
-            
-            .bar.highlight {{
-                background: linear-gradient(to top, {colors['highlight']}, #FFD54F);
-                animation: smoothHighlightPulse 1s ease-in-out infinite alternate;
-                transform: scale(1.03);
-            }}
-            
-            /* Smoother keyframe animations */
-            @keyframes smoothPulse {{
-                0% {{ transform: scale(1.02); }}
-                100% {{ transform: scale(1.06); }}
-            }}
-            
-            @keyframes smoothShake {{
-                0%, 100% {{ transform: translateX(0) scale(1); }}
-                25% {{ transform: translateX(-2px) scale(1.02); }}
-                75% {{ transform: translateX(2px) scale(1.02); }}
-            }}
-            
-            @keyframes smoothSortedGlow {{
-                0% {{ box-shadow: {shadows['default']}; transform: scale(1.01); }}
-                50% {{ box-shadow: 0 0 20px rgba(129, 199, 132, 0.6); transform: scale(1.03); }}
-                100% {{ box-shadow: {shadows['default']}; transform: scale(1.01); }}
-            }}
-            
-            @keyframes smoothPivotGlow {{
-                0% {{ transform: scale(1); }}
-                100% {{ transform: scale(1.05); }}
-            }}
-            
-            @keyframes smoothHighlightPulse {{
-                0% {{ opacity: 0.8; transform: scale(1.03); }}
-                100% {{ opacity: 1; transform: scale(1.05); }}
-            }}
-            
-            /* Responsive design */
-            @media (max-width: 768px) {{
-                .bar {{
-                    min-width: 20px;
-                }}
-                
-                .bars-container {{
-                    height: 200px;
-                    gap: 2px;
-                }}
-                
-                .step-info-section {{
-                    padding: 12px;
-                }}
-            }}
-            </style>
-            
-            <!-- Step Information Section -->
-            <div class="step-info-section">
-                <div class="step-counter">Step {current_step}</div>
-                <div class="step-title">{algorithm_name}</div>
-                <div class="step-description">{description}</div>
-            </div>
-            
-            <!-- Animation Section -->
-            <div class="animation-section">
-                <div class="bars-container">
-        """
-        
-        for i, value in enumerate(data):
-            height_percent = (value / max_value) * 100
-            bar_class = self._get_bar_class(i, step_info)
-            
-            html += f"""
-                    <div class="bar {bar_class}" 
-                         style="height: {height_percent}%; --value: {value};"
-                         data-index="{i}">
-                        <div class="bar-value">{value}</div>
-                    </div>
-            """
-        
-        html += """
-                </div>
-            </div>
-        </div>
-        """
-        
-        return html
+        return "".join([header, *self._render_bars(data, step_info),
+                        '</div></div></div>'])
 
 class StreamlitAnimationManager:
     """Manages animations within Streamlit interface."""
@@ -798,6 +961,31 @@ class StreamlitAnimationManager:
         if not steps:
             st.warning("No steps recorded. Run the algorithm first.")
             return
+        # While playing, the fragment's timer advances the animation; Streamlit
+        # waits between steps instead of the script sleeping
+        state = st.session_state.get('animation_state', {})
+        run_every = self._playback_interval(state.get('speed', 1.0)) if state.get('is_playing') else None
+        _call_as_fragment(self._animation_fragment, run_every, steps, algorithm_name, run_every)
+    
+    def _playback_interval(self, speed: float) -> float:
+        """Seconds between steps at ``speed``, capped at the animator's max_fps."""
+        return _playback_interval(speed, self.animator.config.max_fps)
+    
+    def _animation_fragment(self, steps: List, algorithm_name: str, run_every: Optional[float]):
+        """Render the controls and the current step as one fragment.
+
+        The controls and the bars they drive share the fragment, so clicking
+        a control reruns only this part of the page instead of the script.
+        ``run_every`` is the timer interval the fragment was created with.
+        """
+        # On a timer tick during playback, move on to the next step. Reruns
+        # caused by the controls come in between ticks and leave the step as is
+        state = st.session_state.get('animation_state')
+        if state and state.get('is_playing') and run_every is not None:
+            now = time.time()
+            if now - state.get('last_update_time', 0.0) >= run_every / 2:
+                state['current_step'] = min(state.get('current_step', 0) + 1, len(steps) - 1)
+                state['last_update_time'] = now
         
         # Animation controls with total steps
         controls = self.animator.create_enhanced_step_controls(total_steps=len(steps))
@@ -816,42 +1004,79 @@ class StreamlitAnimationManager:
             'highlight_indices': getattr(current_step, 'highlighted_indices', []),
         }
         
-        # Create animation container with smooth transitions
-        animation_container = st.container()
-        with animation_container:
+        # Create animation container with smooth transitions. The container
+        # markup is built once and re-sent unchanged, so Streamlit keeps its
+        # frame; each step then only ships a small update script.
+        scaffold_key = (algorithm_name, len(steps), len(current_step.array_state))
+        scaffold = st.session_state.get('_animation_scaffold')
+        if scaffold is None or scaffold[0] != scaffold_key:
+            container_id = self.animator.new_container_id()
             combined_html = self.animator.create_smooth_animation_container(
                 current_step.array_state, 
                 step_info, 
-                algorithm_name
+                algorithm_name,
+                container_id=container_id
             )
-            components.html(combined_html, height=520)
+            scaffold = (scaffold_key, container_id, combined_html)
+            st.session_state['_animation_scaffold'] = scaffold
+        
+        # Recorded steps never change, so each step's update script is built
+        # the first time it is shown and reused on replays, pauses and reruns
+        # caused by widgets elsewhere. Moving on to the next step only sends
+        # the values it changed, except every _FULL_UPDATE_INTERVAL steps
+        frames = st.session_state.get('_animation_frames')
+        if frames is None or frames[0] != scaffold[1] or frames[1] is not steps:
+            frames = (scaffold[1], steps, {}, {}, [None])
+            st.session_state['_animation_frames'] = frames
+        full_scripts, diff_scripts, last_shown = frames[2], frames[3], frames[4]
+        send_diff = (last_shown[0] == current_step_idx - 1
+                     and current_step_idx % _FULL_UPDATE_INTERVAL)
+        scripts = diff_scripts if send_diff else full_scripts
+        update_script = scripts.get(current_step_idx)
+        if update_script is None:
+            if send_diff:
+                previous_step = steps[current_step_idx - 1]
+                update_script = self.animator.create_update_script(
+                    scaffold[1], current_step.array_state, step_info,
+                    previous_step.array_state, previous_step.step_number)
+            else:
+                update_script = self.animator.create_update_script(
+                    scaffold[1], current_step.array_state, step_info)
+            scripts[current_step_idx] = update_script
+        last_shown[0] = current_step_idx
+        
+        animation_container = st.container()
+        with animation_container:
+            components.html(scaffold[2], height=520)
+            components.html(update_script, height=0)
         
         # Step progress indicator
-        progress = min((current_step_idx + 1) / len(steps), 1.0)
-        st.progress(progress, text=f"Step {current_step_idx + 1} of {len(steps)}")
+        step_count = len(steps)
+        progress = min((current_step_idx + 1) / step_count, 1.0)
+        st.markdown(_progress_html(progress, f"Step {current_step_idx + 1} of {step_count}"),
+                    unsafe_allow_html=True)
         
-        # Handle auto-advance for playing state with better timing
-        if controls['is_playing'] and current_step_idx < len(steps) - 1:
-            # Use a placeholder to show countdown without blocking
-            countdown_placeholder = st.empty()
-            delay_seconds = 1.0 / controls['speed']
-            
-            # Show countdown
-            for i in range(int(delay_seconds * 10), 0, -1):
-                with countdown_placeholder.container():
-                    st.info(f"⏩ Next step in {i/10:.1f}s (Speed: {controls['speed']}x)")
-                time.sleep(0.1)
-            
-            countdown_placeholder.empty()
-            
-            # Advance to next step
-            st.session_state.animation_state['current_step'] = current_step_idx + 1
-            st.rerun()
+        # Handle auto-advance for playing state
+        state = st.session_state.animation_state
+        is_playing = controls['is_playing']
+        if is_playing and current_step_idx < step_count - 1:
+            delay_seconds = self._playback_interval(controls['speed'])
+            if not _FRAGMENTS_AVAILABLE:
+                time.sleep(delay_seconds)
+                st.rerun()
+            elif run_every != delay_seconds:
+                # The timer is set when the fragment is created, which takes
+                # a full script run
+                st.rerun()
             
-        elif controls['is_playing'] and current_step_idx >= len(steps) - 1:
+        elif is_playing:
             # End of animation
-            st.session_state.animation_state['is_playing'] = False
+            state['is_playing'] = False
             st.success("🎉 Animation completed!")
+        
+        elif run_every is not None:
+            # Playback stopped; a full run recreates the fragment without a timer
+            st.rerun()
 
     def _handle_auto_advance(self, current_step_idx: int, steps: List):
         """Handle auto-advance logic with smooth timing control."""
@@ -893,18 +1118,31 @@ class StreamlitAnimationManager:
         # Store steps for reference
         state['steps'] = steps
 
-    def create_side_by_side_animation(self, visualizers: Dict[str, Any], current_steps: Dict[str, int]):
-        """Create side-by-side comparison animation for multiple algorithms."""
+    def create_side_by_side_animation(self, visualizers: Dict[str, Any], current_steps: Dict[str, int],
+                                      step_lists: Optional[Dict[str, List]] = None):
+        """Create side-by-side comparison animation for multiple algorithms.
+
+        Callers that already hold the step lists can pass them as
+        ``step_lists``, keyed like ``visualizers``. The charts are drawn as
+        one fragment, so widgets inside it rerun only the comparison.
+        """
         st.subheader("🎭 Algorithm Comparison Animation")
         
+        if step_lists is None:
+            step_lists = _step_lists(visualizers)
+        _call_as_fragment(self._side_by_side_fragment, None, visualizers, current_steps, step_lists)
+    
+    def _side_by_side_fragment(self, visualizers: Dict[str, Any], current_steps: Dict[str, int],
+                               step_lists: Dict[str, List]):
+        """Draw one column per algorithm for create_side_by_side_animation."""
         # Create columns for each algorithm
-        cols = st.columns(len(visualizers))
+        cols = st.columns(len(visualizers), gap="small")
         
-        for i, (algorithm_name, visualizer) in enumerate(visualizers.items()):
+        for i, algorithm_name in enumerate(visualizers):
             with cols[i]:
                 st.write(f"**{algorithm_name}**")
                 
-                steps = visualizer.get_steps()
+                steps = step_lists[algorithm_name]
                 if not steps:
                     st.warning(f"No steps for {algorithm_name}")
                     continue
@@ -928,97 +1166,214 @@ class StreamlitAnimationManager:
                 
                 # Progress indicator
                 progress = min(current_step_idx / len(steps), 1.0)
-                st.progress(progress, text=f"{current_step_idx + 1}/{len(steps)}")
+                st.markdown(_progress_html(progress, f"{current_step_idx + 1}/{len(steps)}"),
+                            unsafe_allow_html=True)
     
     def _create_compact_bars(self, data: List[int], step_info: Dict[str, Any], algorithm_name: str) -> str:
-        """Create compact bar chart for side-by-side comparison."""
-        max_value = max(data) if data else 1
-        colors = self.animator.animation_config['colors']
-        
-        html = f"""
+        """Create compact bar chart for side-by-side comparison.
+
+        Like create_animated_bars, charts of up to _RENDER_CACHE_MAX_BARS bars
+        are memoized, so paused or replayed frames are not rebuilt.
+        """
+        config = self.animator.config
+        if len(data) >= config.canvas_threshold:
+            return self._create_canvas_bars(data, step_info, algorithm_name)
+        colors = config.colors
+        if len(data) > _RENDER_CACHE_MAX_BARS:
+            return _render_compact_bars(data, _with_index_sets(step_info), algorithm_name, colors)
+        # Unbox array input once, so the cache key holds plain numbers
+        values = data.tolist() if np is not None and isinstance(data, np.ndarray) else data
+        return _cached_compact_bars(tuple(values), _bar_class_key(step_info), algorithm_name, colors)
+    
+    def _create_canvas_bars(self, data: Sequence[Number], step_info: Dict[str, Any], algorithm_name: str) -> str:
+        """Draw a compact bar chart on one canvas instead of one element per bar.
+
+        Used by _create_compact_bars for long arrays, where laying out and
+        styling hundreds of bar elements costs more than painting them.
+        Colors follow the compact-bar CSS, where a pivot wins over sorted,
+        swapping and comparing.
+        """
+        colors = self.animator.config.colors
+        # Paint order matches the precedence of the compact-bar rules
+        marks = []
+        for key, color in (('comparison_indices', colors.comparing), ('swap_indices', colors.swapping),
+                           ('sorted_indices', colors.sorted), ('pivot_index', colors.pivot)):
+            indices = step_info.get(key)
+            if indices is None:
+                continue
+            marks.append([color, [indices] if key == 'pivot_index' else list(indices)])
+        if np is not None and isinstance(data, np.ndarray):
+            data = data.tolist()
+        args_json = _dumps([list(data), marks]).replace('</', '<\\/')
+        return f"""
         <div class="compact-algorithm-container" data-algorithm="{algorithm_name}">
+            {_compact_css(colors)}
+            <canvas style="display: block; width: 100%; height: 120px; margin: 10px 0;"></canvas>
+            <script>
+            (function () {{
+                const [values, marks] = {args_json};
+                const canvas = document.currentScript.previousElementSibling;
+                const ratio = window.devicePixelRatio || 1;
+                const width = canvas.clientWidth;
+                const height = canvas.clientHeight;
+                canvas.width = Math.round(width * ratio);
+                canvas.height = Math.round(height * ratio);
+                const ctx = canvas.getContext('2d');
+                ctx.scale(ratio, ratio);
+                
+                const fills = new Array(values.length).fill('{colors.default}');
+                for (const [color, indices] of marks) {{
+                    for (const index of indices) {{
+                        if (index >= 0 && index < values.length) fills[index] = color;
+                    }}
+                }}
+                let maxValue = 0;
+                for (const value of values) if (value > maxValue) maxValue = value;
+                const scale = height / (maxValue || 1);
+                const barWidth = width / (values.length || 1);
+                const gap = barWidth > 3 ? 1 : 0;
+                for (let i = 0; i < values.length; i++) {{
+                    const barHeight = values[i] * scale;
+                    ctx.fillStyle = fills[i];
+                    ctx.fillRect(i * barWidth, height - barHeight, barWidth - gap, barHeight);
+                }}
+            }})();
+            </script>
+        </div>
+        """
+    
+    def create_comparison_player(self, step_lists: Dict[str, List], start_step: int = 0,
+                                 playing: bool = False, speed: float = 1.0) -> str:
+        """Create a component that plays several algorithms' steps side by side.
+
+        All frames are sent once and the component advances them itself with
+        requestAnimationFrame, one step every ``1 / speed`` seconds (but no
+        faster than the animator's max_fps), so
+        playback costs no reruns. It starts at ``start_step`` (each algorithm
+        stops at its last step) and has its own play/pause toggle.
+        """
+        # The serialized frames and the container id are kept until the step
+        # lists are replaced, so reruns send identical markup and Streamlit
+        # keeps the running player instead of remounting it
+        cached = st.session_state.get('_comparison_payload')
+        lists = tuple(step_lists.values())
+        if cached is not None and len(cached[0]) == len(lists) and all(
+                a is b for a, b in zip(cached[0], lists)):
+            payload_json, container_id = cached[1], cached[2]
+        else:
+            payload = [dict(name=name, **_comparison_frames(steps)) for name, steps in step_lists.items()]
+            # "</" would end the script element early
+            payload_json = _dumps(payload).replace('</', '<\\/')
+            container_id = self.animator.new_container_id()
+            st.session_state['_comparison_payload'] = (lists, payload_json, container_id)
+        
+        charts = "".join(
+            f'<div class="compact-algorithm-container" id="{container_id}-{k}" data-algorithm="{name}">'
+            f'<strong>{name}</strong> <span class="compact-step"></span>'
+            f'<div class="compact-bars-container"></div></div>'
+            for k, name in enumerate(step_lists)
+        )
+        return f"""
+        <div id="{container_id}">
+            {_compact_css(self.animator.config.colors)}
             <style>
-            .compact-algorithm-container {{
-                padding: 10px;
-                background: linear-gradient(135deg, {colors['background']} 0%, #2D2D2D 100%);
-                border-radius: 8px;
-                margin: 5px 0;
-                min-height: 150px;
-            }}
-            
-            .compact-bars-container {{
-                display: flex;
-                align-items: flex-end;
-                justify-content: center;
-                height: 120px;
-                gap: 2px;
-                padding: 10px 0;
-            }}
-            
-            .compact-bar {{
-                background: linear-gradient(to top, {colors['default']}, #42A5F5);
-                border-radius: 2px 2px 0 0;
-                min-width: 8px;
-                position: relative;
-                transition: all 0.6s cubic-bezier(0.4, 0.0, 0.2, 1);
-            }}
-            
-            .compact-bar.comparing {{
-                background: linear-gradient(to top, {colors['comparing']}, #FFB74D);
-                animation: compactPulse 0.8s ease-in-out infinite alternate;
-            }}
-            
-            .compact-bar.swapping {{
-                background: linear-gradient(to top, {colors['swapping']}, #E57373);
-                animation: compactShake 0.4s ease-in-out;
-            }}
-            
-            .compact-bar.sorted {{
-                background: linear-gradient(to top, {colors['sorted']}, #81C784);
-            }}
+            #{container_id} {{ font-family: sans-serif; color: {self.animator.config.colors.text}; }}
+            #{container_id} .compact-charts {{ display: flex; gap: 8px; }}
+            #{container_id} .compact-algorithm-container {{ flex: 1; min-width: 0; }}
+            </style>
+            <button class="compact-toggle"></button>
+            <div class="compact-charts">{charts}</div>
+        </div>
+        <script>
+        (function () {{
+            const algorithms = {payload_json};
+            const interval = 1000 / {min(speed, self.animator.config.max_fps)};
+            const root = document.getElementById('{container_id}');
+            const toggle = root.querySelector('.compact-toggle');
+            const lastStep = Math.max(0, ...algorithms.map(a => a.frames.length - 1));
+            let step = Math.min({int(start_step)}, lastStep);
+            let playing = {'true' if playing else 'false'};
+            let lastTick = 0;
             
-            .compact-bar.pivot {{
-                background: linear-gradient(to top, {colors['pivot']}, #BA68C8);
-                animation: compactGlow 1s ease-in-out infinite alternate;
-            }}
+            const charts = algorithms.map((algorithm, k) => {{
+                const chart = document.getElementById('{container_id}-' + k);
+                const container = chart.querySelector('.compact-bars-container');
+                const size = algorithm.arrays.length ? algorithm.arrays[0].length : 0;
+                for (let i = 0; i < size; i++) {{
+                    const bar = document.createElement('div');
+                    bar.className = 'compact-bar';
+                    container.appendChild(bar);
+                }}
+                return {{algorithm, bars: container.children, counter: chart.querySelector('.compact-step'), maxima: []}};
+            }});
             
-            @keyframes compactPulse {{
-                0% {{ transform: scale(1); }}
-                100% {{ transform: scale(1.1); }}
+            function draw() {{
+                for (const chart of charts) {{
+                    const frames = chart.algorithm.frames;
+                    if (!frames.length) continue;
+                    const index = Math.min(step, frames.length - 1);
+                    const [arrayIndex, comparing, swapping, pivot, highlight] = frames[index];
+                    const values = chart.algorithm.arrays[arrayIndex];
+                    if (chart.maxima[arrayIndex] === undefined) {{
+                        chart.maxima[arrayIndex] = values.length ? Math.max(...values) : 1;
+                    }}
+                    const scale = 100 / chart.maxima[arrayIndex];
+                    const classSets = [
+                        ['comparing', new Set(comparing)],
+                        ['swapping', new Set(swapping)],
+                        ['pivot', new Set(pivot == null ? [] : [pivot])],
+                        ['highlight', new Set(highlight)]
+                    ];
+                    for (let i = 0; i < chart.bars.length; i++) {{
+                        const bar = chart.bars[i];
+                        let className = 'compact-bar';
+                        for (const [name, indices] of classSets) {{
+                            if (indices.has(i)) className += ' ' + name;
+                        }}
+                        if (bar.className !== className) bar.className = className;
+                        if (bar.title !== String(values[i])) {{
+                            bar.title = values[i];
+                            bar.style.height = (values[i] * scale).toFixed(1) + '%';
+                        }}
+                    }}
+                    chart.counter.textContent = `${{index + 1}}/${{frames.length}}`;
+                }}
+                toggle.textContent = playing ? '⏸️ Pause' : '▶️ Play';
             }}
             
-            @keyframes compactShake {{
-                0%, 100% {{ transform: translateX(0); }}
-                25% {{ transform: translateX(-2px); }}
-                75% {{ transform: translateX(2px); }}
+            function tick(now) {{
+                if (!playing) return;
+                if (now - lastTick >= interval) {{
+                    lastTick = now;
+                    if (step >= lastStep) {{
+                        playing = false;
+                    }} else {{
+                        step += 1;
+                    }}
+                    draw();
+                }}
+                requestAnimationFrame(tick);
             }}
             
-            @keyframes compactGlow {{
-                0% {{ transform: scale(1); }}
-                100% {{ transform: scale(1.05); }}
+            function play() {{
+                lastTick = performance.now();
+                requestAnimationFrame(tick);
             }}
-            </style>
             
-            <div class="compact-bars-container">
-        """
-        
-        for i, value in enumerate(data):
-            height_percent = (value / max_value) * 100
-            bar_class = self.animator._get_bar_class(i, step_info)
+            toggle.addEventListener('click', () => {{
+                playing = !playing;
+                if (playing) {{
+                    if (step >= lastStep) step = 0;
+                    play();
+                }}
+                draw();
+            }});
             
-            html += f"""
-                <div class="compact-bar {bar_class}" 
-                     style="height: {height_percent}%;"
-                     title="{value}">
-                </div>
-            """
-        
-        html += """
-            </div>
-        </div>
+            draw();
+            if (playing) play();
+        }})();
+        </script>
         """
-        
-        return html
 
 def create_modern_visualization(visualizer, algorithm_name: str):
     """Create a modern, animated visualization of the algorithm."""
@@ -1026,50 +1381,26 @@ def create_modern_visualization(visualizer, algorithm_name: str):
     manager.animate_algorithm_steps(visualizer, algorithm_name)
 
 def create_comparison_animation(visualizers: Dict[str, Any]):
-    """Create animated comparison of multiple algorithms."""
+    """Create animated comparison of multiple algorithms.
+
+    Playback runs in the browser (see create_comparison_player); the
+    controls choose the starting step, the speed and whether to autoplay.
+    """
     manager = StreamlitAnimationManager()
     
-    # Initialize step counters for each algorithm
-    if 'comparison_steps' not in st.session_state:
-        st.session_state.comparison_steps = {name: 0 for name in visualizers.keys()}
-    
-    # Get maximum steps from all visualizers
-    max_steps = 0
-    for visualizer in visualizers.values():
-        steps = visualizer.get_steps() if hasattr(visualizer, 'get_steps') else []
-        max_steps = max(max_steps, len(steps))
+    step_lists = _step_lists(visualizers)
+    max_steps = max((len(steps) for steps in step_lists.values()), default=0)
     
     # Create controls with maximum steps
     controls = manager.animator.create_enhanced_step_controls(total_steps=max_steps)
     
-    # Update steps based on controls
-    if controls['play_pause']:
-        st.session_state.comparison_playing = not st.session_state.get('comparison_playing', False)
-    
-    if controls['step_forward']:
-        for name in st.session_state.comparison_steps:
-            steps = visualizers[name].get_steps()
-            if st.session_state.comparison_steps[name] < len(steps) - 1:
-                st.session_state.comparison_steps[name] += 1
+    st.subheader("🎭 Algorithm Comparison Animation")
+    if not max_steps:
+        st.warning("No steps recorded. Run the algorithms first.")
+        return
     
-    if controls['reset']:
-        st.session_state.comparison_steps = {name: 0 for name in visualizers.keys()}
-        st.session_state.comparison_playing = False
-    
-    # Create side-by-side animation
-    manager.create_side_by_side_animation(visualizers, st.session_state.comparison_steps)
-    
-    # Auto-advance if playing
-    if st.session_state.get('comparison_playing', False):
-        time.sleep(1.0 / controls['speed'])
-        any_can_advance = False
-        for name in st.session_state.comparison_steps:
-            steps = visualizers[name].get_steps()
-            if st.session_state.comparison_steps[name] < len(steps) - 1:
-                st.session_state.comparison_steps[name] += 1
-                any_can_advance = True
-        
-        if any_can_advance:
-            st.rerun()
-        else:
-            st.session_state.comparison_playing = False
\ No newline at end of file
+    components.html(
+        manager.create_comparison_player(step_lists, controls['current_step'],
+                                         controls['is_playing'], controls['speed']),
+        height=240
+    )
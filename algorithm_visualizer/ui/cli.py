@@ -1,34 +1,50 @@
 """Command line interface for algorithm visualization."""
 
+import re
 import sys
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Type
 from ..core.base import Number, AlgorithmVisualizer  
 from ..core.comparator import AlgorithmComparator
 from ..utils.data_io import load_data_from_file, generate_random_data
 
+# Algorithm name -> visualizer class, filled in on first use
+_VISUALIZER_REGISTRY: Optional[Dict[str, Type[AlgorithmVisualizer]]] = None
+
+def _lazy_registry() -> Dict[str, Type[AlgorithmVisualizer]]:
+    """Return the algorithms the CLI offers, importing them on first call."""
+    global _VISUALIZER_REGISTRY
+    if _VISUALIZER_REGISTRY is None:
+        # Import here to avoid circular imports
+        from ..algorithms import (
+            MergeSortVisualizer, QuickSortVisualizer, 
+            SelectionSortVisualizer, PriorityQueueSortVisualizer
+        )
+        
+        _VISUALIZER_REGISTRY = {
+            'merge_sort': MergeSortVisualizer,
+            'quick_sort': QuickSortVisualizer,
+            'selection_sort': SelectionSortVisualizer,
+            'priority_queue_sort': PriorityQueueSortVisualizer
+        }
+    return _VISUALIZER_REGISTRY
+
+def _visualizer_class(name: str) -> Type[AlgorithmVisualizer]:
+    """Return the visualizer class for the given algorithm name."""
+    visualizer_class = _lazy_registry().get(name.lower())
+    if visualizer_class is None:
+        raise ValueError(f"Unknown algorithm: {name}")
+    return visualizer_class
+
 def create_algorithm_visualizer(name: str, data: List[Number]) -> AlgorithmVisualizer:
     """Create a visualizer instance for the given algorithm name."""
-    # Import here to avoid circular imports
-    from ..algorithms import (
-        MergeSortVisualizer, QuickSortVisualizer, 
-        SelectionSortVisualizer, PriorityQueueSortVisualizer
-    )
-    
-    visualizers = {
-        'merge_sort': MergeSortVisualizer,
-        'quick_sort': QuickSortVisualizer,
-        'selection_sort': SelectionSortVisualizer,
-        'priority_queue_sort': PriorityQueueSortVisualizer
-    }
-    
-    if name.lower() not in visualizers:
-        raise ValueError(f"Unknown algorithm: {name}")
-    
-    return visualizers[name.lower()](data=data)
+    return _visualizer_class(name)(data=data)
 
 def get_available_algorithms() -> List[str]:
     """Get list of available algorithm names."""
-    return ['merge_sort', 'quick_sort', 'selection_sort', 'priority_queue_sort']
+    return list(_lazy_registry())
+
+# Answer to the random data prompt: a size, optionally followed by min and max
+_RANDOM_SPEC = re.compile(r'(\d+)(?:\s*,\s*(-?\d+))?(?:\s*,\s*(-?\d+))?')
 
 
 class CLIInterface:
@@ -45,22 +61,31 @@ class CLIInterface:
         Args:
             algorithm_name: Name of the algorithm to run
             data: Data to sort
-            show_steps: Whether to show step-by-step visualization
+            show_steps: Whether to show step-by-step visualization.
+                Without it no step trace is recorded, so the sorts can run
+                their compiled kernels.
         """
         try:
-            visualizer = create_algorithm_visualizer(algorithm_name, data)
+            if show_steps:
+                visualizer = create_algorithm_visualizer(algorithm_name, data)
+            else:
+                from ..algorithms._kernels import warm_up_sample
+                visualizer_class = _visualizer_class(algorithm_name)
+                # Warm the kernel up on a small input of the same kind, so a
+                # first-call compilation is not reported as execution time
+                visualizer_class(data=warm_up_sample(data), record_steps=False).sort()
+                visualizer = visualizer_class(data=data, record_steps=False)
             print(f"\n=== Running {algorithm_name} ===")
             print(f"Input data: {data}")
             
-            # Run the algorithm
-            visualizer.sort()
+            # Run the algorithm; sort() returns the sorted data
+            sorted_data = visualizer.sort()
             
             if show_steps:
                 # Show step-by-step visualization
                 visualizer.print_steps()
             
             # Show results
-            sorted_data = visualizer.current_data if hasattr(visualizer, 'current_data') else visualizer.sort()
             print(f"\nSorted data: {sorted_data}")
             
             # Show performance metrics
@@ -96,7 +121,7 @@ class CLIInterface:
         # Run each algorithm
         for algorithm_name in algorithms:
             try:
-                visualizer_class = create_algorithm_visualizer(algorithm_name, data.copy()).__class__
+                visualizer_class = _visualizer_class(algorithm_name)
                 self.comparator.add_algorithm(visualizer_class, algorithm_name)
                 print(f"✓ {algorithm_name} completed")
             except Exception as e:
@@ -201,10 +226,7 @@ class CLIInterface:
     def _handle_generate_data(self) -> None:
         """Handle generating random data."""
         try:
-            size = int(input("Enter data size: ").strip())
-            min_val = int(input("Enter minimum value (default 1): ").strip() or "1")
-            max_val = int(input("Enter maximum value (default 100): ").strip() or "100")
-            
+            size, min_val, max_val = self._prompt_random_spec()
             data = generate_random_data(size, min_val, max_val)
             print(f"Generated data: {data}")
             
@@ -218,6 +240,22 @@ class CLIInterface:
         for i, algorithm in enumerate(algorithms, 1):
             print(f"{i}. {algorithm}")
     
+    def _prompt_random_spec(self) -> Tuple[int, int, int]:
+        """Ask for the size and value range of random data in one prompt.
+
+        Raises:
+            ValueError: If the answer is not ``size[,min[,max]]`` or min is above max
+        """
+        answer = input("Enter size[,min,max] (default range 1,100): ").strip()
+        match = _RANDOM_SPEC.fullmatch(answer)
+        if match is None:
+            raise ValueError(f"expected size[,min,max], got {answer!r}")
+        size, min_val, max_val = match.groups()
+        min_val, max_val = int(min_val or 1), int(max_val or 100)
+        if min_val > max_val:
+            raise ValueError(f"min {min_val} is greater than max {max_val}")
+        return int(size), min_val, max_val
+    
     def _get_data_input(self) -> Optional[List[Number]]:
         """Get data input from user."""
         print("\nData input options:")
@@ -237,9 +275,7 @@ class CLIInterface:
                 return load_data_from_file(filename)
             
             elif choice == "3":
-                size = int(input("Enter data size: ").strip())
-                min_val = int(input("Enter minimum value (default 1): ").strip() or "1")
-                max_val = int(input("Enter maximum value (default 100): ").strip() or "100")
+                size, min_val, max_val = self._prompt_random_spec()
                 return generate_random_data(size, min_val, max_val)
             
             else:
@@ -8,9 +8,517 @@ inspired by algorithm-visualizer.org's approach.
 import streamlit as st
 import streamlit.components.v1 as components
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Pattern, Tuple
+import html
 import inspect
 import re
+from functools import lru_cache
+
+from ..core.base import index_set
+from .animations import (
+    AnimationConfig, _FRAGMENTS_AVAILABLE, _call_as_fragment, _dumps, _playback_interval, _progress_html
+)
+
+
+# Syntax highlighting patterns; the keywords are matched in one alternation
+_COMMENT_RE = re.compile(r'(#.*)')
+_STRING_RE = re.compile(r'(["\'][^"\']*["\'])')
+_KEYWORD_RE = re.compile(r'\b(def|if|else|elif|for|while|return|in|and|or|not|range|len)\b')
+_NUMBER_RE = re.compile(r'\b(\d+)\b')
+
+# Source code shown next to the animation, one entry per line; tuples, since
+# every animator shares them
+_CODE_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    'quick_sort': (
+        "def quick_sort(arr, low, high):",
+        "    if low < high:",
+        "        # Partition the array and get pivot index",
+        "        pivot_index = partition(arr, low, high)",
+        "        ",
+        "        # Recursively sort elements before partition",
+        "        quick_sort(arr, low, pivot_index - 1)",
+        "        ",
+        "        # Recursively sort elements after partition", 
+        "        quick_sort(arr, pivot_index + 1, high)",
+        "",
+        "def partition(arr, low, high):",
+        "    # Choose rightmost element as pivot",
+        "    pivot = arr[high]",
+        "    i = low - 1  # Index of smaller element",
+        "    ",
+        "    for j in range(low, high):",
+        "        # If current element is smaller than or equal to pivot",
+        "        if arr[j] <= pivot:",
+        "            i += 1",
+        "            arr[i], arr[j] = arr[j], arr[i]  # Swap",
+        "    ",
+        "    # Place pivot in correct position",
+        "    arr[i + 1], arr[high] = arr[high], arr[i + 1]",
+        "    return i + 1  # Return partition index"
+    ),
+    'merge_sort': (
+        "def merge_sort(arr):",
+        "    if len(arr) <= 1:",
+        "        return arr",
+        "    ",
+        "    # Divide the array into two halves",
+        "    mid = len(arr) // 2",
+        "    left_half = arr[:mid]",
+        "    right_half = arr[mid:]",
+        "    ",
+        "    # Recursively sort both halves",
+        "    left_sorted = merge_sort(left_half)",
+        "    right_sorted = merge_sort(right_half)",
+        "    ",
+        "    # Merge the sorted halves",
+        "    return merge(left_sorted, right_sorted)",
+        "",
+        "def merge(left, right):",
+        "    result = []",
+        "    i = j = 0",
+        "    ",
+        "    # Compare and merge elements",
+        "    while i < len(left) and j < len(right):",
+        "        if left[i] <= right[j]:",
+        "            result.append(left[i])",
+        "            i += 1",
+        "        else:",
+        "            result.append(right[j])",
+        "            j += 1",
+        "    ",
+        "    # Add remaining elements",
+        "    result.extend(left[i:])",
+        "    result.extend(right[j:])",
+        "    return result"
+    ),
+    'selection_sort': (
+        "def selection_sort(arr):",
+        "    n = len(arr)",
+        "    ",
+        "    # Traverse through all array elements",
+        "    for i in range(n):",
+        "        # Find minimum element in remaining unsorted array",
+        "        min_idx = i",
+        "        ",
+        "        for j in range(i + 1, n):",
+        "            # Update minimum if smaller element found",
+        "            if arr[j] < arr[min_idx]:",
+        "                min_idx = j",
+        "        ",
+        "        # Swap the found minimum element with first element",
+        "        arr[i], arr[min_idx] = arr[min_idx], arr[i]",
+        "    ",
+        "    return arr"
+    ),
+    'priority_queue_sort': (
+        "def priority_queue_sort(arr):",
+        "    import heapq",
+        "    ",
+        "    # Create a min-heap from the array",
+        "    heap = []",
+        "    ",
+        "    # Add all elements to the heap",
+        "    for element in arr:",
+        "        heapq.heappush(heap, element)",
+        "    ",
+        "    # Extract elements from heap in sorted order",
+        "    sorted_arr = []",
+        "    while heap:",
+        "        min_element = heapq.heappop(heap)",
+        "        sorted_arr.append(min_element)",
+        "    ",
+        "    return sorted_arr"
+    ),
+    'binary_search': (
+        "def binary_search(arr, target):",
+        "    # Ensure array is sorted",
+        "    arr = sorted(arr)",
+        "    left, right = 0, len(arr) - 1",
+        "    ",
+        "    while left <= right:",
+        "        mid = (left + right) // 2",
+        "        ",
+        "        # Check if target is found",
+        "        if arr[mid] == target:",
+        "            return mid",
+        "        ",
+        "        # Target is in left half",
+        "        elif arr[mid] > target:",
+        "            right = mid - 1",
+        "        ",
+        "        # Target is in right half",
+        "        else:",
+        "            left = mid + 1",
+        "    ",
+        "    return -1  # Target not found"
+    ),
+    'bubble_sort': (
+        "def bubble_sort(arr):",
+        "    n = len(arr)",
+        "    ",
+        "    # Traverse through all array elements",
+        "    for i in range(n):",
+        "        swapped = False",
+        "        ",
+        "        # Last i elements are already sorted",
+        "        for j in range(0, n - i - 1):",
+        "            ",
+        "            # Compare adjacent elements",
+        "            if arr[j] > arr[j + 1]:",
+        "                # Swap if they are in wrong order",
+        "                arr[j], arr[j + 1] = arr[j + 1], arr[j]",
+        "                swapped = True",
+        "        ",
+        "        # If no swapping occurred, array is sorted",
+        "        if not swapped:",
+        "            break",
+        "    ",
+        "    return arr"
+    ),
+    'breadth_first_search': (
+        "def breadth_first_search(graph, start, target=None):",
+        "    from collections import deque",
+        "    ",
+        "    visited = set()",
+        "    queue = deque([start])",
+        "    path = []",
+        "    ",
+        "    while queue:",
+        "        current = queue.popleft()",
+        "        ",
+        "        if current in visited:",
+        "            continue",
+        "        ",
+        "        visited.add(current)",
+        "        path.append(current)",
+        "        ",
+        "        # Check if target found",
+        "        if target and current == target:",
+        "            return path",
+        "        ",
+        "        # Add unvisited neighbors to queue",
+        "        for neighbor in graph.get(current, []):",
+        "            if neighbor not in visited:",
+        "                queue.append(neighbor)",
+        "    ",
+        "    return path"
+    )
+}
+
+
+def _apply_syntax_highlighting(line: str) -> str:
+    """Apply basic syntax highlighting to a line of code."""
+    # Escape HTML first to prevent issues
+    line = html.escape(line)
+    
+    # Comments (everything after #) - do this first as comments override everything else
+    comment_match = _COMMENT_RE.search(line)
+    if comment_match:
+        processable_part = line[:comment_match.start()]
+        comment_part = f'<span class="comment">{comment_match.group(1)}</span>'
+    else:
+        processable_part = line
+        comment_part = ""
+    
+    # Strings, keywords and numbers, each in a single pass
+    processable_part = _STRING_RE.sub(r'<span class="string">\1</span>', processable_part)
+    processable_part = _KEYWORD_RE.sub(r'<span class="keyword">\1</span>', processable_part)
+    processable_part = _NUMBER_RE.sub(r'<span class="number">\1</span>', processable_part)
+    
+    return processable_part + comment_part
+
+
+# The sources never change, so they are highlighted once, at import time
+_HIGHLIGHTED_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    name: tuple(_apply_syntax_highlighting(line) for line in lines)
+    for name, lines in _CODE_TEMPLATES.items()
+}
+
+
+def _step_rules(*rules: Tuple[str, int]) -> List[Tuple[Pattern[str], int]]:
+    """Compile (regex, line) pairs matched against lowercased step descriptions."""
+    return [(re.compile(pattern, re.DOTALL), line) for pattern, line in rules]
+
+# Source line shown for a step: the first matching rule wins, otherwise the
+# algorithm's default line. "^(?=.*a).*b" matches descriptions containing both
+_STEP_LINE_RULES: Dict[str, List[Tuple[Pattern[str], int]]] = {
+    'quick_sort': _step_rules(
+        (r'starting quick sort', 1),                          # def quick_sort
+        (r'choosing pivot', 13),                              # pivot = arr[high]
+        (r'^(?=.*comparing).*pivot', 17),                     # for j in range
+        (r'already in correct relative position', 18),        # if arr[j] <= pivot
+        (r'placing pivot', 23),                               # Place pivot in correct position
+        (r'partition complete', 24),                          # return i + 1
+        (r'^(?=.*recursively sorting).*(?:left|before)', 6),  # quick_sort(arr, low, pivot_index - 1)
+        (r'recursively sorting', 9),                          # quick_sort(arr, pivot_index + 1, high)
+        (r'swap', 20),                                        # arr[i], arr[j] = arr[j], arr[i]
+    ),
+    'merge_sort': _step_rules(
+        (r'dividing|divide', 5),                              # mid = len(arr) // 2
+        (r'recursively sort', 10),                            # left_sorted = merge_sort(left_half)
+        (r'merging|merge', 14),                               # return merge(left_sorted, right_sorted)
+        (r'comparing', 21),                                   # if left[i] <= right[j]
+        (r'adding|append', 22),                               # result.append(left[i])
+    ),
+    'selection_sort': _step_rules(
+        (r'traverse|starting', 4),                            # for i in range(n)
+        (r'finding minimum|find minimum', 6),                 # min_idx = i
+        (r'comparing|update minimum', 9),                     # for j in range(i + 1, n)
+        (r'smaller element found', 11),                       # if arr[j] < arr[min_idx]
+        (r'swap', 14),                                        # arr[i], arr[min_idx] = arr[min_idx], arr[i]
+    ),
+    'priority_queue_sort': _step_rules(
+        (r'^(?=.*create).*heap', 4),                          # heap = []
+        (r'add|push', 8),                                     # heapq.heappush(heap, element)
+        (r'extract|pop', 13),                                 # min_element = heapq.heappop(heap)
+    ),
+    'binary_search': _step_rules(
+        (r'starting binary search', 1),                       # def binary_search
+        (r'^(?=.*ensure).*sorted', 2),                        # arr = sorted(arr)
+        (r'checking middle element', 6),                      # mid = (left + right) // 2
+        (r'found target', 9),                                 # if arr[mid] == target
+        (r'searching left', 13),                              # elif arr[mid] > target
+        (r'searching right', 17),                             # else left = mid + 1
+    ),
+    'bubble_sort': _step_rules(
+        (r'starting bubble sort', 1),                         # def bubble_sort
+        (r'^(?=.*pass).*bubbling', 4),                        # for i in range(n)
+        (r'comparing elements', 10),                          # if arr[j] > arr[j + 1]
+        (r'^(?=.*swapped).*bubble', 12),                      # arr[j], arr[j + 1] = arr[j + 1], arr[j]
+        (r'no swap needed', 8),                               # for j in range(0, n - i - 1)
+        (r'no swaps in pass', 16),                            # if not swapped
+    ),
+    'breadth_first_search': _step_rules(
+        (r'starting bfs', 1),                                 # def breadth_first_search
+        (r'initialize queue', 5),                             # queue = deque([start])
+        (r'^(?=.*visiting node).*adding to path', 14),        # path.append(current)
+        (r'target.*found', 17),                               # if target and current == target
+        (r'adding neighbors', 21),                            # for neighbor in graph.get(current, [])
+        (r'queue now contains', 8),                           # while queue
+    ),
+}
+
+# Line shown when no rule matches; unknown algorithms use line 1
+_DEFAULT_STEP_LINES: Dict[str, int] = {
+    'quick_sort': 2,            # if low < high (main condition)
+    'merge_sort': 1,            # def merge_sort
+    'selection_sort': 1,        # def selection_sort
+    'priority_queue_sort': 1,   # def priority_queue_sort
+    'binary_search': 5,         # while left <= right
+    'bubble_sort': 2,           # n = len(arr)
+    'breadth_first_search': 4,  # visited = set()
+}
+
+
+# Stylesheet of the code animation block, formatted with CodeBlockAnimator.code_style
+_CSS_TEMPLATE = """\
+.code-animation-container {{
+    font-family: {font_family};
+    background: {background};
+    border-radius: {border_radius};
+    padding: {padding};
+    color: {text};
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 20px;
+    min-height: 500px;
+}}
+
+.code-section {{
+    background: rgba(255, 255, 255, 0.02);
+    border-radius: 6px;
+    padding: 16px;
+    overflow-y: auto;
+    max-height: 450px;
+    scroll-behavior: smooth;
+    position: relative;
+    border: 1px solid rgba(255, 255, 255, 0.1);
+}}
+
+.code-section h3 {{
+    margin: 0 0 12px 0;
+    color: {keyword};
+    font-size: 16px;
+    font-weight: 600;
+}}
+
+.code-line, .active-line {{
+    display: flex;
+    line-height: {line_height};
+    padding: 2px 0;
+    margin: 1px 0;
+    border-radius: 3px;
+    transition: all 0.3s ease;
+}}
+
+.active-line {{
+    background: {active_line};
+    animation: codeHighlight 1s ease-in-out infinite alternate;
+    transform: translateX(4px);
+    box-shadow: 2px 0 4px rgba(243, 156, 18, 0.3);
+}}
+
+.line-number {{
+    color: #858585;
+    margin-right: 12px;
+    user-select: none;
+    font-weight: 500;
+}}
+
+.line-content {{
+    flex: 1;
+}}
+
+.keyword {{ color: {keyword}; font-weight: 600; }}
+.string {{ color: {string}; }}
+.comment {{ color: {comment}; font-style: italic; }}
+.number {{ color: {number}; }}
+
+.visualization-section {{
+    display: flex;
+    flex-direction: column;
+    gap: 16px;
+}}
+
+.step-info {{
+    background: rgba(255, 255, 255, 0.05);
+    padding: 12px;
+    border-radius: 6px;
+    border-left: 3px solid {keyword};
+}}
+
+.step-title {{
+    font-size: 14px;
+    font-weight: 600;
+    margin-bottom: 4px;
+    color: {keyword};
+}}
+
+.step-description {{
+    font-size: 13px;
+    line-height: 1.4;
+    color: {text};
+}}
+
+.bars-container {{
+    display: flex;
+    align-items: flex-end;
+    justify-content: center;
+    height: 280px;
+    gap: 6px;
+    padding: 20px;
+    background: rgba(0, 0, 0, 0.2);
+    border-radius: 6px;
+    position: relative;
+}}
+
+.bar {{
+    background: linear-gradient(to top, #64B5F6, #42A5F5);
+    border-radius: 3px 3px 0 0;
+    min-width: 25px;
+    position: relative;
+    transition: all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+    cursor: pointer;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}}
+
+.bar:hover {{
+    transform: translateY(-3px);
+    box-shadow: 0 4px 8px rgba(100, 181, 246, 0.3);
+}}
+
+.bar.comparing {{
+    background: linear-gradient(to top, #FFB74D, #FF9800);
+    animation: pulse 1s ease-in-out infinite alternate;
+    transform: scale(1.05);
+}}
+
+.bar.swapping {{
+    background: linear-gradient(to top, #E57373, #F44336);
+    animation: shake 0.5s ease-in-out;
+    transform: scale(1.1);
+}}
+
+.bar.highlight {{
+    background: linear-gradient(to top, #FFD54F, #FFC107);
+    animation: glow 1s ease-in-out infinite alternate;
+    transform: scale(1.02);
+}}
+
+.bar-value {{
+    position: absolute;
+    top: -25px;
+    left: 50%;
+    transform: translateX(-50%);
+    font-size: 11px;
+    font-weight: 600;
+    color: {text};
+    opacity: 0;
+    transition: opacity 0.3s ease;
+}}
+
+.bar:hover .bar-value {{
+    opacity: 1;
+}}
+
+@keyframes codeHighlight {{
+    0% {{ background: {active_line}; }}
+    100% {{ background: rgba(243, 156, 18, 0.15); }}
+}}
+
+@keyframes pulse {{
+    0% {{ transform: scale(1.05); }}
+    100% {{ transform: scale(1.08); }}
+}}
+
+@keyframes shake {{
+    0%, 100% {{ transform: translateX(0) scale(1.1); }}
+    25% {{ transform: translateX(-2px) scale(1.1); }}
+    75% {{ transform: translateX(2px) scale(1.1); }}
+}}
+
+@keyframes glow {{
+    0% {{ box-shadow: 0 0 5px rgba(255, 213, 79, 0.3); }}
+    100% {{ box-shadow: 0 0 15px rgba(255, 213, 79, 0.6); }}
+}}
+
+/* Responsive design */
+@media (max-width: 768px) {{
+    .code-animation-container {{
+        grid-template-columns: 1fr;
+        gap: 16px;
+    }}
+    
+    .bars-container {{
+        height: 200px;
+    }}
+    
+    .bar {{
+        min-width: 20px;
+    }}
+}}
+"""
+
+@lru_cache(maxsize=64)
+def _render_code_lines(highlighted_lines: Tuple[str, ...], current_line: int) -> str:
+    """Return the markup of the code lines with ``current_line`` marked active.
+
+    A run only ever activates a handful of lines, so the markup is cached
+    by the (shared) highlighted lines and the active line number. Lines are
+    emitted without indentation between the tags, which otherwise made up
+    most of the markup.
+    """
+    code_parts = []
+    for i, highlighted_line in enumerate(highlighted_lines, 1):
+        is_active = (i == current_line)
+        line_class = "active-line" if is_active else "code-line"
+        
+        code_parts.append(
+            f'<div class="{line_class}" data-line="{i}">'
+            f'<span class="line-number">{i:2d}</span>'
+            f'<span class="line-content">{highlighted_line}</span></div>\n'
+        )
+    return "".join(code_parts)
 
 
 class CodeBlockAnimator:
@@ -31,344 +539,70 @@ class CodeBlockAnimator:
             'padding': '16px',
             'line_height': '1.5'
         }
+        # The style values never change, so the stylesheet is formatted once
+        self._css_block = _CSS_TEMPLATE.format_map(self.code_style)
+        self._container_seq = 0
     
-    def get_algorithm_source_code(self, algorithm_name: str) -> List[str]:
-        """Extract and format source code for the algorithm."""
-        code_templates = {
-            'quick_sort': [
-                "def quick_sort(arr, low, high):",
-                "    if low < high:",
-                "        # Partition the array and get pivot index",
-                "        pivot_index = partition(arr, low, high)",
-                "        ",
-                "        # Recursively sort elements before partition",
-                "        quick_sort(arr, low, pivot_index - 1)",
-                "        ",
-                "        # Recursively sort elements after partition", 
-                "        quick_sort(arr, pivot_index + 1, high)",
-                "",
-                "def partition(arr, low, high):",
-                "    # Choose rightmost element as pivot",
-                "    pivot = arr[high]",
-                "    i = low - 1  # Index of smaller element",
-                "    ",
-                "    for j in range(low, high):",
-                "        # If current element is smaller than or equal to pivot",
-                "        if arr[j] <= pivot:",
-                "            i += 1",
-                "            arr[i], arr[j] = arr[j], arr[i]  # Swap",
-                "    ",
-                "    # Place pivot in correct position",
-                "    arr[i + 1], arr[high] = arr[high], arr[i + 1]",
-                "    return i + 1  # Return partition index"
-            ],
-            'merge_sort': [
-                "def merge_sort(arr):",
-                "    if len(arr) <= 1:",
-                "        return arr",
-                "    ",
-                "    # Divide the array into two halves",
-                "    mid = len(arr) // 2",
-                "    left_half = arr[:mid]",
-                "    right_half = arr[mid:]",
-                "    ",
-                "    # Recursively sort both halves",
-                "    left_sorted = merge_sort(left_half)",
-                "    right_sorted = merge_sort(right_half)",
-                "    ",
-                "    # Merge the sorted halves",
-                "    return merge(left_sorted, right_sorted)",
-                "",
-                "def merge(left, right):",
-                "    result = []",
-                "    i = j = 0",
-                "    ",
-                "    # Compare and merge elements",
-                "    while i < len(left) and j < len(right):",
-                "        if left[i] <= right[j]:",
-                "            result.append(left[i])",
-                "            i += 1",
-                "        else:",
-                "            result.append(right[j])",
-                "            j += 1",
-                "    ",
-                "    # Add remaining elements",
-                "    result.extend(left[i:])",
-                "    result.extend(right[j:])",
-                "    return result"
-            ],
-            'selection_sort': [
-                "def selection_sort(arr):",
-                "    n = len(arr)",
-                "    ",
-                "    # Traverse through all array elements",
-                "    for i in range(n):",
-                "        # Find minimum element in remaining unsorted array",
-                "        min_idx = i",
-                "        ",
-                "        for j in range(i + 1, n):",
-                "            # Update minimum if smaller element found",
-                "            if arr[j] < arr[min_idx]:",
-                "                min_idx = j",
-                "        ",
-                "        # Swap the found minimum element with first element",
-                "        arr[i], arr[min_idx] = arr[min_idx], arr[i]",
-                "    ",
-                "    return arr"
-            ],
-            'priority_queue_sort': [
-                "def priority_queue_sort(arr):",
-                "    import heapq",
-                "    ",
-                "    # Create a min-heap from the array",
-                "    heap = []",
-                "    ",
-                "    # Add all elements to the heap",
-                "    for element in arr:",
-                "        heapq.heappush(heap, element)",
-                "    ",
-                "    # Extract elements from heap in sorted order",
-                "    sorted_arr = []",
-                "    while heap:",
-                "        min_element = heapq.heappop(heap)",
-                "        sorted_arr.append(min_element)",
-                "    ",
-                "    return sorted_arr"
-            ],
-            'binary_search': [
-                "def binary_search(arr, target):",
-                "    # Ensure array is sorted",
-                "    arr = sorted(arr)",
-                "    left, right = 0, len(arr) - 1",
-                "    ",
-                "    while left <= right:",
-                "        mid = (left + right) // 2",
-                "        ",
-                "        # Check if target is found",
-                "        if arr[mid] == target:",
-                "            return mid",
-                "        ",
-                "        # Target is in left half",
-                "        elif arr[mid] > target:",
-                "            right = mid - 1",
-                "        ",
-                "        # Target is in right half",
-                "        else:",
-                "            left = mid + 1",
-                "    ",
-                "    return -1  # Target not found"
-            ],
-            'bubble_sort': [
-                "def bubble_sort(arr):",
-                "    n = len(arr)",
-                "    ",
-                "    # Traverse through all array elements",
-                "    for i in range(n):",
-                "        swapped = False",
-                "        ",
-                "        # Last i elements are already sorted",
-                "        for j in range(0, n - i - 1):",
-                "            ",
-                "            # Compare adjacent elements",
-                "            if arr[j] > arr[j + 1]:",
-                "                # Swap if they are in wrong order",
-                "                arr[j], arr[j + 1] = arr[j + 1], arr[j]",
-                "                swapped = True",
-                "        ",
-                "        # If no swapping occurred, array is sorted",
-                "        if not swapped:",
-                "            break",
-                "    ",
-                "    return arr"
-            ],
-            'breadth_first_search': [
-                "def breadth_first_search(graph, start, target=None):",
-                "    from collections import deque",
-                "    ",
-                "    visited = set()",
-                "    queue = deque([start])",
-                "    path = []",
-                "    ",
-                "    while queue:",
-                "        current = queue.popleft()",
-                "        ",
-                "        if current in visited:",
-                "            continue",
-                "        ",
-                "        visited.add(current)",
-                "        path.append(current)",
-                "        ",
-                "        # Check if target found",
-                "        if target and current == target:",
-                "            return path",
-                "        ",
-                "        # Add unvisited neighbors to queue",
-                "        for neighbor in graph.get(current, []):",
-                "            if neighbor not in visited:",
-                "                queue.append(neighbor)",
-                "    ",
-                "    return path"
-            ]
-        }
-        
-        return code_templates.get(algorithm_name, [f"# Code for {algorithm_name} not available yet"])
+    def new_container_id(self) -> str:
+        """Return a DOM id for a new code animation container."""
+        self._container_seq += 1
+        return f"code-{id(self):x}-{self._container_seq}"
+    
+    @staticmethod
+    def _update_function_name(container_id: str) -> str:
+        """Name of the global JS function that updates ``container_id``."""
+        return "updateCode_" + container_id.replace('-', '_')
+    
+    def get_algorithm_source_code(self, algorithm_name: str) -> Tuple[str, ...]:
+        """Return the source code lines shown for the algorithm.
+
+        Known algorithms share one module-level tuple built at import time.
+        """
+        return _CODE_TEMPLATES.get(algorithm_name, (f"# Code for {algorithm_name} not available yet",))
+    
+    def _get_highlighted_lines(self, algorithm_name: str) -> Tuple[str, ...]:
+        """Return the algorithm's source lines with syntax highlighting applied."""
+        lines = _HIGHLIGHTED_TEMPLATES.get(algorithm_name)
+        if lines is None:
+            lines = tuple(_apply_syntax_highlighting(line)
+                          for line in self.get_algorithm_source_code(algorithm_name))
+        return lines
     
     def map_step_to_code_line(self, step_description: str, algorithm_name: str) -> int:
         """Map algorithm step description to corresponding code line number."""
         description_lower = step_description.lower()
-        
-        if algorithm_name == 'quick_sort':
-            # More sophisticated mapping based on actual step descriptions
-            if 'starting quick sort' in description_lower:
-                return 1  # def quick_sort
-            elif 'choosing pivot' in description_lower:
-                return 13  # pivot = arr[high]
-            elif 'comparing' in description_lower and 'pivot' in description_lower:
-                return 17  # for j in range
-            elif 'already in correct relative position' in description_lower:
-                return 18  # if arr[j] <= pivot
-            elif 'placing pivot' in description_lower:
-                return 23  # Place pivot in correct position
-            elif 'partition complete' in description_lower:
-                return 24  # return i + 1
-            elif 'recursively sorting' in description_lower:
-                if 'left' in description_lower or 'before' in description_lower:
-                    return 6   # quick_sort(arr, low, pivot_index - 1)
-                else:
-                    return 9   # quick_sort(arr, pivot_index + 1, high)
-            elif 'swap' in description_lower:
-                return 20  # arr[i], arr[j] = arr[j], arr[i]
-            else:
-                return 2   # if low < high (main condition)
-                
-        elif algorithm_name == 'merge_sort':
-            if 'dividing' in description_lower or 'divide' in description_lower:
-                return 5   # mid = len(arr) // 2
-            elif 'recursively sort' in description_lower:
-                return 10  # left_sorted = merge_sort(left_half)
-            elif 'merging' in description_lower or 'merge' in description_lower:
-                return 14  # return merge(left_sorted, right_sorted)
-            elif 'comparing' in description_lower:
-                return 21  # if left[i] <= right[j]
-            elif 'adding' in description_lower or 'append' in description_lower:
-                return 22  # result.append(left[i])
-            else:
-                return 1   # def merge_sort
-                
-        elif algorithm_name == 'selection_sort':
-            if 'traverse' in description_lower or 'starting' in description_lower:
-                return 4   # for i in range(n)
-            elif 'finding minimum' in description_lower or 'find minimum' in description_lower:
-                return 6   # min_idx = i
-            elif 'comparing' in description_lower or 'update minimum' in description_lower:
-                return 9   # for j in range(i + 1, n)
-            elif 'smaller element found' in description_lower:
-                return 11  # if arr[j] < arr[min_idx]
-            elif 'swap' in description_lower:
-                return 14  # arr[i], arr[min_idx] = arr[min_idx], arr[i]
-            else:
-                return 1   # def selection_sort
-                
-        elif algorithm_name == 'priority_queue_sort':
-            if 'create' in description_lower and 'heap' in description_lower:
-                return 4   # heap = []
-            elif 'add' in description_lower or 'push' in description_lower:
-                return 8   # heapq.heappush(heap, element)
-            elif 'extract' in description_lower or 'pop' in description_lower:
-                return 13  # min_element = heapq.heappop(heap)
-            else:
-                return 1   # def priority_queue_sort
-                
-        elif algorithm_name == 'binary_search':
-            if 'starting binary search' in description_lower:
-                return 1   # def binary_search
-            elif 'ensure' in description_lower and 'sorted' in description_lower:
-                return 2   # arr = sorted(arr)
-            elif 'checking middle element' in description_lower:
-                return 6   # mid = (left + right) // 2
-            elif 'found target' in description_lower:
-                return 9   # if arr[mid] == target
-            elif 'searching left' in description_lower:
-                return 13  # elif arr[mid] > target
-            elif 'searching right' in description_lower:
-                return 17  # else left = mid + 1
-            else:
-                return 5   # while left <= right
-                
-        elif algorithm_name == 'bubble_sort':
-            if 'starting bubble sort' in description_lower:
-                return 1   # def bubble_sort
-            elif 'pass' in description_lower and 'bubbling' in description_lower:
-                return 4   # for i in range(n)
-            elif 'comparing elements' in description_lower:
-                return 10  # if arr[j] > arr[j + 1]
-            elif 'swapped' in description_lower and 'bubble' in description_lower:
-                return 12  # arr[j], arr[j + 1] = arr[j + 1], arr[j]
-            elif 'no swap needed' in description_lower:
-                return 8   # for j in range(0, n - i - 1)
-            elif 'no swaps in pass' in description_lower:
-                return 16  # if not swapped
-            else:
-                return 2   # n = len(arr)
-                
-        elif algorithm_name == 'breadth_first_search':
-            if 'starting bfs' in description_lower:
-                return 1   # def breadth_first_search
-            elif 'initialize queue' in description_lower:
-                return 5   # queue = deque([start])
-            elif 'visiting node' in description_lower and 'adding to path' in description_lower:
-                return 14  # path.append(current)
-            elif 'target.*found' in description_lower:
-                return 17  # if target and current == target
-            elif 'adding neighbors' in description_lower:
-                return 21  # for neighbor in graph.get(current, [])
-            elif 'queue now contains' in description_lower:
-                return 8   # while queue
-            else:
-                return 4   # visited = set()
-        
-        # Default fallback
-        return 1
+        for pattern, line in _STEP_LINE_RULES.get(algorithm_name, ()):
+            if pattern.search(description_lower):
+                return line
+        return _DEFAULT_STEP_LINES.get(algorithm_name, 1)
     
     def create_animated_code_visualization(self, 
                                          algorithm_name: str, 
                                          current_step: Dict[str, Any],
-                                         array_data: List[int]) -> str:
-        """Create synchronized code and data visualization."""
-        
-        code_lines = self.get_algorithm_source_code(algorithm_name)
-        current_line = self.map_step_to_code_line(current_step.get('description', ''), algorithm_name)
-        
-        # Ensure current_line is within bounds
-        current_line = max(1, min(current_line, len(code_lines)))
+                                         array_data: List[int],
+                                         container_id: Optional[str] = None) -> str:
+        """Create synchronized code and data visualization.
+
+        With a ``container_id``, the markup also defines
+        ``window.updateCode_<id>``, so later steps can be shown by rendering
+        create_code_update_script() instead of rebuilding the whole block.
+        """
+        current_line = self._current_code_line(algorithm_name, current_step)
         
-        style = self.code_style
         max_value = max(array_data) if array_data else 1
         
         # Generate syntax-highlighted code
-        highlighted_code = ""
-        for i, line in enumerate(code_lines, 1):
-            is_active = (i == current_line)
-            line_class = "active-line" if is_active else "code-line"
-            
-            # Simple syntax highlighting
-            highlighted_line = self._apply_syntax_highlighting(line)
-            
-            highlighted_code += f'''
-                <div class="{line_class}" data-line="{i}">
-                    <span class="line-number">{i:2d}</span>
-                    <span class="line-content">{highlighted_line}</span>
-                </div>
-            '''
+        highlighted_code = _render_code_lines(self._get_highlighted_lines(algorithm_name), current_line)
         
         # Generate animated bars
-        bars_html = ""
-        comparison_indices = current_step.get('comparison_indices', [])
-        swap_indices = current_step.get('swap_indices', [])
-        highlight_indices = current_step.get('highlight_indices', [])
+        bar_parts = []
+        comparison_indices = index_set(current_step.get('comparison_indices', []))
+        swap_indices = index_set(current_step.get('swap_indices', []))
+        highlight_indices = index_set(current_step.get('highlight_indices', []))
+        height_scale = 100 / max_value
         
         for i, value in enumerate(array_data):
-            height_percent = (value / max_value) * 100
+            height_percent = value * height_scale
             
             # Determine bar state
             bar_class = "bar"
@@ -379,204 +613,24 @@ class CodeBlockAnimator:
             elif i in highlight_indices:
                 bar_class += " highlight"
             
-            bars_html += f'''
-                <div class="{bar_class}" 
-                     style="height: {height_percent}%;"
-                     data-value="{value}"
-                     data-index="{i}">
-                    <span class="bar-value">{value}</span>
-                </div>
-            '''
+            # One line per bar, like the code lines, keeps indentation out of the payload
+            bar_parts.append(f'<div class="{bar_class}" style="height: {height_percent:.1f}%;" '
+                             f'data-value="{value}" data-index="{i}">'
+                             f'<span class="bar-value">{value}</span></div>')
+        bars_html = "".join(bar_parts)
+        
+        if container_id is None:
+            container_attrs = ''
+            update_script = ''
+        else:
+            container_attrs = f' id="{container_id}"'
+            update_script = self._update_function_script(container_id)
         
         # Create complete HTML with CSS
         html = f'''
-        <div class="code-animation-container">
+        <div class="code-animation-container"{container_attrs}>
             <style>
-            .code-animation-container {{
-                font-family: {style['font_family']};
-                background: {style['background']};
-                border-radius: {style['border_radius']};
-                padding: {style['padding']};
-                color: {style['text']};
-                display: grid;
-                grid-template-columns: 1fr 1fr;
-                gap: 20px;
-                min-height: 500px;
-            }}
-            
-            .code-section {{
-                background: rgba(255, 255, 255, 0.02);
-                border-radius: 6px;
-                padding: 16px;
-                overflow-y: auto;
-                max-height: 450px;
-                scroll-behavior: smooth;
-                position: relative;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-            }}
-            
-            .code-section h3 {{
-                margin: 0 0 12px 0;
-                color: {style['keyword']};
-                font-size: 16px;
-                font-weight: 600;
-            }}
-            
-            .code-line, .active-line {{
-                display: flex;
-                line-height: {style['line_height']};
-                padding: 2px 0;
-                margin: 1px 0;
-                border-radius: 3px;
-                transition: all 0.3s ease;
-            }}
-            
-            .active-line {{
-                background: {style['active_line']};
-                animation: codeHighlight 1s ease-in-out infinite alternate;
-                transform: translateX(4px);
-                box-shadow: 2px 0 4px rgba(243, 156, 18, 0.3);
-            }}
-            
-            .line-number {{
-                color: #858585;
-                margin-right: 12px;
-                user-select: none;
-                font-weight: 500;
-            }}
-            
-            .line-content {{
-                flex: 1;
-            }}
-            
-            .keyword {{ color: {style['keyword']}; font-weight: 600; }}
-            .string {{ color: {style['string']}; }}
-            .comment {{ color: {style['comment']}; font-style: italic; }}
-            .number {{ color: {style['number']}; }}
-            
-            .visualization-section {{
-                display: flex;
-                flex-direction: column;
-                gap: 16px;
-            }}
-            
-            .step-info {{
-                background: rgba(255, 255, 255, 0.05);
-                padding: 12px;
-                border-radius: 6px;
-                border-left: 3px solid {style['keyword']};
-            }}
-            
-            .step-title {{
-                font-size: 14px;
-                font-weight: 600;
-                margin-bottom: 4px;
-                color: {style['keyword']};
-            }}
-            
-            .step-description {{
-                font-size: 13px;
-                line-height: 1.4;
-                color: {style['text']};
-            }}
-            
-            .bars-container {{
-                display: flex;
-                align-items: flex-end;
-                justify-content: center;
-                height: 280px;
-                gap: 6px;
-                padding: 20px;
-                background: rgba(0, 0, 0, 0.2);
-                border-radius: 6px;
-                position: relative;
-            }}
-            
-            .bar {{
-                background: linear-gradient(to top, #64B5F6, #42A5F5);
-                border-radius: 3px 3px 0 0;
-                min-width: 25px;
-                position: relative;
-                transition: all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94);
-                cursor: pointer;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            
-            .bar:hover {{
-                transform: translateY(-3px);
-                box-shadow: 0 4px 8px rgba(100, 181, 246, 0.3);
-            }}
-            
-            .bar.comparing {{
-                background: linear-gradient(to top, #FFB74D, #FF9800);
-                animation: pulse 1s ease-in-out infinite alternate;
-                transform: scale(1.05);
-            }}
-            
-            .bar.swapping {{
-                background: linear-gradient(to top, #E57373, #F44336);
-                animation: shake 0.5s ease-in-out;
-                transform: scale(1.1);
-            }}
-            
-            .bar.highlight {{
-                background: linear-gradient(to top, #FFD54F, #FFC107);
-                animation: glow 1s ease-in-out infinite alternate;
-                transform: scale(1.02);
-            }}
-            
-            .bar-value {{
-                position: absolute;
-                top: -25px;
-                left: 50%;
-                transform: translateX(-50%);
-                font-size: 11px;
-                font-weight: 600;
-                color: {style['text']};
-                opacity: 0;
-                transition: opacity 0.3s ease;
-            }}
-            
-            .bar:hover .bar-value {{
-                opacity: 1;
-            }}
-            
-            @keyframes codeHighlight {{
-                0% {{ background: {style['active_line']}; }}
-                100% {{ background: rgba(243, 156, 18, 0.15); }}
-            }}
-            
-            @keyframes pulse {{
-                0% {{ transform: scale(1.05); }}
-                100% {{ transform: scale(1.08); }}
-            }}
-            
-            @keyframes shake {{
-                0%, 100% {{ transform: translateX(0) scale(1.1); }}
-                25% {{ transform: translateX(-2px) scale(1.1); }}
-                75% {{ transform: translateX(2px) scale(1.1); }}
-            }}
-            
-            @keyframes glow {{
-                0% {{ box-shadow: 0 0 5px rgba(255, 213, 79, 0.3); }}
-                100% {{ box-shadow: 0 0 15px rgba(255, 213, 79, 0.6); }}
-            }}
-            
-            /* Responsive design */
-            @media (max-width: 768px) {{
-                .code-animation-container {{
-                    grid-template-columns: 1fr;
-                    gap: 16px;
-                }}
-                
-                .bars-container {{
-                    height: 200px;
-                }}
-                
-                .bar {{
-                    min-width: 20px;
-                }}
-            }}
+{self._css_block}
             </style>
             
             <div class="code-section">
@@ -624,48 +678,126 @@ class CodeBlockAnimator:
         
         // Auto-scroll with a slight delay to ensure DOM is ready
         setTimeout(scrollToActiveLine, 100);
+        {update_script}
         </script>
         '''
         
         return html
     
-    def _apply_syntax_highlighting(self, line: str) -> str:
-        """Apply basic syntax highlighting to a line of code."""
-        import html
-        
-        # Escape HTML first to prevent issues
-        line = html.escape(line)
-        
-        # Comments (everything after #) - do this first as comments override everything else
-        comment_match = re.search(r'(#.*)', line)
-        if comment_match:
-            comment_part = comment_match.group(1)
-            before_comment = line[:comment_match.start()]
-            highlighted_comment = f'<span class="comment">{comment_part}</span>'
-            line = before_comment + highlighted_comment
-        
-        # Only process the part before the comment for other highlighting
-        if comment_match:
-            processable_part = line[:line.find('<span class="comment">')]
-            comment_part = line[line.find('<span class="comment">'):]
-        else:
-            processable_part = line
-            comment_part = ""
-        
-        # Strings
-        processable_part = re.sub(r'(["\'][^"\']*["\'])', r'<span class="string">\1</span>', processable_part)
-        
-        # Keywords
-        keywords = ['def', 'if', 'else', 'elif', 'for', 'while', 'return', 'in', 'and', 'or', 'not', 'range', 'len']
-        for keyword in keywords:
-            pattern = f'\\b{keyword}\\b'
-            replacement = f'<span class="keyword">{keyword}</span>'
-            processable_part = re.sub(pattern, replacement, processable_part)
-        
-        # Numbers
-        processable_part = re.sub(r'\b(\d+)\b', r'<span class="number">\1</span>', processable_part)
+    def _current_code_line(self, algorithm_name: str, current_step: Dict[str, Any]) -> int:
+        """Return the 1-based source line shown as active for ``current_step``."""
+        code_lines = self.get_algorithm_source_code(algorithm_name)
+        current_line = self.map_step_to_code_line(current_step.get('description', ''), algorithm_name)
         
-        return processable_part + comment_part
+        # Ensure current_line is within bounds
+        return max(1, min(current_line, len(code_lines)))
+    
+    def _update_function_script(self, container_id: str) -> str:
+        """JS defining the function that shows a step in an existing container.
+
+        Only the active line, the step text and the bars change between
+        steps; the code lines and styles stay as first rendered.
+        """
+        update_function = self._update_function_name(container_id)
+        return f'''
+        window.{update_function} = function (state) {{
+            const container = document.getElementById('{container_id}');
+            if (!container) return;
+            
+            container.querySelectorAll('.code-lines > [data-line]').forEach((line) => {{
+                const className = Number(line.dataset.line) === state.line ? 'active-line' : 'code-line';
+                if (line.className !== className) line.className = className;
+            }});
+            container.querySelector('.step-title').textContent = `Step ${{state.step_number}}`;
+            container.querySelector('.step-description').textContent = state.description;
+            
+            const values = state.values;
+            const maxValue = values.length ? Math.max(...values) : 1;
+            const barsContainer = container.querySelector('.bars-container');
+            // Steps normally keep the array length; rebuild the bars if not
+            while (barsContainer.children.length < values.length) {{
+                const bar = document.createElement('div');
+                bar.className = 'bar';
+                bar.innerHTML = '<span class="bar-value"></span>';
+                barsContainer.appendChild(bar);
+            }}
+            while (barsContainer.children.length > values.length) {{
+                barsContainer.lastElementChild.remove();
+            }}
+            
+            const comparing = new Set(state.comparison_indices);
+            const swapping = new Set(state.swap_indices);
+            const highlight = new Set(state.highlight_indices);
+            Array.from(barsContainer.children).forEach((bar, index) => {{
+                let className = 'bar';
+                if (comparing.has(index)) className += ' comparing';
+                else if (swapping.has(index)) className += ' swapping';
+                else if (highlight.has(index)) className += ' highlight';
+                if (bar.className !== className) bar.className = className;
+                
+                const value = values[index];
+                if (bar.dataset.value !== String(value)) {{
+                    bar.dataset.value = value;
+                    bar.dataset.index = index;
+                    bar.style.height = `${{(value / maxValue) * 100}}%`;
+                    bar.querySelector('.bar-value').textContent = value;
+                }}
+            }});
+            
+            scrollToActiveLine();
+        }};
+        '''
+    
+    def create_code_update_script(self, container_id: str, algorithm_name: str,
+                                  current_step: Dict[str, Any], array_data: List[int]) -> str:
+        """Create a script that shows a step in an existing code animation container.
+
+        The script is meant for its own (zero-height) components.html frame:
+        it finds the frame holding ``container_id`` in the parent page and
+        passes it the step as JSON, so a step only ships the active line,
+        the step text, the values and the marked indices.
+        """
+        state = {
+            'line': self._current_code_line(algorithm_name, current_step),
+            'step_number': current_step.get('step_number', 1),
+            'description': current_step.get('description', 'Initializing algorithm...'),
+            'values': list(array_data),
+            'comparison_indices': list(current_step.get('comparison_indices', [])),
+            'swap_indices': list(current_step.get('swap_indices', [])),
+            'highlight_indices': list(current_step.get('highlight_indices', [])),
+        }
+        # "</" would end the script element early
+        state_json = _dumps(state).replace('</', '<\\/')
+        update_function = self._update_function_name(container_id)
+        return f"""
+        <script>
+        (function () {{
+            const state = {state_json};
+            let attempts = 0;
+            function deliver() {{
+                for (const frame of window.parent.document.querySelectorAll('iframe')) {{
+                    try {{
+                        const update = frame.contentWindow.{update_function};
+                        if (update) {{
+                            update(state);
+                            return;
+                        }}
+                    }} catch (e) {{}}
+                }}
+                // The container frame may still be loading on the first render
+                if (++attempts < 40) setTimeout(deliver, 50);
+            }}
+            deliver();
+        }})();
+        </script>
+        """
+
+
+def _on_code_step_slider_change():
+    """Show the step picked on the slider and pause playback."""
+    state = st.session_state.code_animation_state
+    state['current_step'] = st.session_state.code_step_slider
+    state['is_playing'] = False
 
 
 class SynchronizedAnimationManager:
@@ -673,6 +805,8 @@ class SynchronizedAnimationManager:
     
     def __init__(self):
         self.code_animator = CodeBlockAnimator()
+        # Caps the playback rate at max_fps, as in the main animation
+        self.config = AnimationConfig()
     
     def create_code_data_animation(self, visualizer, algorithm_name: str):
         """Create synchronized code and data animation."""
@@ -683,6 +817,30 @@ class SynchronizedAnimationManager:
         
         st.subheader("🎬 Code & Data Animation")
         
+        # While playing, the fragment's timer advances the animation, so each
+        # step reruns only the fragment instead of the whole script
+        state = st.session_state.get('code_animation_state', {})
+        run_every = self._playback_interval(state.get('speed', 1.0)) if state.get('is_playing') else None
+        _call_as_fragment(self._code_animation_fragment, run_every, steps, algorithm_name, run_every)
+    
+    def _playback_interval(self, speed: float) -> float:
+        """Seconds between steps at ``speed``, capped at max_fps."""
+        return _playback_interval(speed, self.config.max_fps)
+    
+    def _code_animation_fragment(self, steps: List, algorithm_name: str, run_every: Optional[float]):
+        """Render the controls and the current step as one fragment.
+
+        ``run_every`` is the timer interval the fragment was created with.
+        """
+        # On a timer tick during playback, move on to the next step. Reruns
+        # caused by the controls come in between ticks and leave the step as is
+        state = st.session_state.get('code_animation_state')
+        if state and state.get('is_playing') and run_every is not None:
+            now = time.time()
+            if now - state.get('last_update_time', 0.0) >= run_every / 2:
+                state['current_step'] = min(state.get('current_step', 0) + 1, len(steps) - 1)
+                state['last_update_time'] = now
+        
         # Enhanced controls for code animation
         controls = self._create_code_animation_controls(len(steps))
         
@@ -691,34 +849,87 @@ class SynchronizedAnimationManager:
         current_step = steps[current_step_idx] if current_step_idx < len(steps) else steps[-1]
         
         # Create step info
-        step_info = {
-            'step_number': current_step.step_number,
-            'description': current_step.description,
-            'comparison_indices': getattr(current_step, 'comparison_indices', []),
-            'swap_indices': getattr(current_step, 'swapped_indices', []),
-            'highlight_indices': getattr(current_step, 'highlighted_indices', []),
-        }
+        step_info = self._step_info(current_step)
         
-        # Create synchronized visualization
-        animation_html = self.code_animator.create_animated_code_visualization(
-            algorithm_name, step_info, current_step.array_state
+        # The container markup is built once and re-sent unchanged, so
+        # Streamlit keeps its frame; each step then only ships a small
+        # update script with the active line and the bars
+        scaffold_key = (algorithm_name, len(steps), len(current_step.array_state))
+        scaffold = st.session_state.get('_code_animation_scaffold')
+        if scaffold is None or scaffold[0] != scaffold_key:
+            container_id = self.code_animator.new_container_id()
+            animation_html = self.code_animator.create_animated_code_visualization(
+                algorithm_name, step_info, current_step.array_state,
+                container_id=container_id
+            )
+            scaffold = (scaffold_key, container_id, animation_html)
+            st.session_state['_code_animation_scaffold'] = scaffold
+        update_script = self.code_animator.create_code_update_script(
+            scaffold[1], algorithm_name, step_info, current_step.array_state
         )
         
-        # Display the animation
-        components.html(animation_html, height=600)
-        
-        # Progress indicator
-        progress = min((current_step_idx + 1) / len(steps), 1.0)
-        st.progress(progress, text=f"Step {current_step_idx + 1} of {len(steps)}")
+        # Display the animation; the update frame and the progress bar sit
+        # in placeholders so playback can replace them in place
+        components.html(scaffold[2], height=600)
+        update_placeholder = st.empty()
+        progress_placeholder = st.empty()
+        self._show_step(update_placeholder, progress_placeholder, update_script,
+                        current_step_idx, len(steps))
         
         # Auto-advance logic
-        if controls['is_playing'] and current_step_idx < len(steps) - 1:
-            time.sleep(1.0 / controls['speed'])
-            st.session_state.code_animation_state['current_step'] = current_step_idx + 1
-            st.rerun()
-        elif controls['is_playing'] and current_step_idx >= len(steps) - 1:
-            st.session_state.code_animation_state['is_playing'] = False
+        state = st.session_state.code_animation_state
+        is_playing = controls['is_playing']
+        if is_playing and current_step_idx < len(steps) - 1:
+            if _FRAGMENTS_AVAILABLE:
+                if run_every != self._playback_interval(controls['speed']):
+                    # The timer is set when the fragment is created, which
+                    # takes a full script run
+                    st.rerun()
+                return
+            # Without fragments, the remaining steps are played within this
+            # script run instead of one rerun per step; a click on a control
+            # stops the run, and the rerun resumes from the step saved in state
+            for step_idx in range(current_step_idx + 1, len(steps)):
+                time.sleep(self._playback_interval(controls['speed']))
+                step = steps[step_idx]
+                update_script = self.code_animator.create_code_update_script(
+                    scaffold[1], algorithm_name, self._step_info(step), step.array_state
+                )
+                self._show_step(update_placeholder, progress_placeholder, update_script,
+                                step_idx, len(steps))
+                state['current_step'] = step_idx
+            state['is_playing'] = False
+            st.success("🎉 Animation completed!")
+        
+        elif is_playing:
+            # End of animation
+            state['is_playing'] = False
             st.success("🎉 Animation completed!")
+        
+        elif run_every is not None:
+            # Playback stopped; a full run recreates the fragment without a timer
+            st.rerun()
+    
+    @staticmethod
+    def _step_info(step) -> Dict[str, Any]:
+        """Return the step fields the code animation shows."""
+        return {
+            'step_number': step.step_number,
+            'description': step.description,
+            'comparison_indices': getattr(step, 'comparison_indices', []),
+            'swap_indices': getattr(step, 'swapped_indices', []),
+            'highlight_indices': getattr(step, 'highlighted_indices', []),
+        }
+    
+    @staticmethod
+    def _show_step(update_placeholder, progress_placeholder, update_script: str,
+                   step_idx: int, total_steps: int):
+        """Render a step's update script and progress into their placeholders."""
+        with update_placeholder:
+            components.html(update_script, height=0)
+        progress = min((step_idx + 1) / total_steps, 1.0)
+        progress_placeholder.markdown(_progress_html(progress, f"Step {step_idx + 1} of {total_steps}"),
+                                      unsafe_allow_html=True)
     
     def _create_code_animation_controls(self, total_steps: int) -> Dict[str, Any]:
         """Create controls specifically for code animation."""
@@ -848,16 +1059,19 @@ class SynchronizedAnimationManager:
         with col3:
             st.markdown('<div class="control-title">🎯 Navigation</div>', unsafe_allow_html=True)
             if total_steps > 0:
-                new_step = st.slider(
-                    "Jump to Step", 0, total_steps - 1, 
-                    st.session_state.code_animation_state['current_step'],
+                # The slider mirrors the state, which the buttons and playback
+                # move; moves by the user arrive via _on_code_step_slider_change
+                current_step = st.session_state.code_animation_state['current_step']
+                st.session_state['code_step_slider'] = current_step
+                st.slider(
+                    "Jump to Step", 0, total_steps - 1,
                     key="code_step_slider",
-                    help=f"Jump directly to any step (1-{total_steps})"
+                    help=f"Jump directly to any step (1-{total_steps})",
+                    on_change=_on_code_step_slider_change
                 )
-                st.session_state.code_animation_state['current_step'] = new_step
                 
                 # Show current step info
-                st.markdown(f"**Step {new_step + 1}** of **{total_steps}**", unsafe_allow_html=True)
+                st.markdown(f"**Step {current_step + 1}** of **{total_steps}**", unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
         
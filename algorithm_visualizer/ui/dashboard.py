@@ -460,7 +460,7 @@ class StreamlitDashboard:
                     st.write("**Array state:**", step.array_state)
                 with col2:
                     if step.highlighted_indices:
-                        st.write("**Highlighted indices:**", step.highlighted_indices)
+                        st.write("**Highlighted indices:**", list(step.highlighted_indices))
     
     def display_comparison_results(self, comparator, results):
         """Display algorithm comparison results."""
@@ -4,20 +4,54 @@ Data input/output utilities for the algorithm visualization framework.
 
 import json
 import os
+import warnings
 from typing import List, Union, Dict, Any, Optional, cast
 from ..core.base import AlgorithmVisualizer, Number
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _read_int_column(file_path: str) -> Optional[List[int]]:
+    """Parse a file of one integer per line in NumPy's C parser.
+
+    Returns None when the file holds anything else (floats, several
+    values on a line, integers outside int64), so the caller can fall
+    back to parsing line by line.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    try:
+        with warnings.catch_warnings():
+            # loadtxt warns about empty input, which is a valid empty dataset
+            warnings.simplefilter('ignore', UserWarning)
+            values = np.loadtxt(lines, dtype=np.int64, comments=None, ndmin=1)
+    except (ValueError, OverflowError):
+        return None
+    # A single line such as "1 2" still loads as a 1-D array, so check that
+    # every non-empty line contributed exactly one value
+    if values.ndim != 1 or values.size != sum(1 for line in lines if line.strip()):
+        return None
+    return values.tolist()
+
 def read_numbers(file_path: str) -> List[Number]:
     """Read a text file and return a list of numbers (ints or floats).
 
     Each non-empty line should contain a single numeric literal. Lines that
-    cannot be parsed as int or float will raise ValueError.
+    cannot be parsed as int or float will raise ValueError. Integer-only
+    files are parsed in bulk with NumPy when it is installed.
     """
     numbers: List[Number] = []
     
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
     
+    if np is not None:
+        integers = _read_int_column(file_path)
+        if integers is not None:
+            return integers
+    
     with open(file_path, "r", encoding="utf-8") as f:
         for line_num, raw in enumerate(f, 1):
             s = raw.strip()
@@ -43,9 +77,9 @@ def export_metrics(visualizer: AlgorithmVisualizer, filename: str):
                 'step_number': step.step_number,
                 'description': step.description,
                 'array_state': step.array_state,
-                'highlighted_indices': step.highlighted_indices,
-                'comparison_indices': step.comparison_indices,
-                'swapped_indices': step.swapped_indices,
+                'highlighted_indices': list(step.highlighted_indices),
+                'comparison_indices': list(step.comparison_indices),
+                'swapped_indices': list(step.swapped_indices),
                 'pivot_index': step.pivot_index,
                 'metadata': step.metadata
             }
@@ -83,14 +117,26 @@ def save_dataset(data: List[Number], filename: str):
 
 def generate_test_data(size: int, min_val: int = 0, max_val: int = 100, 
                        pattern: str = 'random', seed: Optional[int] = None) -> List[Number]:
-    """Generate test data with different patterns."""
+    """Generate test data with different patterns.
+
+    The 'random' and 'duplicates' patterns draw their values with
+    ``random.choices``, so a given seed yields different data than the
+    per-element ``randint`` draws of earlier versions did.
+
+    Raises:
+        ValueError: If ``min_val`` is greater than ``max_val`` or the pattern is unknown
+    """
     import random
     
+    if min_val > max_val:
+        raise ValueError(f"min_val ({min_val}) must not be greater than max_val ({max_val})")
+    
     if seed is not None:
         random.seed(seed)
     
     if pattern == 'random':
-        return cast(List[Number], [random.randint(min_val, max_val) for _ in range(size)])
+        # choices() draws all values in one call instead of a randint() per element
+        return cast(List[Number], random.choices(range(min_val, max_val + 1), k=size))
     elif pattern == 'sorted':
         step = (max_val - min_val) // max(size - 1, 1)
         return cast(List[Number], [min_val + i * step for i in range(size)])
@@ -105,8 +151,8 @@ def generate_test_data(size: int, min_val: int = 0, max_val: int = 100,
             data[i], data[j] = data[j], data[i]
         return data
     elif pattern == 'duplicates':
-        unique_values = [random.randint(min_val, max_val) for _ in range(size // 3 + 1)]
-        return cast(List[Number], [random.choice(unique_values) for _ in range(size)])
+        unique_values = random.choices(range(min_val, max_val + 1), k=size // 3 + 1)
+        return cast(List[Number], random.choices(unique_values, k=size))
     else:
         raise ValueError(f"Unknown pattern: {pattern}")
 
@@ -17,7 +17,7 @@ if TYPE_CHECKING:
     from matplotlib.figure import Figure
     from matplotlib.animation import FuncAnimation
 
-from ..core.base import AlgorithmStep, Number
+from ..core.base import AlgorithmStep, Number, index_set
 
 
 class MatplotlibVisualizer:
@@ -215,16 +215,19 @@ class MatplotlibVisualizer:
             'highlight': '#FFD54F'
         }
         
+        comparison_indices = index_set(step.comparison_indices)
+        swapped_indices = index_set(step.swapped_indices)
+        highlighted_indices = index_set(step.highlighted_indices)
         for i, value in enumerate(array_state):
             color = color_map['default']
             
-            if i in step.comparison_indices:
+            if i in comparison_indices:
                 color = color_map['comparing']
-            elif i in step.swapped_indices:
+            elif i in swapped_indices:
                 color = color_map['swapping'] 
             elif i == step.pivot_index:
                 color = color_map['pivot']
-            elif i in step.highlighted_indices:
+            elif i in highlighted_indices:
                 color = color_map['highlight']
                 
             colors.append(color)
@@ -336,6 +339,7 @@ class MatplotlibVisualizer:
             title: Title for the plot
         """
         positions = range(len(array_state))
+        highlighted_indices = index_set(highlighted_indices)
         colors = ['red' if i in highlighted_indices else 'lightblue' 
                  for i in positions]
         
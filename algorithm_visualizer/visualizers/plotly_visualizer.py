@@ -4,7 +4,7 @@ from typing import List, Optional
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-from ..core.base import AlgorithmStep, Number
+from ..core.base import AlgorithmStep, Number, index_set
 
 
 class PlotlyVisualizer:
@@ -123,7 +123,8 @@ class PlotlyVisualizer:
             step = steps_to_show[step_idx]
             
             # Create bar chart for this step
-            colors = ['red' if i in step.highlighted_indices else 'lightblue' 
+            highlighted = index_set(step.highlighted_indices)
+            colors = ['red' if i in highlighted else 'lightblue' 
                      for i in range(len(step.array_state))]
             
             fig.add_trace(
@@ -168,7 +169,8 @@ class PlotlyVisualizer:
         # Create frames for animation
         frames = []
         for i, step in enumerate(steps):
-            colors = ['red' if j in step.highlighted_indices else 'lightblue' 
+            highlighted = index_set(step.highlighted_indices)
+            colors = ['red' if j in highlighted else 'lightblue' 
                      for j in range(len(step.array_state))]
             
             frame = go.Frame(
@@ -188,7 +190,8 @@ class PlotlyVisualizer:
         
         # Create initial figure
         initial_step = steps[0]
-        colors = ['red' if i in initial_step.highlighted_indices else 'lightblue' 
+        highlighted = index_set(initial_step.highlighted_indices)
+        colors = ['red' if i in highlighted else 'lightblue' 
                  for i in range(len(initial_step.array_state))]
         
         fig = go.Figure(
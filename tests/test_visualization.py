@@ -8,12 +8,18 @@ Author: Senior Data Visualization Developer
 """
 
 import unittest
+import io
 import time
 import tempfile
 import os
 import json
+import math
+import random
+import subprocess
 import sys
+from importlib.util import find_spec
 from typing import List
+from unittest.mock import patch
 
 # Add the project root to the path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,11 +30,16 @@ sys.path.insert(0, project_root)
 from algorithm_visualizer.core.base import AlgorithmVisualizer, AlgorithmStep, PerformanceMetrics
 from algorithm_visualizer.core.comparator import AlgorithmComparator
 from algorithm_visualizer.core.text_visualizer import TextVisualizer
-from algorithm_visualizer.utils.data_io import export_metrics, import_metrics
+from algorithm_visualizer.utils.data_io import export_metrics, generate_test_data, import_metrics, read_numbers
+from algorithm_visualizer.ui.cli import CLIInterface
 from algorithm_visualizer.algorithms import (
     MergeSortVisualizer, QuickSortVisualizer, 
     SelectionSortVisualizer, PriorityQueueSortVisualizer
 )
+import algorithm_visualizer.algorithms as algorithms_module
+from algorithm_visualizer.algorithms._kernels import (
+    NUMBA_AVAILABLE, _kernel_dtype, _quick_sort_masked, merge_pass, run_kernel, warm_up_sample
+)
 
 # Define available visualizers for tests
 AVAILABLE_VISUALIZERS = {
@@ -111,6 +122,38 @@ class TestSortingAlgorithms(unittest.TestCase):
                 expected = sorted(test_data)
                 self.assertEqual(result, expected)
     
+    def test_bottom_up_merge_sort(self):
+        """Test bottom-up merge sort against sorted() and its one-step-per-pass trace."""
+        rng = random.Random(7)
+        for size in [0, 1, 2, 3, 17, 64, 100]:
+            test_data = [rng.randint(-50, 50) for _ in range(size)]
+            with self.subTest(size=size):
+                visualizer = MergeSortVisualizer(data=test_data, mode='bottom_up')
+                self.assertEqual(visualizer.sort(), sorted(test_data))
+                if size > 1:
+                    # Start and complete steps plus one per doubling of the run width
+                    passes = (size - 1).bit_length()
+                    self.assertEqual(len(visualizer.get_steps()), passes + 2)
+        
+        with self.assertRaises(ValueError):
+            MergeSortVisualizer(data=[3, 1, 2], mode='sideways')
+    
+    def test_merge_pass(self):
+        """Test merge_pass merges adjacent sorted runs."""
+        rng = random.Random(11)
+        for _ in range(50):
+            size = rng.randint(1, 40)
+            width = rng.choice([1, 2, 3, 4, 8])
+            src = [rng.uniform(-10, 10) for _ in range(size)]
+            # Make every run of ``width`` sorted, as the previous pass leaves them
+            for lo in range(0, size, width):
+                src[lo:lo + width] = sorted(src[lo:lo + width])
+            dst = [None] * size
+            comparisons = merge_pass(src, dst, width)
+            for lo in range(0, size, 2 * width):
+                self.assertEqual(dst[lo:lo + 2 * width], sorted(src[lo:lo + 2 * width]))
+            self.assertLess(comparisons, size)
+    
     def test_quick_sort_correctness(self):
         """Test quick sort produces correct results."""
         for test_data in self.test_cases:
@@ -120,6 +163,47 @@ class TestSortingAlgorithms(unittest.TestCase):
                 expected = sorted(test_data)
                 self.assertEqual(result, expected)
     
+    def test_quick_sort_adversarial_inputs(self):
+        """Test traced quick sort stays O(n log n) on sorted, reversed and duplicate input."""
+        size = 1200  # Deep enough that O(n) recursion would exceed the default limit
+        bound = 2 * size * math.log2(size)
+        for label, test_data in [('sorted', list(range(size))),
+                                 ('reversed', list(range(size, 0, -1))),
+                                 ('duplicates', [7] * size)]:
+            with self.subTest(input=label):
+                visualizer = QuickSortVisualizer(data=test_data)
+                self.assertEqual(visualizer.sort(), sorted(test_data))
+                self.assertLess(visualizer.metrics.comparisons, bound)
+    
+    def test_quick_sort_untraced_duplicates(self):
+        """Test the untraced quick sort kernel stays O(n log n) on duplicate-heavy input."""
+        size = 20000
+        bound = 2 * size * math.log2(size)
+        rng = random.Random(3)
+        for label, test_data in [('equal', [7] * size),
+                                 ('few distinct', [rng.randint(0, 3) for _ in range(size)])]:
+            with self.subTest(input=label):
+                visualizer = QuickSortVisualizer(data=test_data, record_steps=False)
+                self.assertEqual(visualizer.sort(), sorted(test_data))
+                self.assertLess(visualizer.metrics.comparisons, bound)
+    
+    def test_quick_sort_masked_duplicates(self):
+        """Test the NumPy-only quick sort fallback stays O(n log n) on duplicate-heavy input."""
+        if find_spec('numpy') is None:
+            self.skipTest("NumPy is not installed")
+        size = 20000
+        bound = 2 * size * math.log2(size)
+        rng = random.Random(5)
+        for label, test_data in [('equal', [7] * size),
+                                 ('few distinct', [rng.randint(0, 3) for _ in range(size)]),
+                                 ('distinct', rng.sample(range(size), size))]:
+            with self.subTest(input=label):
+                values = list(test_data)
+                comparisons, swaps = _quick_sort_masked(values)
+                self.assertEqual(values, sorted(test_data))
+                self.assertLess(comparisons, bound)
+                self.assertLessEqual(swaps, comparisons)
+    
     def test_selection_sort_correctness(self):
         """Test selection sort produces correct results."""
         for test_data in self.test_cases:
@@ -129,6 +213,60 @@ class TestSortingAlgorithms(unittest.TestCase):
                 expected = sorted(test_data)
                 self.assertEqual(result, expected)
     
+    def test_selection_sort_outer_granularity(self):
+        """Test 'outer' granularity keeps the metrics but records fewer steps."""
+        for test_data in self.test_cases:
+            if len(test_data) < 2:
+                continue
+            with self.subTest(data=test_data):
+                fine = SelectionSortVisualizer(data=test_data)
+                outer = SelectionSortVisualizer(data=test_data, step_granularity='outer')
+                self.assertEqual(outer.sort(), fine.sort())
+                self.assertEqual(outer.metrics.comparisons, fine.metrics.comparisons)
+                self.assertEqual(outer.metrics.swaps, fine.metrics.swaps)
+                self.assertLess(len(outer.get_steps()), len(fine.get_steps()))
+        
+        with self.assertRaises(ValueError):
+            SelectionSortVisualizer(data=[3, 1, 2], step_granularity='coarse')
+    
+    def test_untraced_sort_correctness(self):
+        """Test sorting without step recording matches the traced sort."""
+        for alg_class in [MergeSortVisualizer, QuickSortVisualizer, SelectionSortVisualizer,
+                          PriorityQueueSortVisualizer]:
+            for test_data in self.test_cases:
+                with self.subTest(algorithm=alg_class.__name__, data=test_data):
+                    visualizer = alg_class(data=test_data.copy())
+                    visualizer.record_steps = False
+                    result = visualizer.sort()
+                    self.assertEqual(result, sorted(test_data))
+                    self.assertEqual(visualizer.steps, [])
+    
+    def test_untraced_sort_keeps_mixed_values(self):
+        """Test traced and untraced sorts agree on mixed int and float input."""
+        test_data = [3, 1.5, 2, 7, 0.25, 2, 5]
+        for alg_class in [MergeSortVisualizer, QuickSortVisualizer, SelectionSortVisualizer,
+                          PriorityQueueSortVisualizer]:
+            with self.subTest(algorithm=alg_class.__name__):
+                traced = alg_class(data=test_data)
+                untraced = alg_class(data=test_data, record_steps=False)
+                traced_result = traced.sort()
+                untraced_result = untraced.sort()
+                self.assertEqual([(type(v), v) for v in untraced_result],
+                                 [(type(v), v) for v in traced_result])
+                self.assertEqual(traced.current_data, traced_result)
+                self.assertEqual(untraced.current_data, untraced_result)
+    
+    def test_untraced_sort_keeps_ints_beyond_int64(self):
+        """Test untraced sorts return ints too large for int64 unchanged."""
+        test_data = [2 ** 70 + 1, 5, 2 ** 70, -2 ** 64, 5]
+        expected = sorted(test_data)
+        for alg_class in [MergeSortVisualizer, QuickSortVisualizer, SelectionSortVisualizer]:
+            with self.subTest(algorithm=alg_class.__name__):
+                untraced = alg_class(data=test_data, record_steps=False)
+                result = untraced.sort()
+                self.assertEqual([(type(v), v) for v in result], [(int, v) for v in expected])
+                self.assertEqual(untraced.current_data, expected)
+
     def test_priority_queue_sort_correctness(self):
         """Test priority queue sort produces correct results."""
         for test_data in self.test_cases:
@@ -183,6 +321,84 @@ class TestVisualizationTracking(unittest.TestCase):
             self.assertIsInstance(step.array_state, list)
             self.assertGreater(step.step_number, 0)
             self.assertTrue(len(step.description) > 0)
+        
+        # iter_steps yields the recorded steps in order
+        self.assertEqual(list(visualizer.iter_steps()), visualizer.steps)
+    
+    def test_step_snapshots_are_isolated(self):
+        """Test mutating the working data never changes a recorded step."""
+        visualizer = QuickSortVisualizer(data=[3, 1, 2])
+        data = visualizer.current_data
+        visualizer.add_step("first", data)
+        visualizer.add_step("unchanged", data)
+        data[0] = 99
+        visualizer.add_step("changed", data)
+        data[1] = 42
+        
+        first, unchanged, changed = visualizer.get_steps()
+        self.assertEqual(first.array_state, [3, 1, 2])
+        self.assertEqual(unchanged.array_state, [3, 1, 2])
+        self.assertEqual(changed.array_state, [99, 1, 2])
+        self.assertIsNot(first.array_state, data)
+        self.assertIsNot(changed.array_state, data)
+        
+        # Traced quick sort works on current_data in place; its first step
+        # still shows the input
+        visualizer = QuickSortVisualizer(data=self.test_data)
+        visualizer.sort()
+        self.assertEqual(visualizer.get_steps()[0].array_state, self.test_data)
+        self.assertEqual(visualizer.current_data, sorted(self.test_data))
+    
+    def test_add_step_fmt_matches_add_step(self):
+        """Test add_step_fmt records what the equivalent add_step call does."""
+        data = [5, 2, 8]
+        plain = QuickSortVisualizer(data=data)
+        formatted = QuickSortVisualizer(data=data)
+        plain.add_step("Comparing arr[{}]={} with {}".format(0, 5, 8), data,
+                       highlighted_indices=[1], comparison_indices=[0, 2],
+                       swapped_indices=[0], pivot_index=2, phase='partition')
+        formatted.add_step_fmt("Comparing arr[{}]={} with {}", (0, 5, 8), data,
+                               highlighted_indices=[1], comparison_indices=[0, 2],
+                               swapped_indices=[0], pivot_index=2, phase='partition')
+        
+        self.assertEqual(formatted.get_steps(), plain.get_steps())
+        self.assertEqual(formatted.get_steps()[0].description, "Comparing arr[0]=5 with 8")
+        self.assertEqual(formatted.step_counter, plain.step_counter)
+    
+    def test_max_steps(self):
+        """Test max_steps caps the trace but keeps its first and last steps."""
+        test_data = random.Random(3).sample(range(200), 60)
+        for alg_class in [MergeSortVisualizer, QuickSortVisualizer, SelectionSortVisualizer]:
+            with self.subTest(algorithm=alg_class.__name__):
+                full = alg_class(data=test_data)
+                full.sort()
+                capped = alg_class(data=test_data, max_steps=10)
+                capped.sort()
+                steps = capped.get_steps()
+                self.assertLessEqual(len(steps), 10)
+                self.assertEqual(steps[0].description, full.get_steps()[0].description)
+                self.assertEqual(steps[-1].description, full.get_steps()[-1].description)
+                self.assertEqual(capped.get_sorted_data(), sorted(test_data))
+    
+    def test_step_sample_rate(self):
+        """Test sampling drops ordinary steps but keeps first, last and swap steps."""
+        test_data = random.Random(5).sample(range(200), 60)
+        for alg_class in [MergeSortVisualizer, QuickSortVisualizer, SelectionSortVisualizer]:
+            with self.subTest(algorithm=alg_class.__name__):
+                full = alg_class(data=test_data)
+                full.sort()
+                random.seed(0)
+                sampled = alg_class(data=test_data, step_sample_rate=0.1)
+                sampled.sort()
+                steps = sampled.get_steps()
+                self.assertLess(len(steps), len(full.get_steps()))
+                self.assertEqual(steps[0].description, full.get_steps()[0].description)
+                self.assertEqual(steps[-1].description, full.get_steps()[-1].description)
+                self.assertEqual(sum(1 for step in steps if step.swapped_indices),
+                                 sum(1 for step in full.get_steps() if step.swapped_indices))
+                self.assertEqual(sampled.get_sorted_data(), sorted(test_data))
+                # Sampling only affects the trace, not the metrics
+                self.assertEqual(sampled.metrics.comparisons, full.metrics.comparisons)
     
     def test_metrics_tracking(self):
         """Test that performance metrics are tracked."""
@@ -219,6 +435,35 @@ class TestVisualizationTracking(unittest.TestCase):
         self.assertIsInstance(summary['swaps'], int)
         self.assertIsInstance(summary['total_steps'], int)
         self.assertIsInstance(summary['complexity_info'], dict)
+    
+    def test_performance_summary_cache(self):
+        """Test the cached summary is copied and invalidated by reset() and sort()."""
+        visualizer = MergeSortVisualizer(data=self.test_data.copy())
+        visualizer.sort()
+        first = visualizer.get_performance_summary()
+        
+        # Changing a returned summary does not leak into the cache
+        first['comparisons'] = -1
+        first['complexity_info']['time_complexity'] = 'O(1)'
+        summary = visualizer.get_performance_summary()
+        self.assertNotEqual(summary['comparisons'], -1)
+        self.assertEqual(summary['complexity_info']['time_complexity'], 'O(n log n)')
+        
+        visualizer.reset()
+        after_reset = visualizer.get_performance_summary()
+        self.assertEqual(after_reset['comparisons'], 0)
+        self.assertEqual(after_reset['total_steps'], 0)
+        
+        visualizer.sort()
+        after_sort = visualizer.get_performance_summary()
+        self.assertEqual(after_sort['comparisons'], summary['comparisons'])
+        self.assertEqual(after_sort['total_steps'], summary['total_steps'])
+        
+        # Sorting again without a reset adds to the metrics and the trace
+        visualizer.sort()
+        again = visualizer.get_performance_summary()
+        self.assertGreater(again['comparisons'], after_sort['comparisons'])
+        self.assertGreater(again['total_steps'], after_sort['total_steps'])
 
 class TestAlgorithmComparator(unittest.TestCase):
     """Test algorithm comparison functionality."""
@@ -244,6 +489,41 @@ class TestAlgorithmComparator(unittest.TestCase):
             self.assertTrue(hasattr(viz, 'metrics'))
             self.assertTrue(hasattr(viz, 'steps'))
     
+    def test_algorithm_comparison_without_steps(self):
+        """Test comparing algorithms with step recording disabled."""
+        comparator = AlgorithmComparator(self.test_data.copy())
+        
+        quick_viz = comparator.add_algorithm(QuickSortVisualizer, "Quick Sort", record_steps=False)
+        
+        self.assertEqual(quick_viz.steps, [])
+        self.assertGreater(quick_viz.metrics.comparisons, 0)
+        self.assertEqual(quick_viz.sort(), sorted(self.test_data))
+    
+    def test_kernels_compiled_before_timing(self):
+        """Test the warm-up compiles the kernel the timed sort uses."""
+        if not NUMBA_AVAILABLE:
+            self.skipTest("Numba is not installed")
+        # The first two values are ints, the data as a whole is not
+        data = [8, 3, 5.5, 4, 7.25, 6, 1, 2]
+        self.assertEqual(_kernel_dtype(warm_up_sample(data)), _kernel_dtype(data))
+        
+        compiled_before_timed_sort = []
+        
+        def spy_run_kernel(kernel, values):
+            if len(values) == len(data):
+                signatures = list(kernel.signatures)
+                result = run_kernel(kernel, values)
+                compiled_before_timed_sort.append(signatures == list(kernel.signatures))
+                return result
+            return run_kernel(kernel, values)
+        
+        with patch.object(algorithms_module, 'run_kernel', spy_run_kernel):
+            for alg_class in [MergeSortVisualizer, QuickSortVisualizer, SelectionSortVisualizer]:
+                comparator = AlgorithmComparator(data)
+                visualizer = comparator.add_algorithm(alg_class, record_steps=False)
+                self.assertEqual(visualizer.sort(), sorted(data))
+        self.assertEqual(compiled_before_timed_sort, [True] * 6)
+    
     def test_comparison_report(self):
         """Test comparison report generation."""
         comparator = AlgorithmComparator(self.test_data.copy())
@@ -290,7 +570,23 @@ class TestTextVisualization(unittest.TestCase):
         self.assertEqual(symbol_default, self.text_viz.color_symbols['default'])
         self.assertEqual(symbol_highlighted, self.text_viz.color_symbols['highlighted'])
         self.assertEqual(symbol_comparison, self.text_viz.color_symbols['comparing'])
-    
+
+    def test_symbols_for_step_matches_get_symbol(self):
+        """Test that precomputed step symbols agree with per-index lookups."""
+        step = AlgorithmStep(
+            step_number=2,
+            description="Overlapping roles",
+            array_state=[3, 1, 4, 1, 5],
+            highlighted_indices=[0, 1, 2],
+            comparison_indices=[1, 2],
+            swapped_indices=[2],
+            pivot_index=0
+        )
+
+        symbols = self.text_viz._symbols_for_step(step, len(step.array_state))
+        expected = [self.text_viz._get_symbol(i, step) for i in range(len(step.array_state))]
+        self.assertEqual(symbols, expected)
+
     def test_summary_report_generation(self):
         """Test that summary reports are generated correctly."""
         visualizer = MergeSortVisualizer(data=[3, 1, 4, 1, 5])
@@ -303,6 +599,26 @@ class TestTextVisualization(unittest.TestCase):
         self.assertIn("Merge Sort", report)
         self.assertIn("Time Complexity", report)
         self.assertIn("Space Complexity", report)
+    
+    def test_print_all_steps_to_file(self):
+        """Test print_all_steps writes the steps and summary to ``file``."""
+        visualizer = MergeSortVisualizer(data=[3, 1, 4, 1, 5])
+        visualizer.sort()
+        total = len(visualizer.get_steps())
+        
+        out = io.StringIO()
+        self.text_viz.print_all_steps(visualizer, max_steps=3, file=out)
+        text = out.getvalue()
+        self.assertIn("All Steps for Merge Sort", text)
+        self.assertIn(f"... and {total - 3} more steps", text)
+        self.assertIn("ALGORITHM ANALYSIS REPORT", text)
+        
+        # Paginating into a file writes every step there instead of paging
+        out = io.StringIO()
+        self.text_viz.print_all_steps(visualizer, max_steps=3, paginate=True, file=out)
+        text = out.getvalue()
+        self.assertNotIn("more steps", text)
+        self.assertIn(visualizer.get_steps()[-1].description, text)
 
 class TestDataExportImport(unittest.TestCase):
     """Test data export and import functionality."""
@@ -350,6 +666,39 @@ class TestDataExportImport(unittest.TestCase):
             self.assertEqual(step_data['step_number'], original_step.step_number)
             self.assertEqual(step_data['description'], original_step.description)
             self.assertEqual(step_data['array_state'], original_step.array_state)
+    
+    def test_read_numbers(self):
+        """Test reading integer-only and mixed number files."""
+        int_file = os.path.join(self.temp_dir, "ints.txt")
+        with open(int_file, 'w') as f:
+            f.write("6\n\n -2 \n8\n")
+        self.assertEqual(read_numbers(int_file), [6, -2, 8])
+        self.assertTrue(all(type(value) is int for value in read_numbers(int_file)))
+        
+        mixed_file = os.path.join(self.temp_dir, "mixed.txt")
+        with open(mixed_file, 'w') as f:
+            f.write("6\n2.5\n99999999999999999999\n")
+        self.assertEqual(read_numbers(mixed_file), [6, 2.5, 99999999999999999999])
+        
+        bad_file = os.path.join(self.temp_dir, "bad.txt")
+        with open(bad_file, 'w') as f:
+            f.write("1\n2 3\n")
+        with self.assertRaises(ValueError):
+            read_numbers(bad_file)
+        
+        # A single line with several values is rejected as well
+        with open(bad_file, 'w') as f:
+            f.write("1 2\n")
+        with self.assertRaises(ValueError):
+            read_numbers(bad_file)
+    
+    def test_generate_test_data_rejects_empty_range(self):
+        """Test generating data with min_val above max_val raises ValueError."""
+        for pattern in ['random', 'duplicates', 'sorted']:
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(ValueError):
+                    generate_test_data(10, 200, 100, pattern)
+        self.assertEqual(generate_test_data(3, 5, 5), [5, 5, 5])
 
 class TestVisualizerFactory(unittest.TestCase):
     """Test visualizer factory and registry functions."""
@@ -381,6 +730,41 @@ class TestVisualizerFactory(unittest.TestCase):
         """Test handling of invalid algorithm names."""
         with self.assertRaises(ValueError):
             create_visualizer("invalid_algorithm", [1, 2, 3])
+    
+    def test_import_leaves_kernel_dependencies_unloaded(self):
+        """Test importing the package does not load Numba or NumPy."""
+        code = ("import sys, algorithm_visualizer; "
+                "print(sorted({'numba', 'numpy'} & set(sys.modules)))")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(output.stdout.strip(), '[]')
+
+class TestCLIInput(unittest.TestCase):
+    """Test parsing of command line interface prompts."""
+    
+    def setUp(self):
+        self.cli = CLIInterface()
+    
+    def test_random_spec_accepted(self):
+        """Test size[,min,max] answers for random data."""
+        cases = {
+            "10": (10, 1, 100),
+            "10,1,50": (10, 1, 50),
+            "10, -5, 5": (10, -5, 5),
+            "  7 ,3  ": (7, 3, 100),
+        }
+        for answer, expected in cases.items():
+            with self.subTest(answer=answer):
+                with patch('builtins.input', return_value=answer):
+                    self.assertEqual(self.cli._prompt_random_spec(), expected)
+    
+    def test_random_spec_rejected(self):
+        """Test malformed random data answers and empty ranges raise ValueError."""
+        for answer in ["10,", "a", "", "10,1,2,3", "-10", "10,200", "10,5,1"]:
+            with self.subTest(answer=answer):
+                with patch('builtins.input', return_value=answer):
+                    with self.assertRaises(ValueError):
+                        self.cli._prompt_random_spec()
 
 class TestEdgeCases(unittest.TestCase):
     """Test edge cases and error conditions."""
@@ -499,6 +883,7 @@ if __name__ == '__main__':
         TestTextVisualization,
         TestDataExportImport,
         TestVisualizerFactory,
+        TestCLIInput,
         TestEdgeCases,
         TestPerformanceConsistency
     ]